@@ -4,16 +4,24 @@ from __future__ import annotations
 import calendar
 import copy
 import json
+import math
+import mmap
+import os
 import re
+import socket
+import struct
 import subprocess
 import sys
 import time
+import tracemalloc
+import zlib
+from array import array
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
-from fabric import Application, Fabricator
+from fabric import Application
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.centerbox import CenterBox
@@ -29,15 +37,110 @@ from fabric.utils import get_relative_path
 HOME = Path.home()
 AI_STATUS_PATH = HOME / ".cache" / "ai-usage-monitor" / "status.json"
 AI_PROVIDER_PREF_PATH = HOME / ".cache" / "ai-usage-monitor" / "provider.txt"
+AI_HISTORY_PATH = HOME / ".cache" / "ai-usage-monitor" / "history.bin"
 MAX_TASK_LABELS = 5
 BAR_HEIGHT = 37
 TASK_ACTION_MENU_WIDTH = 286
 TASK_ACTION_MENU_HEIGHT = 260
-VOLUME_POLL_MS = 1000
-AI_POLL_MS = 5000
-BAR_VISIBILITY_POLL_MS = 500
+POLL_INTERVALS_MS = {
+    "awesome": (500, 2000),
+    "awesome_tasks": (30000, 120000),
+    "network": (10000, 120000),
+    "volume": (1000, 15000),
+    "ai": (5000, 60000),
+    "battery_info": (30000, 300000),
+    "system": (1000, 1000),
+}
+POLL_BACKOFF = 1.5
+POPUP_POLL_SOURCES = {
+    "task-actions": "awesome",
+    "network": "network",
+    "audio": "volume",
+    "ai": "ai",
+    "battery": "battery_info",
+    "system": "system",
+}
 SCREEN_MATCH_TOLERANCE_PX = 4
+AWESOME_DBUS_NAME = "org.awesomewm.awful"
+AWESOME_DBUS_PATH = "/"
+AWESOME_DBUS_INTERFACE = "org.awesomewm.awful.Remote"
+AWESOME_EVAL_TIMEOUT_MS = 1000
+AWESOME_ACTION_BATCH_MS = 25
+ACTION_FAILURE_FLASH_MS = 900
+COMMAND_TIMEOUT_MS = 1000
+AUDIO_EVENT_FACILITIES = frozenset({"sink", "source", "server"})
+AUDIO_RESTART_MS = 2000
+AUDIO_RESTART_MAX_MS = 60000
+VOLUME_FRAME_MS = 16
+VOLUME_STEP_PERCENT = 5
+VOLUME_MAX_PERCENT: int | None = None
+NETWORK_PROBE_ADDRESS = "1.1.1.1"
+PROC_NET_ROUTE_PATH = Path("/proc/net/route")
+SYS_CLASS_NET_PATH = Path("/sys/class/net")
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV4_ROUTE = 0x40
+ROUTE_FLAG_UP = 0x1
+X11_PROPERTY_CHANGE_MASK = 1 << 22
+X11_STRUCTURE_NOTIFY_MASK = 1 << 17
+X11_ANY_PROPERTY_TYPE = 0
+X11_IS_VIEWABLE = 2
+X11_WATCH_ATOMS = (
+    "_NET_ACTIVE_WINDOW",
+    "_NET_WM_STATE",
+    "_NET_WM_STATE_FULLSCREEN",
+    "_NET_WM_STATE_HIDDEN",
+    "_NET_WM_WINDOW_TYPE",
+    "_NET_WM_WINDOW_TYPE_DESKTOP",
+    "_NET_WM_WINDOW_TYPE_DOCK",
+)
+UPOWER_BUS_NAME = "org.freedesktop.UPower"
+UPOWER_DEVICE_INTERFACE = "org.freedesktop.UPower.Device"
+UPOWER_DISPLAY_DEVICE_PATH = "/org/freedesktop/UPower/devices/DisplayDevice"
+UPOWER_TIMEOUT_MS = 1000
+POWER_PROFILES_BUS_NAME = "net.hadess.PowerProfiles"
+POWER_PROFILES_PATH = "/net/hadess/PowerProfiles"
+POWER_PROFILES_INTERFACE = "net.hadess.PowerProfiles"
+POWER_SUPPLY_PATH = Path("/sys/class/power_supply")
+PROC_STAT_PATH = Path("/proc/stat")
+PROC_MEMINFO_PATH = Path("/proc/meminfo")
+PROC_LOADAVG_PATH = Path("/proc/loadavg")
+PROC_READ_BYTES = 512
+SYSTEM_HISTORY_SAMPLES = 300
+SYSTEM_SPARKLINE_WIDTH = 60
+UPOWER_STATES = {
+    1: "charging",
+    2: "discharging",
+    3: "empty",
+    4: "fully-charged",
+    5: "pending-charge",
+    6: "pending-discharge",
+}
+POWER_SUPPLY_STATES = {
+    "charging": "charging",
+    "discharging": "discharging",
+    "full": "fully-charged",
+    "not charging": "pending-charge",
+}
+FABRIC_DBUS_NAME = "org.techdufus.FabricAwesomeWM"
+FABRIC_DBUS_PATH = "/org/techdufus/FabricAwesomeWM"
+FABRIC_DBUS_INTERFACE = "org.techdufus.FabricAwesomeWM"
+STATS_SAMPLE_COUNT = 256
+STATS_PERCENTILES = (50, 95, 99)
+BENCH_CLIENT_COUNTS = (10, 100, 1000)
+BENCH_SCREEN_COUNTS = (1, 4, 16)
+BENCH_MIN_SECONDS = 0.25
+BENCH_RESULTS_DIR = HOME / ".cache" / "fabric-awesomewm" / "bench"
 AI_PROVIDER_SWITCH_REFRESH_DELAYS_MS = (350, 1250)
+AI_STATUS_RELOAD_EVENTS = frozenset({"changes-done-hint", "created", "deleted", "moved-in", "renamed"})
+AI_HISTORY_MAGIC = b"AIH1"
+AI_HISTORY_HEADER = struct.Struct("<4sIII")
+AI_HISTORY_MINUTES = 7 * 24 * 60
+AI_SPARKLINE_MINUTES = 24 * 60
+AI_SPARKLINE_WIDTH = 24
+AI_BURN_WINDOW_MINUTES = 60
+AI_BURN_MIN_MINUTES = 5
+SPARKLINE_BLOCKS = "\u2581\u2582\u2583\u2584\u2585\u2586\u2587\u2588"
 ROOT_LAUNCHER_SIGNAL = "techdufus::launcher_root"
 SETTINGS_LAUNCHER_SIGNAL = "techdufus::launcher_settings"
 LAUNCHER_SIGNAL = ROOT_LAUNCHER_SIGNAL
@@ -65,6 +168,10 @@ AI_PROVIDER_DEFS = {
         ],
     },
 }
+AI_HISTORY_SERIES = (
+    *dict.fromkeys(f"{provider}.{metric}" for provider, spec in AI_PROVIDER_DEFS.items() for metric, _label in spec["metrics"]),
+    "claude.credits",
+)
 
 AWESOME_CLIENTS_LUA = r'''
 local out = {}
@@ -115,6 +222,105 @@ end
 return table.concat(out, "\n")
 '''
 
+AWESOME_SNAPSHOT_BODY_LUA = r'''
+local tolerance = 4
+
+local function json_string(value)
+  local escaped = tostring(value or ""):gsub('[%c"\\]', function(char)
+    return string.format("\\u%04x", string.byte(char))
+  end)
+  return '"' .. escaped .. '"'
+end
+
+local function covers_screen(cg, sg)
+  return cg.x <= sg.x + tolerance
+    and cg.y <= sg.y + tolerance
+    and cg.x + cg.width >= sg.x + sg.width - tolerance
+    and cg.y + cg.height >= sg.y + sg.height - tolerance
+end
+
+local function can_cover_bar(c)
+  if not c.valid or c.minimized or c.hidden then
+    return false
+  end
+  if not c:isvisible() then
+    return false
+  end
+  local client_type = c.type or ""
+  return client_type ~= "desktop" and client_type ~= "dock"
+end
+
+local focused = client.focus
+local clients = {}
+if include_clients then
+  for _, c in ipairs(client.get()) do
+    table.insert(clients, "[" .. table.concat({
+      json_string(c.name),
+      json_string(c.class),
+      c.minimized and "true" or "false",
+      json_string(tostring(c.window or "")),
+      (focused == c) and "true" or "false",
+    }, ",") .. "]")
+  end
+end
+
+local screens = {}
+for s in screen do
+  local sg = s.geometry
+  local hidden = focused ~= nil
+    and focused.screen == s
+    and can_cover_bar(focused)
+    and (focused.fullscreen or covers_screen(focused:geometry(), sg))
+  table.insert(screens, string.format("[%d,%d,%d,%d,%s]", sg.x, sg.y, sg.width, sg.height, hidden and "true" or "false"))
+end
+
+local ok, notifications = pcall(require, "notifications")
+local dnd = ok and notifications.dnd and notifications.dnd.is_enabled() or false
+
+return '{' .. (include_clients and ('"clients":[' .. table.concat(clients, ",") .. '],') or "")
+  .. '"screens":[' .. table.concat(screens, ",")
+  .. '],"dnd":' .. (dnd and "true" or "false")
+  .. ',"hooked":' .. (fabric_task_events_installed and "true" or "false")
+  .. '}'
+'''
+AWESOME_SNAPSHOT_LUA = "local include_clients = true\n" + AWESOME_SNAPSHOT_BODY_LUA
+AWESOME_STATE_LUA = "local include_clients = not fabric_task_events_installed\n" + AWESOME_SNAPSHOT_BODY_LUA
+
+AWESOME_TASK_EVENTS_LUA = r'''
+if fabric_task_events_installed then
+  return "present"
+end
+fabric_task_events_installed = true
+
+local path = "%s"
+local interface = "%s"
+
+local function push(event, c)
+  dbus.emit_signal("session", path, interface, "ClientChanged",
+    "s", event,
+    "s", tostring(c.window or ""),
+    "s", c.name or "",
+    "s", c.class or "",
+    "b", c.minimized and true or false,
+    "b", client.focus == c)
+end
+
+local function hook(event)
+  return function(c)
+    pcall(push, event, c)
+  end
+end
+
+client.connect_signal("manage", hook("manage"))
+client.connect_signal("unmanage", hook("unmanage"))
+client.connect_signal("property::name", hook("update"))
+client.connect_signal("property::minimized", hook("update"))
+client.connect_signal("property::fullscreen", hook("update"))
+client.connect_signal("focus", hook("focus"))
+client.connect_signal("unfocus", hook("update"))
+return "installed"
+''' % (FABRIC_DBUS_PATH, FABRIC_DBUS_INTERFACE)
+
 APP_LABELS = {
     "1password": "1Password",
     "chromium": "Chromium",
@@ -150,6 +356,15 @@ ICON_NAMES = {
     "steam": "steam",
 }
 
+VOLUME_COMMAND = "pactl get-sink-volume @DEFAULT_SINK@ 2>/dev/null | awk -F'/' 'NR==1 {gsub(/ /,\"\",$2); print $2}'"
+AUDIO_DEVICES_COMMAND = (
+    "printf 'default_sink\\t%s\\n' \"$(pactl get-default-sink 2>/dev/null)\"; "
+    "pactl list short sinks 2>/dev/null | awk '{print \"sink\\t\" $2}'; "
+    "printf 'default_source\\t%s\\n' \"$(pactl get-default-source 2>/dev/null)\"; "
+    "pactl list short sources 2>/dev/null | awk '{print \"source\\t\" $2}'"
+)
+AUDIO_STATE_COMMAND = "pactl -f json info 2>/dev/null; pactl -f json list sinks 2>/dev/null; pactl -f json list sources 2>/dev/null"
+
 NETWORK_ACTION_DEFS = (
     {
         "key": "connections",
@@ -168,10 +383,42 @@ NETWORK_ACTION_DEFS = (
     },
 )
 
-Task = dict[str, object]
 BarVisibilityState = dict[str, object]
 
 
+@dataclass(frozen=True, slots=True)
+class Task:
+    title: str
+    label: str
+    class_name: str
+    minimized: bool
+    window_id: str
+    focused: bool
+
+
+@dataclass(frozen=True, slots=True)
+class TaskGroup:
+    label: str
+    class_name: str
+    windows: tuple[Task, ...]
+    focused: bool
+
+    @property
+    def count(self) -> int:
+        return len(self.windows)
+
+    @property
+    def window_ids(self) -> list[str]:
+        return [window.window_id for window in self.windows]
+
+
+@dataclass(frozen=True, slots=True)
+class DockGroups:
+    groups: tuple[TaskGroup, ...]
+    overflow: int
+    digest: int
+
+
 @dataclass(frozen=True)
 class MonitorGeometry:
     index: int
@@ -260,7 +507,95 @@ def open_settings_launcher() -> None:
     run_command(settings_command())
 
 
+def percentile(ordered: list[float], rank: int) -> float:
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, math.ceil(rank / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class SourceStats:
+    def __init__(self, capacity: int = STATS_SAMPLE_COUNT):
+        self.samples = array("d", bytes(8 * max(1, int(capacity))))
+        self.filled = 0
+        self.cursor = 0
+        self.calls = 0
+        self.subprocesses = 0
+        self.changes = 0
+        self.last_change: float | None = None
+
+    def add(self, elapsed_ms: float) -> None:
+        self.samples[self.cursor] = elapsed_ms
+        self.cursor = (self.cursor + 1) % len(self.samples)
+        self.filled = min(self.filled + 1, len(self.samples))
+
+    def latencies(self) -> list[float]:
+        return sorted(self.samples[: self.filled])
+
+
+class BarStats:
+    def __init__(self, capacity: int = STATS_SAMPLE_COUNT, clock=None):
+        self.capacity = capacity
+        self.clock = clock if clock is not None else time.monotonic
+        self.started = self.clock()
+        self.sources: dict[str, SourceStats] = {}
+
+    def source(self, name: str) -> SourceStats:
+        entry = self.sources.get(name)
+        if entry is None:
+            entry = SourceStats(self.capacity)
+            self.sources[name] = entry
+        return entry
+
+    def record(self, name: str, started: float, subprocess: bool = False) -> None:
+        entry = self.source(name)
+        entry.calls += 1
+        if subprocess:
+            entry.subprocesses += 1
+        entry.add((self.clock() - started) * 1000)
+
+    def changed(self, name: str) -> None:
+        entry = self.source(name)
+        entry.changes += 1
+        entry.last_change = self.clock()
+
+    def snapshot(self) -> dict[str, object]:
+        now = self.clock()
+        uptime = max(now - self.started, 0.001)
+        sources = {}
+        for name, entry in sorted(self.sources.items()):
+            ordered = entry.latencies()
+            sources[name] = {
+                "calls": entry.calls,
+                "calls_per_hour": round(entry.calls * 3600 / uptime, 1),
+                "subprocesses": entry.subprocesses,
+                "subprocesses_per_hour": round(entry.subprocesses * 3600 / uptime, 1),
+                "changes": entry.changes,
+                "since_change_s": None if entry.last_change is None else round(now - entry.last_change, 3),
+                "samples": len(ordered),
+                **{f"p{rank}_ms": round(percentile(ordered, rank), 3) for rank in STATS_PERCENTILES},
+            }
+        return {"uptime_s": round(uptime, 3), "sources": sources}
+
+
+BAR_STATS: BarStats | None = None
+
+
+def shared_bar_stats() -> BarStats:
+    global BAR_STATS
+    if BAR_STATS is None:
+        BAR_STATS = BarStats()
+    return BAR_STATS
+
+
+def command_stats_name(kind: str, command: list[str]) -> str:
+    program = Path(command[0]).name if command else "?"
+    return f"{kind}:{program}"
+
+
 def shell_output(command: str, fallback: str = "...") -> str:
+    stats = shared_bar_stats()
+    started = stats.clock()
     try:
         result = subprocess.run(
             ["sh", "-c", command],
@@ -271,12 +606,16 @@ def shell_output(command: str, fallback: str = "...") -> str:
         )
     except Exception:
         return fallback
+    finally:
+        stats.record(command_stats_name("shell", command.split()[:1]), started, subprocess=True)
 
     value = result.stdout.strip()
     return value or fallback
 
 
 def command_output(command: list[str], fallback: str = "") -> str:
+    stats = shared_bar_stats()
+    started = stats.clock()
     try:
         result = subprocess.run(
             command,
@@ -287,10 +626,247 @@ def command_output(command: list[str], fallback: str = "") -> str:
         )
     except Exception:
         return fallback
+    finally:
+        stats.record(command_stats_name("command", command), started, subprocess=True)
 
     return result.stdout.strip() or fallback
 
 
+def gio_spawn_command(command: list[str], on_done: Callable[[str | None], None], timeout_ms: int) -> None:
+    from gi.repository import Gio, GLib
+
+    process = Gio.Subprocess.new(command, Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_SILENCE)
+    cancellable = Gio.Cancellable()
+    timer = {"id": 0}
+
+    def on_timeout() -> bool:
+        timer["id"] = 0
+        process.force_exit()
+        cancellable.cancel()
+        return False
+
+    def on_complete(source, result, *_args) -> None:
+        if timer["id"]:
+            GLib.source_remove(timer["id"])
+            timer["id"] = 0
+        try:
+            _ok, stdout, _stderr = source.communicate_utf8_finish(result)
+        except Exception:
+            stdout = None
+        on_done(stdout)
+
+    timer["id"] = GLib.timeout_add(int(timeout_ms), on_timeout)
+    process.communicate_utf8_async(None, cancellable, on_complete)
+
+
+class AsyncCommandRunner:
+    def __init__(self, timeout_ms: int = COMMAND_TIMEOUT_MS, spawn=None, stats: BarStats | None = None):
+        self.timeout_ms = timeout_ms
+        self.spawn = spawn if spawn is not None else gio_spawn_command
+        self.stats = stats if stats is not None else shared_bar_stats()
+        self.in_flight: set[str] = set()
+        self.waiters: dict[str, list[tuple[Callable[[str], None], str]]] = {}
+
+    def busy(self, key: str) -> bool:
+        return key in self.in_flight
+
+    def run(self, key: str, command: list[str], callback: Callable[[str], None], fallback: str = "") -> bool:
+        if key in self.in_flight:
+            self.waiters.setdefault(key, []).append((callback, fallback))
+            return False
+        self.in_flight.add(key)
+        self.waiters[key] = [(callback, fallback)]
+        started = self.stats.clock()
+        try:
+            self.spawn(
+                command,
+                lambda stdout: self.finish(key, stdout, started),
+                self.timeout_ms,
+            )
+        except Exception:
+            self.finish(key, None, started)
+        return True
+
+    def finish(self, key: str, stdout: str | None, started: float | None = None) -> None:
+        self.in_flight.discard(key)
+        waiters = self.waiters.pop(key, [])
+        if started is not None:
+            self.stats.record(f"command:{key}", started, subprocess=True)
+        text = (stdout or "").strip()
+        for callback, fallback in waiters:
+            callback(text or fallback)
+
+
+COMMAND_RUNNER: AsyncCommandRunner | None = None
+
+
+def shared_command_runner() -> AsyncCommandRunner:
+    global COMMAND_RUNNER
+    if COMMAND_RUNNER is None:
+        COMMAND_RUNNER = AsyncCommandRunner()
+    return COMMAND_RUNNER
+
+
+def command_output_async(key: str, command: list[str], callback: Callable[[str], None], fallback: str = "") -> bool:
+    return shared_command_runner().run(key, command, callback, fallback)
+
+
+def shell_output_async(key: str, command: str, callback: Callable[[str], None], fallback: str = "...") -> bool:
+    return command_output_async(key, ["sh", "-c", command], callback, fallback)
+
+
+def awesome_reply_text(values: object) -> str:
+    items = values if isinstance(values, (list, tuple)) else (values,)
+    parts = []
+    for item in items:
+        if item is None:
+            continue
+        if isinstance(item, bool):
+            parts.append("true" if item else "false")
+        elif isinstance(item, float) and item.is_integer():
+            parts.append(str(int(item)))
+        else:
+            parts.append(str(item))
+    return "\n".join(parts)
+
+
+def session_bus_connection():
+    from gi.repository import Gio
+
+    return Gio.bus_get_sync(Gio.BusType.SESSION, None)
+
+
+def system_bus_connection():
+    from gi.repository import Gio
+
+    return Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+
+
+def awesome_eval_call(connection, script: str, timeout_ms: int, on_done=None) -> object:
+    from gi.repository import Gio, GLib
+
+    arguments = (
+        AWESOME_DBUS_NAME,
+        AWESOME_DBUS_PATH,
+        AWESOME_DBUS_INTERFACE,
+        "Eval",
+        GLib.Variant("(s)", (script,)),
+        None,
+        Gio.DBusCallFlags.NO_AUTO_START,
+        timeout_ms,
+        None,
+    )
+    if on_done is not None:
+        def finish(source, result, *_args) -> None:
+            try:
+                values = source.call_finish(result).unpack()
+            except Exception as error:
+                on_done(None, error)
+                return
+            on_done(values, None)
+
+        connection.call(*arguments, finish)
+        return None
+    return connection.call_sync(*arguments).unpack()
+
+
+class AwesomeBridge:
+    def __init__(self, timeout_ms: int = AWESOME_EVAL_TIMEOUT_MS, bus_factory=None, invoke=None):
+        self.timeout_ms = timeout_ms
+        self.bus_factory = bus_factory if bus_factory is not None else session_bus_connection
+        self.invoke = invoke if invoke is not None else awesome_eval_call
+        self.connection = None
+
+    def connect(self):
+        if self.connection is not None:
+            is_closed = getattr(self.connection, "is_closed", None)
+            if not (callable(is_closed) and is_closed()):
+                return self.connection
+            self.connection = None
+        try:
+            self.connection = self.bus_factory()
+        except Exception:
+            self.connection = None
+        return self.connection
+
+    def reset(self) -> None:
+        self.connection = None
+
+    def available(self) -> bool:
+        return self.connect() is not None
+
+    def connection_lost(self) -> bool:
+        is_closed = getattr(self.connection, "is_closed", None)
+        return self.connection is None or (callable(is_closed) and bool(is_closed()))
+
+    def eval(self, script: str, fallback: str = "", timeout_ms: int | None = None) -> str:
+        stats = shared_bar_stats()
+        started = stats.clock()
+        try:
+            return self.eval_sync(script, fallback, timeout_ms)
+        finally:
+            stats.record("awesome:eval", started)
+
+    def eval_sync(self, script: str, fallback: str = "", timeout_ms: int | None = None) -> str:
+        timeout = self.timeout_ms if timeout_ms is None else timeout_ms
+        for _attempt in range(2):
+            connection = self.connect()
+            if connection is None:
+                return fallback
+            try:
+                return awesome_reply_text(self.invoke(connection, script, timeout)) or fallback
+            except Exception:
+                if not self.connection_lost():
+                    return fallback
+                self.reset()
+        return fallback
+
+    def eval_async(self, script: str, callback: Callable[[str], None], fallback: str = "") -> bool:
+        connection = self.connect()
+        if connection is None:
+            return False
+        stats = shared_bar_stats()
+        started = stats.clock()
+
+        def done(values: object, error: object) -> None:
+            stats.record("awesome:eval_async", started)
+            if error is not None:
+                if self.connection_lost():
+                    self.reset()
+                callback(fallback)
+                return
+            callback(awesome_reply_text(values) or fallback)
+
+        try:
+            self.invoke(connection, script, self.timeout_ms, on_done=done)
+        except Exception as error:
+            done(None, error)
+        return True
+
+
+AWESOME_BRIDGE: AwesomeBridge | None = None
+
+
+def shared_awesome_bridge() -> AwesomeBridge:
+    global AWESOME_BRIDGE
+    if AWESOME_BRIDGE is None:
+        AWESOME_BRIDGE = AwesomeBridge()
+    return AWESOME_BRIDGE
+
+
+def awesome_eval(script: str, fallback: str = "") -> str:
+    bridge = shared_awesome_bridge()
+    if not bridge.available():
+        return command_output(["awesome-client", script], fallback)
+    return bridge.eval(script, fallback)
+
+
+def awesome_eval_async(key: str, script: str, callback: Callable[[str], None], fallback: str = "") -> bool:
+    if shared_awesome_bridge().eval_async(script, callback, fallback):
+        return True
+    return command_output_async(key, ["awesome-client", script], callback, fallback)
+
+
 def nested_value(data: object, *keys: str) -> object:
     current = data
     for key in keys:
@@ -447,10 +1023,11 @@ def open_network_action(action_key: str) -> None:
 
 
 def volume_text() -> str:
-    return shell_output(
-        "pactl get-sink-volume @DEFAULT_SINK@ 2>/dev/null | awk -F'/' 'NR==1 {gsub(/ /,\"\",$2); print $2}'",
-        "vol",
-    )
+    return shell_output(VOLUME_COMMAND, "vol")
+
+
+def volume_text_async(callback: Callable[[str], None]) -> None:
+    shell_output_async("volume", VOLUME_COMMAND, callback, "vol")
 
 
 def toggle_volume() -> None:
@@ -462,6 +1039,115 @@ def change_volume(delta: int) -> None:
     run_command(["pactl", "set-sink-volume", "@DEFAULT_SINK@", f"{sign}{abs(delta)}%"])
 
 
+def set_volume_async(percent: int, callback: Callable[[str], None]) -> bool:
+    return command_output_async("volume-set", ["pactl", "set-sink-volume", "@DEFAULT_SINK@", f"{percent}%"], callback)
+
+
+def volume_percent(text: str) -> int | None:
+    match = re.match(r"\s*(\d+)%", text or "")
+    return int(match.group(1)) if match else None
+
+
+class VolumeController:
+    def __init__(
+        self,
+        on_value: Callable[[str], None] | None = None,
+        apply=None,
+        scheduler=None,
+        relative=None,
+        max_percent: int | None = VOLUME_MAX_PERCENT,
+    ):
+        self.on_value = on_value
+        self.apply = apply if apply is not None else set_volume_async
+        self.scheduler = scheduler
+        self.relative = relative if relative is not None else change_volume
+        self.max_percent = max_percent
+        self.confirmed: int | None = None
+        self.muted = False
+        self.target: int | None = None
+        self.applied: int | None = None
+        self.pending_delta = 0
+        self.frame_id: int | None = None
+        self.in_flight = False
+        self.frames = 0
+        self.sets = 0
+
+    def busy(self) -> bool:
+        return self.in_flight or self.frame_id is not None or self.pending_delta != 0
+
+    def nudge(self, delta: int) -> None:
+        self.pending_delta += delta
+        if self.frame_id is not None:
+            return
+        scheduler = self.scheduler
+        if scheduler is None:
+            try:
+                from gi.repository import GLib
+
+                scheduler = GLib.timeout_add
+            except Exception:
+                self.flush()
+                return
+        self.frame_id = scheduler(VOLUME_FRAME_MS, self.flush)
+
+    def flush(self) -> bool:
+        self.frame_id = None
+        delta, self.pending_delta = self.pending_delta, 0
+        if delta == 0:
+            return False
+        self.frames += 1
+        base = self.target if self.target is not None else self.confirmed
+        if base is None:
+            self.relative(delta)
+            return False
+        target = max(0, base + delta)
+        if self.max_percent is not None:
+            target = min(max(self.max_percent, self.confirmed or 0), target)
+        if target != self.target:
+            self.target = target
+            if not self.muted and callable(self.on_value):
+                self.on_value(f"{target}%")
+        self.send()
+        return False
+
+    def send(self) -> None:
+        if self.in_flight or self.target is None or self.target == self.applied:
+            return
+        self.in_flight = True
+        self.applied = self.target
+        self.sets += 1
+        if not self.apply(self.target, self.on_applied):
+            self.in_flight = False
+            self.applied = None
+
+    def on_applied(self, _output: str = "") -> None:
+        self.in_flight = False
+        self.send()
+
+    def reconcile(self, text: str) -> str:
+        self.muted = text == "mute"
+        percent = volume_percent(text)
+        if percent is not None:
+            self.confirmed = percent
+        if self.target is None or self.muted:
+            return text
+        if self.busy():
+            return f"{self.target}%"
+        self.applied = percent
+        self.target = None
+        return text
+
+
+VOLUME_CONTROLLER: VolumeController | None = None
+
+
+def shared_volume_controller() -> VolumeController:
+    global VOLUME_CONTROLLER
+    if VOLUME_CONTROLLER is None:
+        VOLUME_CONTROLLER = VolumeController()
+    return VOLUME_CONTROLLER
+
+
 def open_audio_mixer() -> None:
     run_command(
         [
@@ -472,18 +1158,8 @@ def open_audio_mixer() -> None:
     )
 
 
-def audio_devices_listing() -> str:
-    return command_output(
-        [
-            "sh",
-            "-c",
-            "printf 'default_sink\\t%s\\n' \"$(pactl get-default-sink 2>/dev/null)\"; "
-            "pactl list short sinks 2>/dev/null | awk '{print \"sink\\t\" $2}'; "
-            "printf 'default_source\\t%s\\n' \"$(pactl get-default-source 2>/dev/null)\"; "
-            "pactl list short sources 2>/dev/null | awk '{print \"source\\t\" $2}'",
-        ],
-        "",
-    )
+def audio_devices_listing_async(callback: Callable[[str], None]) -> None:
+    shell_output_async("audio-devices", AUDIO_DEVICES_COMMAND, callback, "")
 
 
 def parse_audio_devices(stdout: str) -> dict[str, object]:
@@ -521,6 +1197,180 @@ def short_audio_name(name: str) -> str:
     return value.replace("_", " ")[:38] if value else "unknown"
 
 
+@dataclass(frozen=True)
+class AudioState:
+    default_sink: str
+    default_source: str
+    sinks: tuple[str, ...]
+    sources: tuple[str, ...]
+    volume: str
+    muted: bool
+
+
+def json_documents(text: str) -> list[object]:
+    decoder = json.JSONDecoder()
+    documents = []
+    index = 0
+    while True:
+        while index < len(text) and text[index].isspace():
+            index += 1
+        if index >= len(text):
+            return documents
+        try:
+            document, index = decoder.raw_decode(text, index)
+        except ValueError:
+            return documents
+        documents.append(document)
+
+
+def parse_audio_state(stdout: str) -> AudioState:
+    info: dict = {}
+    sinks: list[dict] = []
+    sources: list[dict] = []
+    for document in json_documents(stdout):
+        if isinstance(document, dict):
+            info = document
+            continue
+        for item in document if isinstance(document, list) else ():
+            if not isinstance(item, dict) or not item.get("name"):
+                continue
+            if "monitor_source" in item:
+                sinks.append(item)
+            elif "monitor_of_sink" in item:
+                sources.append(item)
+    default_sink = str(info.get("default_sink_name") or "")
+    sink = next((item for item in sinks if item["name"] == default_sink), {})
+    channels = [channel for channel in (sink.get("volume") or {}).values() if isinstance(channel, dict)]
+    return AudioState(
+        default_sink=default_sink,
+        default_source=str(info.get("default_source_name") or ""),
+        sinks=tuple(str(item["name"]) for item in sinks),
+        sources=tuple(str(item["name"]) for item in sources),
+        volume=str(channels[0].get("value_percent") or "").strip() if channels else "",
+        muted=sink.get("mute") is True,
+    )
+
+
+def audio_volume_text(state: AudioState) -> str:
+    if state.muted:
+        return "mute"
+    return state.volume or "vol"
+
+
+def audio_event_facility(line: str) -> str | None:
+    match = re.match(r"Event '[\w-]+' on ([\w-]+) #", line.strip())
+    return match.group(1) if match else None
+
+
+def audio_state_async(callback: Callable[[str], None]) -> None:
+    shell_output_async("audio-state", AUDIO_STATE_COMMAND, callback, "")
+
+
+def pactl_subscribe_stream(on_line: Callable[[str], None], on_closed: Callable[[], None]):
+    from gi.repository import Gio, GLib
+
+    process = Gio.Subprocess.new(
+        ["pactl", "subscribe"],
+        Gio.SubprocessFlags.STDOUT_PIPE | Gio.SubprocessFlags.STDERR_SILENCE,
+    )
+    stream = Gio.DataInputStream.new(process.get_stdout_pipe())
+
+    def on_read(source, result, *_args) -> None:
+        try:
+            line, _length = source.read_line_finish_utf8(result)
+        except Exception:
+            line = None
+        if line is None:
+            on_closed()
+            return
+        on_line(line)
+        source.read_line_async(GLib.PRIORITY_DEFAULT, None, on_read)
+
+    stream.read_line_async(GLib.PRIORITY_DEFAULT, None, on_read)
+    return process
+
+
+class AudioService:
+    def __init__(self, on_state: Callable[[AudioState], None] | None = None, fetch=None, stream=None, scheduler=None):
+        self.on_state = on_state
+        self.fetch = fetch if fetch is not None else audio_state_async
+        self.stream = stream if stream is not None else pactl_subscribe_stream
+        self.scheduler = scheduler
+        self.state: AudioState | None = None
+        self.process = None
+        self.running = False
+        self.fetching = False
+        self.dirty = False
+        self.events = 0
+        self.restart_delay = AUDIO_RESTART_MS
+
+    def open_stream(self) -> bool:
+        try:
+            self.process = self.stream(self.on_line, self.on_closed)
+        except Exception:
+            self.process = None
+            return False
+        self.refresh()
+        return True
+
+    def start(self) -> bool:
+        self.running = self.open_stream()
+        return self.running
+
+    def stop(self) -> None:
+        self.running = False
+        process, self.process = self.process, None
+        force_exit = getattr(process, "force_exit", None)
+        if callable(force_exit):
+            force_exit()
+
+    def on_line(self, line: str) -> None:
+        self.restart_delay = AUDIO_RESTART_MS
+        if audio_event_facility(line) in AUDIO_EVENT_FACILITIES:
+            self.events += 1
+            self.refresh()
+
+    def on_closed(self) -> None:
+        self.process = None
+        if not self.running:
+            return
+        scheduler = self.scheduler
+        if scheduler is None:
+            try:
+                from gi.repository import GLib
+
+                scheduler = GLib.timeout_add
+            except Exception:
+                return
+        scheduler(self.restart_delay, self.restart)
+        self.restart_delay = min(AUDIO_RESTART_MAX_MS, self.restart_delay * 2)
+
+    def restart(self) -> bool:
+        if self.running and self.process is None and not self.open_stream():
+            self.on_closed()
+        return False
+
+    def refresh(self) -> None:
+        if self.fetching:
+            self.dirty = True
+            return
+        self.fetching = True
+        self.fetch(self.on_fetched)
+
+    def on_fetched(self, stdout: str) -> None:
+        self.fetching = False
+        if self.dirty:
+            self.dirty = False
+            self.refresh()
+            return
+        state = parse_audio_state(stdout)
+        if state == self.state:
+            return
+        self.state = state
+        if callable(self.on_state):
+            self.on_state(state)
+
+
 def calendar_text_from_output(text: str) -> str:
     value = text.rstrip()
     return value or "calendar unavailable"
@@ -549,66 +1399,119 @@ def shifted_date_by_days(value: date, delta: int) -> date:
     return value + timedelta(days=delta)
 
 
+CALENDAR_WEEKS = 6
+CALENDAR_CACHE_MONTHS = 25
+CALENDAR_PREWARM_RADIUS = 6
+
+
 def calendar_day_style_classes(
     day: date,
     today: date,
     selected: date,
-    marker_days: set[date] | None = None,
+    marker_days: set[date] | frozenset[date] | None = None,
 ) -> list[str]:
-    marker_days = marker_days or set()
     classes = ["current-month"] if day.month == selected.month else ["adjacent-month"]
     if day == today:
         classes.append("today")
     if day == selected:
         classes.append("selected")
-    if day in marker_days:
+    if marker_days and day in marker_days:
         classes.append("has-marker")
     if day.weekday() >= 5:
         classes.append("weekend")
     return classes
 
 
+def calendar_month_grid(year: int, month: int) -> tuple[tuple[date, ...], ...]:
+    first_day = date(year, month, 1)
+    start = shifted_date_by_days(first_day, -((first_day.weekday() + 1) % 7))
+    return tuple(
+        tuple(shifted_date_by_days(start, week * 7 + offset) for offset in range(7)) for week in range(CALENDAR_WEEKS)
+    )
+
+
+class CalendarMonthCache:
+    def __init__(self, capacity: int = CALENDAR_CACHE_MONTHS):
+        self.capacity = max(1, int(capacity))
+        self.grids: dict[tuple[int, int], tuple[tuple[date, ...], ...]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def grid(self, year: int, month: int) -> tuple[tuple[date, ...], ...]:
+        key = (year, month)
+        grid = self.grids.pop(key, None)
+        if grid is None:
+            self.misses += 1
+            grid = calendar_month_grid(year, month)
+        else:
+            self.hits += 1
+        self.store(key, grid)
+        return grid
+
+    def store(self, key: tuple[int, int], grid: tuple[tuple[date, ...], ...]) -> None:
+        self.grids[key] = grid
+        while len(self.grids) > self.capacity:
+            self.grids.pop(next(iter(self.grids)))
+
+    def warm(self, year: int, month: int, radius: int = CALENDAR_PREWARM_RADIUS) -> int:
+        built = 0
+        for delta in sorted(range(-radius, radius + 1), key=abs, reverse=True):
+            key = shifted_month(year, month, delta)
+            grid = self.grids.pop(key, None)
+            if grid is None:
+                grid = calendar_month_grid(*key)
+                built += 1
+            self.store(key, grid)
+        return built
+
+
+CALENDAR_MONTHS: CalendarMonthCache | None = None
+
+
+def shared_calendar_months() -> CalendarMonthCache:
+    global CALENDAR_MONTHS
+    if CALENDAR_MONTHS is None:
+        CALENDAR_MONTHS = CalendarMonthCache()
+    return CALENDAR_MONTHS
+
+
+def prewarm_calendar_months(today: date | None = None) -> bool:
+    today = today or date.today()
+    try:
+        from gi.repository import GLib
+    except Exception:
+        return False
+
+    def warm() -> bool:
+        shared_calendar_months().warm(today.year, today.month)
+        return False
+
+    GLib.idle_add(warm, priority=GLib.PRIORITY_LOW)
+    return True
+
+
 def calendar_month_model(
     year: int,
     month: int,
     today: date | None = None,
     selected: date | None = None,
-    marker_days: set[date] | None = None,
+    marker_days: set[date] | frozenset[date] | None = None,
+    months: CalendarMonthCache | None = None,
 ) -> dict[str, object]:
     today = today or date.today()
     selected = selected or today
-    marker_days = marker_days or set()
-    renderer = calendar.Calendar(calendar.SUNDAY)
-    weeks = []
-    for week in renderer.monthdatescalendar(year, month):
-        weeks.append(
-            [
-                {
-                    "date": day,
-                    "day": str(day.day),
-                    "style_classes": calendar_day_style_classes(day, today, selected, marker_days),
-                }
-                for day in week
-            ]
-        )
-
-    while len(weeks) < 6:
-        last_day = weeks[-1][-1]["date"]
-        weeks.append(
-            [
-                {
-                    "date": shifted_date_by_days(last_day, offset),
-                    "day": str(shifted_date_by_days(last_day, offset).day),
-                    "style_classes": calendar_day_style_classes(
-                        shifted_date_by_days(last_day, offset),
-                        today,
-                        selected,
-                        marker_days,
-                    ),
-                }
-                for offset in range(1, 8)
-            ]
-        )
+    grid = months.grid(year, month) if months is not None else calendar_month_grid(year, month)
+    weeks = [
+        [
+            {
+                "date": day,
+                "day": str(day.day),
+                "style_classes": calendar_day_style_classes(day, today, selected, marker_days),
+            }
+            for day in week
+        ]
+        for week in grid
+    ]
 
     return {
         "title": f"{calendar.month_name[month]} {year}",
@@ -618,7 +1521,7 @@ def calendar_month_model(
         "selected": selected,
         "selected_label": selected.strftime("%a %b %-d, %Y"),
         "weekdays": ["Su", "Mo", "Tu", "We", "Th", "Fr", "Sa"],
-        "weeks": weeks[:6],
+        "weeks": weeks,
     }
 
 
@@ -665,78 +1568,212 @@ def battery_value_from_output(text: str) -> str | None:
     return value or None
 
 
-def parse_upower_battery_info(text: str) -> dict[str, str]:
-    parsed = {
-        "state": "",
-        "percentage": "",
-        "time_to_full": "",
-        "time_to_empty": "",
-        "energy_rate": "",
-    }
-    key_map = {
-        "state": "state",
-        "percentage": "percentage",
-        "time to full": "time_to_full",
-        "time to empty": "time_to_empty",
-        "energy-rate": "energy_rate",
-        "energy rate": "energy_rate",
-    }
-    for line in text.splitlines():
-        key, separator, value = line.strip().partition(":")
-        if not separator:
-            continue
-        normalized_key = re.sub(r"\s+", " ", key.strip().lower())
-        target = key_map.get(normalized_key)
-        if target:
-            parsed[target] = value.strip()
-    return parsed
+@dataclass(frozen=True)
+class BatterySnapshot:
+    state: str
+    percentage: float
+    time_to_full: int = 0
+    time_to_empty: int = 0
+    energy_rate: float = 0.0
 
 
-def battery_summary_from_info(info: dict[str, str]) -> str | None:
-    percentage = info.get("percentage", "").strip()
-    if not percentage:
+def battery_snapshot_from_properties(properties: dict[str, object]) -> BatterySnapshot | None:
+    if not properties.get("IsPresent"):
+        return None
+    try:
+        return BatterySnapshot(
+            state=UPOWER_STATES.get(int(properties.get("State") or 0), "unknown"),
+            percentage=float(properties.get("Percentage") or 0.0),
+            time_to_full=int(properties.get("TimeToFull") or 0),
+            time_to_empty=int(properties.get("TimeToEmpty") or 0),
+            energy_rate=float(properties.get("EnergyRate") or 0.0),
+        )
+    except (TypeError, ValueError):
         return None
 
-    state = info.get("state", "").strip().lower()
-    state_label = {
-        "charging": "CHG",
-        "discharging": "BAT",
-        "fully-charged": "AC",
-        "pending-charge": "AC",
-        "pending-discharge": "AC",
-        "empty": "LOW",
-    }.get(state, "")
-    return f"{percentage} {state_label}".strip()
 
+def read_power_supply_value(path: Path) -> str:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return ""
 
-def battery_detail_rows(info: dict[str, str]) -> list[tuple[str, str]]:
-    rows = []
-    for key, label in (
-        ("state", "State"),
-        ("percentage", "Charge"),
-        ("time_to_full", "Time to full"),
-        ("time_to_empty", "Time to empty"),
-        ("energy_rate", "Energy rate"),
-    ):
-        value = info.get(key, "").strip()
+
+def power_supply_number(directory: Path, *names: str) -> float:
+    for name in names:
+        try:
+            return float(read_power_supply_value(directory / name))
+        except ValueError:
+            continue
+    return 0.0
+
+
+def power_supply_snapshot(root: Path = POWER_SUPPLY_PATH) -> BatterySnapshot | None:
+    try:
+        directories = sorted(root.iterdir())
+    except OSError:
+        return None
+    for directory in directories:
+        if read_power_supply_value(directory / "type") != "Battery":
+            continue
+        if read_power_supply_value(directory / "present") == "0":
+            continue
+        state = POWER_SUPPLY_STATES.get(read_power_supply_value(directory / "status").lower(), "unknown")
+        now = power_supply_number(directory, "energy_now", "charge_now")
+        full = power_supply_number(directory, "energy_full", "charge_full")
+        rate = abs(power_supply_number(directory, "power_now", "current_now"))
+        percentage = power_supply_number(directory, "capacity")
+        if not percentage and full:
+            percentage = now / full * 100
+        time_to_full = int((full - now) / rate * 3600) if state == "charging" and rate else 0
+        time_to_empty = int(now / rate * 3600) if state == "discharging" and rate else 0
+        voltage = power_supply_number(directory, "voltage_now")
+        watts = rate / 1_000_000
+        if (directory / "current_now").exists() and not (directory / "power_now").exists():
+            watts = watts * voltage / 1_000_000
+        return BatterySnapshot(
+            state=state,
+            percentage=percentage,
+            time_to_full=time_to_full,
+            time_to_empty=time_to_empty,
+            energy_rate=watts,
+        )
+    return None
+
+
+def battery_duration_text(seconds: int) -> str:
+    if seconds <= 0:
+        return ""
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f} hours"
+    return f"{max(1, round(seconds / 60))} minutes"
+
+
+def battery_percentage_text(snapshot: BatterySnapshot) -> str:
+    return f"{snapshot.percentage:.0f}%"
+
+
+def battery_summary_from_info(snapshot: BatterySnapshot | None) -> str | None:
+    if snapshot is None:
+        return None
+
+    state_label = {
+        "charging": "CHG",
+        "discharging": "BAT",
+        "fully-charged": "AC",
+        "pending-charge": "AC",
+        "pending-discharge": "AC",
+        "empty": "LOW",
+    }.get(snapshot.state, "")
+    return f"{battery_percentage_text(snapshot)} {state_label}".strip()
+
+
+def battery_detail_rows(snapshot: BatterySnapshot | None) -> list[tuple[str, str]]:
+    if snapshot is None:
+        return []
+    rows = []
+    for label, value in (
+        ("State", snapshot.state if snapshot.state != "unknown" else ""),
+        ("Charge", battery_percentage_text(snapshot)),
+        ("Time to full", battery_duration_text(snapshot.time_to_full)),
+        ("Time to empty", battery_duration_text(snapshot.time_to_empty)),
+        ("Energy rate", f"{snapshot.energy_rate:.1f} W" if snapshot.energy_rate > 0 else ""),
+    ):
         if value:
             rows.append((label, value))
     return rows
 
 
-def first_battery_path() -> str:
-    return command_output(["sh", "-c", "upower -e 2>/dev/null | grep '/battery_' | head -n1"], "")
+def dbus_properties(connection, bus_name: str, path: str, interface: str) -> dict[str, object]:
+    from gi.repository import Gio, GLib
 
+    reply = connection.call_sync(
+        bus_name,
+        path,
+        "org.freedesktop.DBus.Properties",
+        "GetAll",
+        GLib.Variant("(s)", (interface,)),
+        GLib.VariantType.new("(a{sv})"),
+        Gio.DBusCallFlags.NONE,
+        UPOWER_TIMEOUT_MS,
+        None,
+    )
+    return dict(reply.unpack()[0])
+
+
+def upower_display_properties(connection) -> dict[str, object]:
+    return dbus_properties(connection, UPOWER_BUS_NAME, UPOWER_DISPLAY_DEVICE_PATH, UPOWER_DEVICE_INTERFACE)
 
-def battery_info() -> dict[str, str]:
-    battery_path = first_battery_path()
-    if not battery_path:
-        return parse_upower_battery_info("")
-    return parse_upower_battery_info(command_output(["upower", "-i", battery_path], ""))
+
+def battery_snapshot() -> BatterySnapshot | None:
+    try:
+        return battery_snapshot_from_properties(upower_display_properties(system_bus_connection()))
+    except Exception:
+        return power_supply_snapshot()
 
 
 def battery_value() -> str | None:
-    return battery_summary_from_info(battery_info())
+    return battery_summary_from_info(battery_snapshot())
+
+
+class BatteryMonitor:
+    def __init__(
+        self,
+        on_snapshot: Callable[[BatterySnapshot | None], None] | None = None,
+        bus_factory=None,
+        get_properties=None,
+    ):
+        self.on_snapshot = on_snapshot
+        self.bus_factory = bus_factory if bus_factory is not None else system_bus_connection
+        self.get_properties = get_properties if get_properties is not None else upower_display_properties
+        self.connection = None
+        self.subscription_id: int | None = None
+        self.properties: dict[str, object] = {}
+        self.snapshot: BatterySnapshot | None = None
+
+    def start(self) -> bool:
+        try:
+            from gi.repository import Gio
+
+            self.connection = self.bus_factory()
+            self.properties = dict(self.get_properties(self.connection))
+            self.subscription_id = self.connection.signal_subscribe(
+                UPOWER_BUS_NAME,
+                "org.freedesktop.DBus.Properties",
+                "PropertiesChanged",
+                UPOWER_DISPLAY_DEVICE_PATH,
+                UPOWER_DEVICE_INTERFACE,
+                Gio.DBusSignalFlags.NONE,
+                self.on_signal,
+            )
+        except Exception:
+            self.connection = None
+            self.subscription_id = None
+            return False
+        self.snapshot = battery_snapshot_from_properties(self.properties)
+        return True
+
+    def stop(self) -> None:
+        if self.connection is not None and self.subscription_id is not None:
+            self.connection.signal_unsubscribe(self.subscription_id)
+        self.subscription_id = None
+
+    def on_signal(self, _connection, _sender, _path, _interface, _signal, parameters, *_args) -> None:
+        try:
+            _device_interface, changed, _invalidated = parameters.unpack()
+        except Exception:
+            return
+        self.apply(dict(changed))
+
+    def apply(self, changed: dict[str, object]) -> bool:
+        self.properties.update(changed)
+        snapshot = battery_snapshot_from_properties(self.properties)
+        if snapshot == self.snapshot:
+            return False
+        self.snapshot = snapshot
+        if callable(self.on_snapshot):
+            self.on_snapshot(snapshot)
+        return True
 
 
 def parse_power_profiles(text: str) -> list[dict[str, object]]:
@@ -748,14 +1785,153 @@ def parse_power_profiles(text: str) -> list[dict[str, object]]:
     return profiles
 
 
+def power_profiles_from_properties(properties: dict[str, object]) -> list[dict[str, object]]:
+    active = str(properties.get("ActiveProfile") or "")
+    raw_profiles = properties.get("Profiles")
+    profiles = []
+    for item in reversed(raw_profiles) if isinstance(raw_profiles, list) else []:
+        name = str(item.get("Profile") or "") if isinstance(item, dict) else ""
+        if name:
+            profiles.append({"name": name, "active": name == active})
+    return profiles
+
+
+def power_profiles_properties(connection) -> dict[str, object]:
+    return dbus_properties(connection, POWER_PROFILES_BUS_NAME, POWER_PROFILES_PATH, POWER_PROFILES_INTERFACE)
+
+
+def write_active_power_profile(connection, profile: str, on_done: Callable[[bool], None]) -> None:
+    from gi.repository import Gio, GLib
+
+    def finish(source, result, *_args) -> None:
+        try:
+            source.call_finish(result)
+        except Exception:
+            on_done(False)
+            return
+        on_done(True)
+
+    connection.call(
+        POWER_PROFILES_BUS_NAME,
+        POWER_PROFILES_PATH,
+        "org.freedesktop.DBus.Properties",
+        "Set",
+        GLib.Variant("(ssv)", (POWER_PROFILES_INTERFACE, "ActiveProfile", GLib.Variant("s", profile))),
+        None,
+        Gio.DBusCallFlags.NONE,
+        UPOWER_TIMEOUT_MS,
+        None,
+        finish,
+    )
+
+
+class PowerProfilesMonitor:
+    def __init__(
+        self,
+        on_profiles: Callable[[list[dict[str, object]]], None] | None = None,
+        bus_factory=None,
+        get_properties=None,
+        write_profile=None,
+    ):
+        self.on_profiles = on_profiles
+        self.bus_factory = bus_factory if bus_factory is not None else system_bus_connection
+        self.get_properties = get_properties if get_properties is not None else power_profiles_properties
+        self.write_profile = write_profile if write_profile is not None else write_active_power_profile
+        self.connection = None
+        self.subscription_id: int | None = None
+        self.properties: dict[str, object] = {}
+        self.profiles: list[dict[str, object]] = []
+
+    def start(self) -> bool:
+        try:
+            from gi.repository import Gio
+
+            self.connection = self.bus_factory()
+            self.properties = dict(self.get_properties(self.connection))
+            self.subscription_id = self.connection.signal_subscribe(
+                POWER_PROFILES_BUS_NAME,
+                "org.freedesktop.DBus.Properties",
+                "PropertiesChanged",
+                POWER_PROFILES_PATH,
+                POWER_PROFILES_INTERFACE,
+                Gio.DBusSignalFlags.NONE,
+                self.on_signal,
+            )
+        except Exception:
+            self.connection = None
+            self.subscription_id = None
+            return False
+        self.profiles = power_profiles_from_properties(self.properties)
+        return True
+
+    def stop(self) -> None:
+        if self.connection is not None and self.subscription_id is not None:
+            self.connection.signal_unsubscribe(self.subscription_id)
+        self.subscription_id = None
+
+    def on_signal(self, _connection, _sender, _path, _interface, _signal, parameters, *_args) -> None:
+        try:
+            _profiles_interface, changed, _invalidated = parameters.unpack()
+        except Exception:
+            return
+        self.apply(dict(changed))
+
+    def apply(self, changed: dict[str, object]) -> bool:
+        self.properties.update(changed)
+        return self.show(power_profiles_from_properties(self.properties))
+
+    def show(self, profiles: list[dict[str, object]]) -> bool:
+        if profiles == self.profiles:
+            return False
+        self.profiles = profiles
+        if callable(self.on_profiles):
+            self.on_profiles(profiles)
+        return True
+
+    def set_active(self, profile: str, on_failed: Callable[[str], None] | None = None) -> bool:
+        if self.connection is None:
+            return False
+        self.show([{**item, "active": item.get("name") == profile} for item in self.profiles])
+        try:
+            self.write_profile(self.connection, profile, lambda ok: self.on_written(profile, ok, on_failed))
+        except Exception:
+            self.show(power_profiles_from_properties(self.properties))
+            return False
+        return True
+
+    def on_written(self, profile: str, ok: bool, on_failed: Callable[[str], None] | None = None) -> None:
+        if ok:
+            return
+        self.show(power_profiles_from_properties(self.properties))
+        if callable(on_failed):
+            on_failed(profile)
+
+
+POWER_PROFILES_MONITOR: PowerProfilesMonitor | None = None
+
+
+def shared_power_profiles_monitor() -> PowerProfilesMonitor:
+    global POWER_PROFILES_MONITOR
+    if POWER_PROFILES_MONITOR is None:
+        POWER_PROFILES_MONITOR = PowerProfilesMonitor()
+    return POWER_PROFILES_MONITOR
+
+
 def power_profiles() -> list[dict[str, object]]:
     return parse_power_profiles(command_output(["powerprofilesctl", "list"], ""))
 
 
+def power_profiles_async(callback: Callable[[list[dict[str, object]]], None]) -> None:
+    command_output_async("power-profiles", ["powerprofilesctl", "list"], lambda text: callback(parse_power_profiles(text)), "")
+
+
 def set_power_profile(profile: str) -> None:
     if not re.match(r"^[A-Za-z0-9-]+$", profile):
         return
-    run_command(["powerprofilesctl", "set", profile])
+    fallback = lambda target: run_command(["powerprofilesctl", "set", target])
+    if shared_power_profiles_monitor().set_active(profile, on_failed=fallback):
+        return
+    fallback(profile)
 
 
 def profile_display_name(profile: str) -> str:
@@ -775,19 +1951,16 @@ def normalize_dnd_text(text: str) -> str:
 
 def dnd_text() -> str:
     return normalize_dnd_text(
-        command_output(
-            ["awesome-client", dnd_lua("return dnd.is_enabled() and 'on' or 'off'")],
-            "off",
-        )
+        awesome_eval(dnd_lua("return dnd.is_enabled() and 'on' or 'off'"), "off")
     )
 
 
-def toggle_dnd() -> str:
-    return normalize_dnd_text(
-        command_output(
-            ["awesome-client", dnd_lua("return dnd.toggle() and 'on' or 'off'")],
-            "off",
-        )
+def toggle_dnd_async(callback: Callable[[str], None]) -> bool:
+    return awesome_eval_async(
+        "dnd-toggle",
+        dnd_lua("return dnd.toggle() and 'on' or 'off'"),
+        lambda text: callback(normalize_dnd_text(text)),
+        "off",
     )
 
 
@@ -806,74 +1979,487 @@ def valid_window_ids(window_ids: object) -> list[str]:
     return ids
 
 
-def awesome_focus_window_lua(window_id: object) -> str | None:
-    target = valid_window_id(window_id)
-    if target is None:
-        return None
-    return (
-        "local target = tonumber('%s'); "
-        "for _, c in ipairs(client.get()) do "
-        "if c.window == target then "
-        "c.minimized = false; "
-        "c:emit_signal('request::activate', 'fabric-taskbar', {raise = true}); "
-        "return true "
-        "end "
-        "end "
-        "return false"
-    ) % target
-
-
-def awesome_close_windows_lua(window_ids: object) -> str | None:
-    ids = valid_window_ids(window_ids)
-    if not ids:
-        return None
-    targets = ", ".join(f"[{window_id}]=true" for window_id in ids)
-    return (
-        f"local targets = {{{targets}}}; "
-        "for _, c in ipairs(client.get()) do "
-        "if targets[c.window] then "
-        "c:kill(); "
-        "end "
-        "end "
-        "return true"
-    )
+AwesomeAction = tuple[str, list[str], Callable[[bool], None] | None]
+
+
+def plan_awesome_actions(actions: list[AwesomeAction]) -> tuple[list[tuple[str, str | None]], list[list[int]]]:
+    kills: list[str] = []
+    for kind, window_ids, _on_result in actions:
+        if kind == "close":
+            kills.extend(window_id for window_id in window_ids if window_id not in kills)
+    ops: list[tuple[str, str | None]] = [("kill", window_id) for window_id in kills]
+    kill_index = {window_id: index for index, window_id in enumerate(kills)}
+
+    focus_action = None
+    for position, (kind, window_ids, _on_result) in enumerate(actions):
+        if kind == "focus" and window_ids[0] not in kill_index:
+            focus_action = position
+    if focus_action is not None:
+        ops.append(("focus", actions[focus_action][1][0]))
+    focus_index = len(ops) - 1
+    if any(kind == "menu" for kind, _window_ids, _on_result in actions):
+        ops.append(("menu", None))
+    menu_index = len(ops) - 1
+
+    plans: list[list[int]] = []
+    for position, (kind, window_ids, _on_result) in enumerate(actions):
+        if kind == "close":
+            plans.append([kill_index[window_id] for window_id in window_ids])
+        elif kind == "focus":
+            plans.append([focus_index] if position == focus_action else [])
+        else:
+            plans.append([menu_index])
+    return ops, plans
+
+
+def awesome_action_batch_lua(ops: list[tuple[str, str | None]]) -> str:
+    lines = [
+        "local by_window = {}",
+        "for _, item in ipairs(client.get()) do by_window[item.window] = item end",
+        "local results = {}",
+        "local c",
+    ]
+    for op, window_id in ops:
+        if op == "kill":
+            lines.append(f"c = by_window[{window_id}]; if c then c:kill() end; results[#results + 1] = c and '1' or '0'")
+        elif op == "focus":
+            lines.append(
+                f"c = by_window[{window_id}]; "
+                "if c then c.minimized = false; c:emit_signal('request::activate', 'fabric-taskbar', {raise = true}) end; "
+                "results[#results + 1] = c and '1' or '0'"
+            )
+        elif op == "menu":
+            lines.append(
+                "results[#results + 1] = pcall(function() "
+                "require('awful').menu.client_list({ theme = { width = 250 } }) "
+                "end) and '1' or '0'"
+            )
+    lines.append("return table.concat(results)")
+    return "\n".join(lines)
 
 
-def focus_window(window_id: object) -> None:
-    script = awesome_focus_window_lua(window_id)
-    if script is not None:
-        run_command(["awesome-client", script])
+def awesome_action_results(stdout: str, count: int) -> list[bool]:
+    flags = decode_awesome_string(stdout or "").strip()
+    return [index < len(flags) and flags[index] == "1" for index in range(count)]
 
 
-def close_windows(window_ids: object) -> None:
-    script = awesome_close_windows_lua(window_ids)
-    if script is not None:
-        run_command(["awesome-client", script])
+def awesome_action_run(script: str, callback: Callable[[str], None]) -> bool:
+    return awesome_eval_async("awesome-actions", script, callback)
 
 
-def close_window(window_id: object) -> None:
-    close_windows([window_id])
+class AwesomeActionQueue:
+    def __init__(self, run=None, scheduler=None, delay_ms: int = AWESOME_ACTION_BATCH_MS):
+        self.run = run if run is not None else awesome_action_run
+        self.scheduler = scheduler
+        self.delay_ms = delay_ms
+        self.on_failure: Callable[[], None] | None = None
+        self.pending: list[AwesomeAction] = []
+        self.timer_id: int | None = None
+        self.in_flight = False
+        self.batches = 0
 
+    def push(self, kind: str, window_ids: object = (), on_result: Callable[[bool], None] | None = None) -> bool:
+        ids = [] if kind == "menu" else valid_window_ids(window_ids)
+        if kind not in {"focus", "close", "menu"} or (kind != "menu" and not ids):
+            return False
+        self.pending.append((kind, ids[:1] if kind == "focus" else ids, on_result))
+        self.schedule()
+        return True
 
-def open_client_menu() -> None:
-    run_command(
-        [
-            "awesome-client",
-            'local awful = require("awful"); awful.menu.client_list({ theme = { width = 250 } })',
-        ]
-    )
+    def schedule(self) -> None:
+        if self.timer_id is not None or self.in_flight:
+            return
+        scheduler = self.scheduler
+        if scheduler is None:
+            try:
+                from gi.repository import GLib
+
+                scheduler = GLib.timeout_add
+            except Exception:
+                self.flush()
+                return
+        self.timer_id = scheduler(self.delay_ms, self.flush)
+
+    def flush(self) -> bool:
+        self.timer_id = None
+        if self.in_flight or not self.pending:
+            return False
+        actions, self.pending = self.pending, []
+        ops, plans = plan_awesome_actions(actions)
+        self.in_flight = True
+        self.batches += 1
+        finished = {"done": False}
+
+        def done(stdout: str) -> None:
+            if finished["done"]:
+                return
+            finished["done"] = True
+            self.finish(actions, plans, awesome_action_results(stdout, len(ops)))
+
+        try:
+            started = self.run(awesome_action_batch_lua(ops), done)
+        except Exception:
+            started = False
+        if not started:
+            done("")
+        return False
+
+    def finish(self, actions: list[AwesomeAction], plans: list[list[int]], results: list[bool]) -> None:
+        self.in_flight = False
+        failed = False
+        for (_kind, _window_ids, on_result), indexes in zip(actions, plans):
+            ok = bool(indexes) and all(results[index] for index in indexes)
+            failed = failed or not ok
+            if callable(on_result):
+                on_result(ok)
+        if failed and callable(self.on_failure):
+            self.on_failure()
+        if self.pending:
+            self.schedule()
+
+
+ACTION_QUEUE: AwesomeActionQueue | None = None
+
+
+def shared_action_queue() -> AwesomeActionQueue:
+    global ACTION_QUEUE
+    if ACTION_QUEUE is None:
+        ACTION_QUEUE = AwesomeActionQueue()
+    return ACTION_QUEUE
+
+
+def focus_window(window_id: object, on_result: Callable[[bool], None] | None = None) -> bool:
+    return shared_action_queue().push("focus", [window_id], on_result)
+
+
+def close_windows(window_ids: object, on_result: Callable[[bool], None] | None = None) -> bool:
+    return shared_action_queue().push("close", window_ids, on_result)
+
+
+def close_window(window_id: object, on_result: Callable[[bool], None] | None = None) -> bool:
+    return close_windows([window_id], on_result)
+
+
+def open_client_menu(on_result: Callable[[bool], None] | None = None) -> bool:
+    return shared_action_queue().push("menu", (), on_result)
+
+
+def flash_action_failure(widget: object, ok: bool, scheduler=None) -> bool:
+    add_style_class = getattr(widget, "add_style_class", None)
+    if ok or not callable(add_style_class):
+        return False
+    if scheduler is None:
+        try:
+            from gi.repository import GLib
+
+            scheduler = GLib.timeout_add
+        except Exception:
+            scheduler = None
+    add_style_class("failed")
+    if scheduler is not None:
+        scheduler(ACTION_FAILURE_FLASH_MS, lambda: widget.remove_style_class("failed") or False)
+    return True
+
+
+@dataclass(frozen=True)
+class RouteEntry:
+    interface: str
+    destination: int
+    mask: int
+    metric: int
+    flags: int
+
+
+def ipv4_route_value(address: str) -> int:
+    return struct.unpack("=I", socket.inet_aton(address))[0]
+
+
+def parse_proc_net_route(text: str) -> list[RouteEntry]:
+    routes = []
+    for line in text.splitlines()[1:]:
+        parts = line.split()
+        if len(parts) < 8:
+            continue
+        try:
+            routes.append(
+                RouteEntry(
+                    interface=parts[0],
+                    destination=int(parts[1], 16),
+                    flags=int(parts[3], 16),
+                    metric=int(parts[6]),
+                    mask=int(parts[7], 16),
+                )
+            )
+        except ValueError:
+            continue
+    return routes
+
+
+def interface_operstate(interface: str) -> str:
+    try:
+        return (SYS_CLASS_NET_PATH / interface / "operstate").read_text().strip().lower()
+    except OSError:
+        return "unknown"
+
+
+def route_interface_for(
+    routes: list[RouteEntry],
+    address: str = NETWORK_PROBE_ADDRESS,
+    operstate: Callable[[str], str] = interface_operstate,
+) -> str:
+    target = ipv4_route_value(address)
+    best: tuple[int, int] | None = None
+    interface = ""
+    for route in routes:
+        if not route.flags & ROUTE_FLAG_UP or target & route.mask != route.destination:
+            continue
+        if operstate(route.interface) in {"down", "lowerlayerdown", "notpresent"}:
+            continue
+        rank = (bin(route.mask).count("1"), -route.metric)
+        if best is None or rank > best:
+            best = rank
+            interface = route.interface
+    return interface
 
 
-def battery_text() -> str:
-    return battery_value() or ""
+def default_route_interface(route_path: Path = PROC_NET_ROUTE_PATH) -> str:
+    try:
+        text = route_path.read_text()
+    except OSError:
+        return ""
+    return route_interface_for(parse_proc_net_route(text))
 
 
 def network_text() -> str:
-    interface = shell_output(
-        "ip -o -4 route get 1.1.1.1 2>/dev/null | awk '{for (i=1; i<=NF; i++) if ($i==\"dev\") {print $(i+1); exit}}'",
-        "",
-    )
-    return network_label_from_interface(interface)
+    return network_label_from_interface(default_route_interface())
+
+
+def rtnetlink_socket() -> socket.socket:
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW | socket.SOCK_NONBLOCK, socket.NETLINK_ROUTE)
+    sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV4_ROUTE))
+    return sock
+
+
+def watch_readable(fd: int, callback: Callable[[], bool]) -> int:
+    from gi.repository import GLib
+
+    return GLib.unix_fd_add_full(GLib.PRIORITY_DEFAULT, fd, GLib.IOCondition.IN, lambda *_args: callback())
+
+
+class NetworkMonitor:
+    def __init__(
+        self,
+        on_label: Callable[[str], None] | None = None,
+        read_label: Callable[[], str] = network_text,
+        socket_factory=None,
+        watch=None,
+        cancel=None,
+    ):
+        self.on_label = on_label
+        self.read_label = read_label
+        self.socket_factory = socket_factory if socket_factory is not None else rtnetlink_socket
+        self.watch = watch if watch is not None else watch_readable
+        self.cancel = cancel
+        self.socket = None
+        self.watch_id: int | None = None
+        self.label: str | None = None
+        self.events = 0
+
+    def start(self) -> bool:
+        try:
+            self.socket = self.socket_factory()
+            self.watch_id = self.watch(self.socket.fileno(), self.on_readable)
+        except Exception:
+            self.stop()
+            return False
+        self.refresh()
+        return True
+
+    def stop(self) -> None:
+        if self.watch_id is not None:
+            cancel = self.cancel
+            if cancel is None:
+                try:
+                    from gi.repository import GLib
+
+                    cancel = GLib.source_remove
+                except Exception:
+                    cancel = None
+            if cancel is not None:
+                cancel(self.watch_id)
+        self.watch_id = None
+        if self.socket is not None:
+            self.socket.close()
+        self.socket = None
+
+    def on_readable(self) -> bool:
+        if self.socket is None:
+            return False
+        while True:
+            try:
+                if not self.socket.recv(65536):
+                    break
+            except BlockingIOError:
+                break
+            except OSError:
+                break
+            self.events += 1
+        self.refresh()
+        return True
+
+    def refresh(self) -> None:
+        label = self.read_label()
+        if label == self.label:
+            return
+        self.label = label
+        if callable(self.on_label):
+            self.on_label(label)
+
+
+@dataclass(frozen=True)
+class SystemLoad:
+    cpu: float | None
+    memory: float
+    load: float
+
+
+def proc_cpu_times(text: str) -> tuple[int, int] | None:
+    fields = text.split("\n", 1)[0].split()
+    if len(fields) < 5 or fields[0] != "cpu":
+        return None
+    times = [int(value) for value in fields[1:9]]
+    return sum(times), sum(times[3:5])
+
+
+def proc_memory_percent(text: str) -> float | None:
+    values = {}
+    for line in text.splitlines():
+        key, _sep, rest = line.partition(":")
+        if key in {"MemTotal", "MemAvailable"}:
+            values[key] = int(rest.split()[0])
+            if len(values) == 2:
+                break
+    total = values.get("MemTotal")
+    available = values.get("MemAvailable")
+    if not total or available is None:
+        return None
+    return (1 - available / total) * 100
+
+
+def proc_load_average(text: str) -> float | None:
+    try:
+        return float(text.split(maxsplit=1)[0])
+    except (IndexError, ValueError):
+        return None
+
+
+def cpu_percent(previous: tuple[int, int] | None, current: tuple[int, int]) -> float | None:
+    if previous is None:
+        return None
+    total = current[0] - previous[0]
+    idle = current[1] - previous[1]
+    if total <= 0:
+        return 0.0
+    return min(max((1 - idle / total) * 100, 0.0), 100.0)
+
+
+class SystemSampler:
+    def __init__(
+        self,
+        capacity: int = SYSTEM_HISTORY_SAMPLES,
+        paths: tuple[Path, Path, Path] = (PROC_STAT_PATH, PROC_MEMINFO_PATH, PROC_LOADAVG_PATH),
+        opener=os.open,
+        reader=os.pread,
+        clock=time.monotonic,
+        period_ms: int = POLL_INTERVALS_MS["system"][0],
+    ):
+        self.paths = paths
+        self.opener = opener
+        self.reader = reader
+        self.clock = clock
+        self.period_ms = max(1, int(period_ms))
+        size = max(1, int(capacity))
+        self.stamps = array("q", [-1]) * size
+        self.cpu = array("f", [math.nan]) * size
+        self.memory = array("f", [math.nan]) * size
+        self.load = array("f", [math.nan]) * size
+        self.fds: list[int] | None = None
+        self.cpu_times: tuple[int, int] | None = None
+        self.latest: SystemLoad | None = None
+
+    def open(self) -> bool:
+        if self.fds is not None:
+            return True
+        fds = []
+        try:
+            for path in self.paths:
+                fds.append(self.opener(str(path), os.O_RDONLY | os.O_CLOEXEC))
+        except OSError:
+            for fd in fds:
+                os.close(fd)
+            return False
+        self.fds = fds
+        return True
+
+    def close(self) -> None:
+        fds, self.fds = self.fds, None
+        for fd in fds or ():
+            os.close(fd)
+
+    def read(self) -> tuple[str, str, str] | None:
+        if not self.open():
+            return None
+        try:
+            return tuple(self.reader(fd, PROC_READ_BYTES, 0).decode("ascii", "replace") for fd in self.fds)
+        except OSError:
+            self.close()
+            return None
+
+    def sample(self) -> SystemLoad | None:
+        texts = self.read()
+        if texts is None:
+            return self.latest
+        times = proc_cpu_times(texts[0])
+        memory = proc_memory_percent(texts[1])
+        load = proc_load_average(texts[2])
+        if times is None or memory is None or load is None:
+            return self.latest
+        cpu = cpu_percent(self.cpu_times, times)
+        self.cpu_times = times
+        tick = self.tick()
+        slot = tick % len(self.stamps)
+        self.stamps[slot] = tick
+        self.cpu[slot] = math.nan if cpu is None else cpu
+        self.memory[slot] = memory
+        self.load[slot] = load
+        self.latest = SystemLoad(cpu=None if cpu is None else round(cpu, 1), memory=round(memory, 1), load=round(load, 2))
+        return self.latest
+
+    def tick(self) -> int:
+        return int(self.clock() * 1000 // self.period_ms)
+
+    def history(self, name: str) -> list[float]:
+        ring = getattr(self, name)
+        end = self.tick()
+        size = len(self.stamps)
+        return [ring[tick % size] if self.stamps[tick % size] == tick else math.nan for tick in range(end - size + 1, end + 1)]
+
+
+SYSTEM_SAMPLER: SystemSampler | None = None
+
+
+def shared_system_sampler() -> SystemSampler:
+    global SYSTEM_SAMPLER
+    if SYSTEM_SAMPLER is None:
+        SYSTEM_SAMPLER = SystemSampler()
+    return SYSTEM_SAMPLER
+
+
+def system_load_texts(load: SystemLoad | None) -> tuple[str, str, str]:
+    if load is None:
+        return "--", "--", "--"
+    cpu = "--" if load.cpu is None else f"{load.cpu:.0f}%"
+    return cpu, f"{load.memory:.0f}%", f"{load.load:.2f}"
 
 
 def decode_awesome_string(stdout: str) -> str:
@@ -918,14 +2504,83 @@ def icon_name_for_class(class_name: str) -> str:
     return ICON_NAMES.get(key) or key or "application-x-executable"
 
 
-def icon_theme_has_icon(icon_name: str) -> bool:
+TASK_ICON_SIZE = 16
+
+
+def default_icon_theme():
     try:
         from gi.repository import Gtk
 
-        theme = Gtk.IconTheme.get_default()
-        return bool(theme and theme.has_icon(icon_name))
+        return Gtk.IconTheme.get_default()
     except Exception:
-        return False
+        return None
+
+
+def load_theme_icon(theme, icon_name: str, size: int, scale: int = 1):
+    try:
+        from gi.repository import Gtk
+
+        return theme.load_surface(icon_name, size, scale, None, Gtk.IconLookupFlags.FORCE_SIZE)
+    except Exception:
+        return None
+
+
+class IconCache:
+    def __init__(self, theme_factory=None, loader=None, size: int = TASK_ICON_SIZE):
+        self.theme_factory = theme_factory if theme_factory is not None else default_icon_theme
+        self.loader = loader if loader is not None else load_theme_icon
+        self.size = size
+        self.theme = None
+        self.theme_loaded = False
+        self.entries: dict[tuple[str, int], tuple[str | None, object]] = {}
+        self.generation = 0
+        self.lookups = 0
+
+    def current_theme(self):
+        if not self.theme_loaded:
+            self.theme_loaded = True
+            self.theme = self.theme_factory()
+            connect = getattr(self.theme, "connect", None)
+            if callable(connect):
+                try:
+                    connect("changed", lambda *_args: self.invalidate())
+                except Exception:
+                    pass
+        return self.theme
+
+    def invalidate(self) -> None:
+        self.entries.clear()
+        self.generation += 1
+
+    def resolve(self, class_name: str, scale: int = 1) -> tuple[str | None, object]:
+        scale = max(1, int(scale))
+        key = (class_name.strip().lower(), self.size * scale)
+        entry = self.entries.get(key)
+        if entry is not None:
+            return entry
+        icon_name = icon_name_for_class(class_name)
+        theme = self.current_theme()
+        surface = None
+        if theme is not None:
+            self.lookups += 1
+            try:
+                if theme.has_icon(icon_name):
+                    surface = self.loader(theme, icon_name, self.size, scale)
+            except Exception:
+                surface = None
+        entry = (icon_name, surface) if surface is not None else (None, None)
+        self.entries[key] = entry
+        return entry
+
+
+ICON_CACHE: IconCache | None = None
+
+
+def shared_icon_cache() -> IconCache:
+    global ICON_CACHE
+    if ICON_CACHE is None:
+        ICON_CACHE = IconCache()
+    return ICON_CACHE
 
 
 def is_fabric_client(title: str, class_name: str) -> bool:
@@ -938,6 +2593,19 @@ def is_fabric_client(title: str, class_name: str) -> bool:
     return "config.py" in title_key and "fabric" in title_key
 
 
+def task_record(title: str, class_name: str, minimized: bool, window_id: str, focused: bool) -> Task | None:
+    if is_fabric_client(title, class_name):
+        return None
+    return Task(
+        title=title,
+        label=app_label(title, class_name),
+        class_name=class_name,
+        minimized=minimized,
+        window_id=window_id,
+        focused=focused,
+    )
+
+
 def parse_awesome_clients(stdout: str) -> list[Task]:
     tasks = []
     for line in decode_awesome_string(stdout).splitlines():
@@ -949,72 +2617,40 @@ def parse_awesome_clients(stdout: str) -> list[Task]:
         minimized = (parts[2] if len(parts) > 2 else "false").strip().lower() == "true"
         window_id = (parts[3] if len(parts) > 3 else "").strip()
         focused = (parts[4] if len(parts) > 4 else "false").strip().lower() == "true"
-        if is_fabric_client(title, class_name):
-            continue
-        tasks.append(
-            {
-                "title": title,
-                "label": app_label(title, class_name),
-                "class_name": class_name,
-                "minimized": minimized,
-                "window_id": window_id,
-                "focused": focused,
-            }
-        )
+        task = task_record(title, class_name, minimized, window_id, focused)
+        if task is not None:
+            tasks.append(task)
     return tasks
 
 
-def group_tasks_for_dock(tasks: list[Task], max_icons: int = MAX_TASK_LABELS) -> list[Task]:
-    grouped_by_class: dict[str, Task] = {}
-    ordered: list[Task] = []
+def task_group_key(task: Task | TaskGroup) -> str:
+    return task.class_name.strip().lower() or task.label.lower()
 
-    for task in tasks:
-        class_name = str(task.get("class_name") or "")
-        label = str(task.get("label") or "App")
-        key = class_name.strip().lower() or label.lower()
-        existing = grouped_by_class.get(key)
-        window_id = str(task.get("window_id") or "")
-        if existing is None:
-            grouped = {
-                "label": label,
-                "class_name": class_name,
-                "window_ids": [window_id],
-                "windows": [
-                    {
-                        "title": str(task.get("title") or label),
-                        "label": label,
-                        "window_id": window_id,
-                        "focused": bool(task.get("focused")),
-                        "minimized": bool(task.get("minimized")),
-                    }
-                ],
-                "count": 1,
-                "focused": bool(task.get("focused")),
-            }
-            grouped_by_class[key] = grouped
-            ordered.append(grouped)
-        else:
-            existing["window_ids"].append(window_id)
-            windows = existing.get("windows")
-            if isinstance(windows, list):
-                windows.append(
-                    {
-                        "title": str(task.get("title") or label),
-                        "label": label,
-                        "window_id": window_id,
-                        "focused": bool(task.get("focused")),
-                        "minimized": bool(task.get("minimized")),
-                    }
-                )
-            existing["count"] = int(existing["count"]) + 1
-            existing["focused"] = bool(existing.get("focused")) or bool(task.get("focused"))
 
-    return ordered[:max_icons]
+def group_tasks_for_dock(tasks: list[Task], max_icons: int = MAX_TASK_LABELS) -> DockGroups:
+    windows_by_key: dict[str, list[Task]] = {}
+    hidden_keys: set[str] = set()
 
-
-def overflow_count_for_tasks(tasks: list[Task], max_icons: int = MAX_TASK_LABELS) -> int:
-    unique_count = len(group_tasks_for_dock(tasks, max_icons=1000))
-    return max(0, unique_count - max_icons)
+    for task in tasks:
+        key = task_group_key(task)
+        windows = windows_by_key.get(key)
+        if windows is not None:
+            windows.append(task)
+        elif len(windows_by_key) < max_icons:
+            windows_by_key[key] = [task]
+        else:
+            hidden_keys.add(key)
+
+    groups = tuple(
+        TaskGroup(
+            label=windows[0].label,
+            class_name=windows[0].class_name,
+            windows=tuple(windows),
+            focused=any(window.focused for window in windows),
+        )
+        for windows in windows_by_key.values()
+    )
+    return DockGroups(groups=groups, overflow=len(hidden_keys), digest=hash((groups, len(hidden_keys))))
 
 
 def short_task_action_text(text: object, limit: int = 44) -> str:
@@ -1026,53 +2662,23 @@ def short_task_action_text(text: object, limit: int = 44) -> str:
     return f"{value[:limit - 3]}..."
 
 
-def task_windows(task: Task) -> list[dict[str, object]]:
-    raw_windows = task.get("windows")
-    if isinstance(raw_windows, list):
-        windows = [window for window in raw_windows if isinstance(window, dict)]
-    else:
-        windows = []
+def task_windows(group: TaskGroup | None) -> list[Task]:
+    if group is None:
+        return []
+    return [window for window in group.windows if valid_window_id(window.window_id)]
 
-    if not windows:
-        window_ids = task.get("window_ids")
-        windows = [
-            {
-                "title": task.get("label") or "Window",
-                "label": task.get("label") or "App",
-                "window_id": window_id,
-                "focused": bool(task.get("focused")),
-                "minimized": False,
-            }
-            for window_id in valid_window_ids(window_ids)
-        ]
-
-    filtered = []
-    for window in windows:
-        window_id = valid_window_id(window.get("window_id"))
-        if window_id:
-            filtered.append(
-                {
-                    "title": str(window.get("title") or window.get("label") or task.get("label") or "Window"),
-                    "label": str(window.get("label") or task.get("label") or "App"),
-                    "window_id": window_id,
-                    "focused": bool(window.get("focused")),
-                    "minimized": bool(window.get("minimized")),
-                }
-            )
-    return filtered
 
-
-def task_action_model(task: Task) -> dict[str, object]:
-    label = str(task.get("label") or "App")
-    class_name = str(task.get("class_name") or label)
-    windows = task_windows(task)
+def task_action_model(group: TaskGroup | None) -> dict[str, object]:
+    label = (group.label if group is not None else "") or "App"
+    class_name = (group.class_name if group is not None else "") or label
+    windows = task_windows(group)
     rows: list[dict[str, object]] = []
 
     if not windows:
         rows.append({"kind": "muted", "label": "window unavailable"})
         return {"title": label, "subtitle": class_name, "rows": rows}
 
-    first_window_id = str(windows[0]["window_id"])
+    first_window_id = windows[0].window_id
     rows.append({"kind": "action", "action": "focus", "label": "Focus", "window_id": first_window_id})
 
     if len(windows) == 1:
@@ -1081,8 +2687,8 @@ def task_action_model(task: Task) -> dict[str, object]:
 
     rows.append({"kind": "section", "label": "WINDOWS"})
     for index, window in enumerate(windows, start=1):
-        window_id = str(window["window_id"])
-        title = short_task_action_text(window.get("title"), limit=38)
+        window_id = window.window_id
+        title = short_task_action_text(window.title or window.label, limit=38)
         rows.append({"kind": "action", "action": "focus", "label": f"Focus {index}: {title}", "window_id": window_id})
         rows.append({"kind": "action", "action": "close", "label": f"Close {index}: {title}", "window_id": window_id})
 
@@ -1092,7 +2698,7 @@ def task_action_model(task: Task) -> dict[str, object]:
             "kind": "action",
             "action": "close-all",
             "label": f"Close All {len(windows)} Windows",
-            "window_ids": [str(window["window_id"]) for window in windows],
+            "window_ids": [window.window_id for window in windows],
         }
     )
 
@@ -1116,34 +2722,242 @@ def task_action_margin_for_pointer(monitor: MonitorGeometry, x_root: object, y_r
     return f"{y}px 0px 0px {x}px"
 
 
-def task_button_labels(tasks: list[Task]) -> list[str]:
-    counts = {}
-    labels = []
-    for task in tasks[:MAX_TASK_LABELS]:
-        label = str(task.get("label") or "App")
-        counts[label] = counts.get(label, 0) + 1
-        labels.append(label if counts[label] == 1 else f"{label} {counts[label]}")
-    return labels
+def task_button_labels(tasks: list[Task]) -> list[str]:
+    counts = {}
+    labels = []
+    for task in tasks[:MAX_TASK_LABELS]:
+        label = task.label or "App"
+        counts[label] = counts.get(label, 0) + 1
+        labels.append(label if counts[label] == 1 else f"{label} {counts[label]}")
+    return labels
+
+
+def tasks_text(tasks: list[Task]) -> str:
+    if not tasks:
+        return "none"
+
+    rendered = task_button_labels(tasks)
+    hidden_count = max(0, len(tasks) - MAX_TASK_LABELS)
+    if hidden_count:
+        rendered.append(f"+{hidden_count}")
+    return "  ".join(rendered)
+
+
+def running_tasks() -> list[Task]:
+    stdout = awesome_eval(AWESOME_CLIENTS_LUA)
+    return parse_awesome_clients(stdout)
+
+
+def running_apps_text() -> str:
+    return tasks_text(running_tasks())
+
+
+class TaskEventModel:
+    def __init__(self):
+        self.tasks_by_window: dict[str, Task] = {}
+
+    def reset(self, tasks: list[Task]) -> None:
+        self.tasks_by_window = {task.window_id: task for task in tasks}
+
+    def tasks(self) -> list[Task]:
+        return list(self.tasks_by_window.values())
+
+    def apply(self, event: str, window_id: str, title: str, class_name: str, minimized: bool, focused: bool) -> bool:
+        target = valid_window_id(window_id)
+        if target is None:
+            return False
+
+        if event == "unmanage":
+            return self.tasks_by_window.pop(target, None) is not None
+
+        task = task_record(title, class_name, bool(minimized), target, bool(focused))
+        if task is None:
+            return self.tasks_by_window.pop(target, None) is not None
+
+        changed = self.tasks_by_window.get(target) != task
+        self.tasks_by_window[target] = task
+        if event == "focus" and focused:
+            for window, other in self.tasks_by_window.items():
+                if window != target and other.focused:
+                    self.tasks_by_window[window] = replace(other, focused=False)
+                    changed = True
+        return changed
+
+
+class AwesomeTaskEvents:
+    def __init__(self, on_tasks: Callable[[list[Task]], None] | None = None, bus_factory=None):
+        self.on_tasks = on_tasks
+        self.on_activity: Callable[[], None] | None = None
+        self.bus_factory = bus_factory if bus_factory is not None else session_bus_connection
+        self.model = TaskEventModel()
+        self.connection = None
+        self.subscription_id: int | None = None
+        self.installing = False
+
+    def start(self) -> bool:
+        try:
+            from gi.repository import Gio
+
+            self.connection = self.bus_factory()
+            self.subscription_id = self.connection.signal_subscribe(
+                None,
+                FABRIC_DBUS_INTERFACE,
+                "ClientChanged",
+                FABRIC_DBUS_PATH,
+                None,
+                Gio.DBusSignalFlags.NONE,
+                self.on_signal,
+            )
+        except Exception:
+            self.connection = None
+            self.subscription_id = None
+            return False
+        return True
+
+    def stop(self) -> None:
+        if self.connection is not None and self.subscription_id is not None:
+            self.connection.signal_unsubscribe(self.subscription_id)
+        self.subscription_id = None
+
+    def install_hook(self) -> bool:
+        if self.installing:
+            return False
+        self.installing = True
+        return awesome_eval_async("awesome-task-hook", AWESOME_TASK_EVENTS_LUA, self.on_hook_installed)
+
+    def on_hook_installed(self, _reply: str) -> None:
+        self.installing = False
+
+    def reconcile(self, tasks: list[Task], hooked: bool) -> None:
+        self.model.reset(tasks)
+        if not hooked:
+            self.install_hook()
+
+    def on_signal(self, _connection, _sender, _path, _interface, _signal, parameters, *_args) -> None:
+        try:
+            event, window_id, title, class_name, minimized, focused = parameters.unpack()
+        except Exception:
+            return
+        self.handle_event(str(event), str(window_id), str(title), str(class_name), bool(minimized), bool(focused))
+
+    def handle_event(self, event: str, window_id: str, title: str, class_name: str, minimized: bool, focused: bool) -> bool:
+        if callable(self.on_activity):
+            self.on_activity()
+        if not self.model.apply(event, window_id, title, class_name, minimized, focused):
+            return False
+        if callable(self.on_tasks):
+            self.on_tasks(self.model.tasks())
+        return True
+
+
+FABRIC_STATS_XML = """
+<node>
+  <interface name="%s">
+    <method name="GetStats">
+      <arg type="s" name="stats" direction="out"/>
+    </method>
+  </interface>
+</node>
+""" % FABRIC_DBUS_INTERFACE
+
+
+class StatsService:
+    def __init__(self, stats: BarStats | None = None, bus_factory=None):
+        self.stats = stats if stats is not None else shared_bar_stats()
+        self.bus_factory = bus_factory if bus_factory is not None else session_bus_connection
+        self.connection = None
+        self.registration_id: int | None = None
+        self.owner_id: int | None = None
+
+    def start(self) -> bool:
+        try:
+            from gi.repository import Gio
+
+            self.connection = self.bus_factory()
+            interface = Gio.DBusNodeInfo.new_for_xml(FABRIC_STATS_XML).interfaces[0]
+            self.registration_id = self.connection.register_object(
+                FABRIC_DBUS_PATH,
+                interface,
+                self.on_method_call,
+                None,
+                None,
+            )
+            self.owner_id = Gio.bus_own_name_on_connection(
+                self.connection,
+                FABRIC_DBUS_NAME,
+                Gio.BusNameOwnerFlags.NONE,
+                None,
+                None,
+            )
+        except Exception:
+            self.stop()
+            return False
+        return True
+
+    def stop(self) -> None:
+        if self.owner_id is not None:
+            from gi.repository import Gio
+
+            Gio.bus_unown_name(self.owner_id)
+        if self.connection is not None and self.registration_id is not None:
+            self.connection.unregister_object(self.registration_id)
+        self.owner_id = None
+        self.registration_id = None
+        self.connection = None
+
+    def stats_json(self) -> str:
+        return json.dumps(self.stats.snapshot(), sort_keys=True)
 
+    def on_method_call(self, _connection, _sender, _path, _interface, method, _parameters, invocation) -> None:
+        from gi.repository import GLib
 
-def tasks_text(tasks: list[Task]) -> str:
-    if not tasks:
-        return "none"
+        if method != "GetStats":
+            invocation.return_dbus_error(f"{FABRIC_DBUS_INTERFACE}.UnknownMethod", method)
+            return
+        invocation.return_value(GLib.Variant("(s)", (self.stats_json(),)))
 
-    rendered = task_button_labels(tasks)
-    hidden_count = max(0, len(tasks) - MAX_TASK_LABELS)
-    if hidden_count:
-        rendered.append(f"+{hidden_count}")
-    return "  ".join(rendered)
 
+def fetch_bar_stats(bus_factory=None) -> dict[str, object] | None:
+    try:
+        from gi.repository import Gio
+
+        connection = (bus_factory or session_bus_connection)()
+        reply = connection.call_sync(
+            FABRIC_DBUS_NAME,
+            FABRIC_DBUS_PATH,
+            FABRIC_DBUS_INTERFACE,
+            "GetStats",
+            None,
+            None,
+            Gio.DBusCallFlags.NO_AUTO_START,
+            COMMAND_TIMEOUT_MS,
+            None,
+        )
+        return json.loads(reply.unpack()[0])
+    except Exception:
+        return None
 
-def running_tasks() -> list[Task]:
-    stdout = command_output(["awesome-client", AWESOME_CLIENTS_LUA])
-    return parse_awesome_clients(stdout)
 
+def format_bar_stats(snapshot: dict[str, object]) -> str:
+    header = f"{'source':<28} {'calls':>8} {'/hour':>9} {'forks':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'changed':>9}"
+    lines = [f"uptime {float(snapshot.get('uptime_s', 0)):.0f}s", header]
+    for name, entry in dict(snapshot.get("sources") or {}).items():
+        since_change = entry.get("since_change_s")
+        lines.append(
+            f"{name:<28} {entry['calls']:>8} {entry['calls_per_hour']:>9.0f} {entry['subprocesses']:>7} "
+            f"{entry['p50_ms']:>8.2f} {entry['p95_ms']:>8.2f} {entry['p99_ms']:>8.2f} "
+            f"{'-' if since_change is None else f'{since_change:.0f}s':>9}"
+        )
+    return "\n".join(lines)
 
-def running_apps_text() -> str:
-    return tasks_text(running_tasks())
+
+def run_stats_dump(as_json: bool = False) -> int:
+    snapshot = fetch_bar_stats()
+    if snapshot is None:
+        print("fabric-awesomewm is not running", file=sys.stderr)
+        return 1
+    print(json.dumps(snapshot, indent=2, sort_keys=True) if as_json else format_bar_stats(snapshot))
+    return 0
 
 
 def parse_awesome_bar_visibility(stdout: str) -> list[BarVisibilityState]:
@@ -1201,7 +3015,15 @@ def screen_state_matches_monitor(
 
 
 def screen_bar_states() -> list[BarVisibilityState]:
-    return parse_awesome_bar_visibility(command_output(["awesome-client", AWESOME_BAR_VISIBILITY_LUA], ""))
+    return parse_awesome_bar_visibility(awesome_eval(AWESOME_BAR_VISIBILITY_LUA))
+
+
+def screen_bar_states_async(callback: Callable[[list[BarVisibilityState]], None]) -> None:
+    awesome_eval_async(
+        "awesome-visibility",
+        AWESOME_BAR_VISIBILITY_LUA,
+        lambda stdout: callback(parse_awesome_bar_visibility(stdout)),
+    )
 
 
 def bar_visibility_for_monitor(
@@ -1215,6 +3037,277 @@ def bar_visibility_for_monitor(
     return "unknown"
 
 
+@dataclass(frozen=True)
+class ActiveWindow:
+    x: int
+    y: int
+    width: int
+    height: int
+    fullscreen: bool = False
+    coverable: bool = True
+
+
+def monitor_for_window(monitors: list[MonitorGeometry], window: ActiveWindow) -> MonitorGeometry | None:
+    center_x = window.x + window.width // 2
+    center_y = window.y + window.height // 2
+    for monitor in monitors:
+        if monitor.x <= center_x < monitor.x + monitor.width and monitor.y <= center_y < monitor.y + monitor.height:
+            return monitor
+    return None
+
+
+def window_covers_monitor(
+    window: ActiveWindow,
+    monitor: MonitorGeometry,
+    tolerance: int = SCREEN_MATCH_TOLERANCE_PX,
+) -> bool:
+    return (
+        window.x <= monitor.x + tolerance
+        and window.y <= monitor.y + tolerance
+        and window.x + window.width >= monitor.x + monitor.width - tolerance
+        and window.y + window.height >= monitor.y + monitor.height - tolerance
+    )
+
+
+def fullscreen_bar_states(monitors: list[MonitorGeometry], window: ActiveWindow | None) -> list[BarVisibilityState]:
+    covered = None
+    if window is not None and window.coverable:
+        monitor = monitor_for_window(monitors, window)
+        if monitor is not None and (window.fullscreen or window_covers_monitor(window, monitor)):
+            covered = monitor
+    return [
+        {
+            "x": monitor.x,
+            "y": monitor.y,
+            "width": monitor.width,
+            "height": monitor.height,
+            "visibility": "hidden" if monitor is covered else "visible",
+        }
+        for monitor in monitors
+    ]
+
+
+def x11_display():
+    from Xlib import display
+
+    return display.Display()
+
+
+def x11_resource_id(value: object) -> object:
+    return getattr(value, "id", value)
+
+
+class X11FullscreenWatcher:
+    def __init__(
+        self,
+        monitors: list[MonitorGeometry],
+        on_states: Callable[[list[BarVisibilityState]], None] | None = None,
+        display_factory=None,
+        watch=None,
+        cancel=None,
+    ):
+        self.monitors = monitors
+        self.on_states = on_states
+        self.display_factory = display_factory if display_factory is not None else x11_display
+        self.watch = watch if watch is not None else watch_readable
+        self.cancel = cancel
+        self.display = None
+        self.root = None
+        self.atoms: dict[str, int] = {}
+        self.active = None
+        self.watch_id: int | None = None
+        self.states: list[BarVisibilityState] | None = None
+        self.events = 0
+        self.refreshes = 0
+
+    def start(self) -> bool:
+        try:
+            self.display = self.display_factory()
+            self.root = self.display.screen().root
+            self.atoms = {name: self.display.intern_atom(name) for name in X11_WATCH_ATOMS}
+            self.root.change_attributes(event_mask=X11_PROPERTY_CHANGE_MASK)
+            self.display.flush()
+            self.watch_id = self.watch(self.display.fileno(), self.on_readable)
+        except Exception:
+            self.stop()
+            return False
+        self.refresh()
+        return self.on_readable()
+
+    def stop(self) -> None:
+        if self.watch_id is not None:
+            cancel = self.cancel
+            if cancel is None:
+                try:
+                    from gi.repository import GLib
+
+                    cancel = GLib.source_remove
+                except Exception:
+                    cancel = None
+            if cancel is not None:
+                cancel(self.watch_id)
+        self.watch_id = None
+        display, self.display = self.display, None
+        self.root = None
+        self.active = None
+        close = getattr(display, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+    def on_readable(self) -> bool:
+        try:
+            while self.drain_events():
+                self.refresh()
+        except Exception:
+            self.stop()
+            return False
+        return self.display is not None
+
+    def drain_events(self) -> bool:
+        relevant = False
+        while self.display is not None and self.display.pending_events():
+            event = self.display.next_event()
+            self.events += 1
+            relevant = self.is_relevant(event) or relevant
+        return relevant
+
+    def is_relevant(self, event) -> bool:
+        window = x11_resource_id(getattr(event, "window", None))
+        atom = getattr(event, "atom", None)
+        if window == x11_resource_id(self.root):
+            return atom == self.atoms.get("_NET_ACTIVE_WINDOW")
+        if self.active is None or window != x11_resource_id(self.active):
+            return False
+        return atom is None or atom == self.atoms.get("_NET_WM_STATE")
+
+    def property_values(self, window, name: str) -> list[int]:
+        prop = window.get_full_property(self.atoms[name], X11_ANY_PROPERTY_TYPE)
+        return [int(value) for value in getattr(prop, "value", None) or []]
+
+    def track(self, window_id: int):
+        if self.active is not None and x11_resource_id(self.active) == window_id:
+            return self.active
+        if self.active is not None:
+            try:
+                self.active.change_attributes(event_mask=0)
+            except Exception:
+                pass
+        self.active = None
+        if window_id:
+            self.active = self.display.create_resource_object("window", window_id)
+            self.active.change_attributes(event_mask=X11_PROPERTY_CHANGE_MASK | X11_STRUCTURE_NOTIFY_MASK)
+            self.display.flush()
+        return self.active
+
+    def read_active_window(self) -> ActiveWindow | None:
+        try:
+            active_ids = self.property_values(self.root, "_NET_ACTIVE_WINDOW")
+            window = self.track(active_ids[0] if active_ids else 0)
+            if window is None:
+                return None
+            states = self.property_values(window, "_NET_WM_STATE")
+            types = self.property_values(window, "_NET_WM_WINDOW_TYPE")
+            geometry = window.get_geometry()
+            origin = self.root.translate_coords(window, 0, 0)
+            viewable = window.get_attributes().map_state == X11_IS_VIEWABLE
+        except Exception:
+            self.active = None
+            return None
+        blocked_types = {self.atoms["_NET_WM_WINDOW_TYPE_DESKTOP"], self.atoms["_NET_WM_WINDOW_TYPE_DOCK"]}
+        return ActiveWindow(
+            x=int(origin.x),
+            y=int(origin.y),
+            width=int(geometry.width),
+            height=int(geometry.height),
+            fullscreen=self.atoms["_NET_WM_STATE_FULLSCREEN"] in states,
+            coverable=viewable and self.atoms["_NET_WM_STATE_HIDDEN"] not in states and not blocked_types & set(types),
+        )
+
+    def refresh(self) -> None:
+        if self.display is None:
+            return
+        self.refreshes += 1
+        states = fullscreen_bar_states(self.monitors, self.read_active_window())
+        if states == self.states:
+            return
+        self.states = states
+        if callable(self.on_states):
+            self.on_states(states)
+
+
+@dataclass(frozen=True)
+class AwesomeSnapshot:
+    tasks: list[Task] | None
+    screens: list[BarVisibilityState]
+    dnd: str
+    hooked: bool = False
+
+
+def parse_awesome_snapshot(stdout: str) -> AwesomeSnapshot | None:
+    try:
+        data = json.loads(decode_awesome_string(stdout))
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    raw_clients = data.get("clients")
+    tasks = [] if raw_clients is not None else None
+    for item in raw_clients if isinstance(raw_clients, list) else []:
+        if not isinstance(item, list) or len(item) < 5:
+            continue
+        task = task_record(str(item[0]), str(item[1]), item[2] is True, str(item[3]).strip(), item[4] is True)
+        if task is not None:
+            tasks.append(task)
+
+    screens = []
+    raw_screens = data.get("screens")
+    for item in raw_screens if isinstance(raw_screens, list) else []:
+        if not isinstance(item, list) or len(item) < 5:
+            continue
+        try:
+            x, y, width, height = (int(value) for value in item[:4])
+        except (TypeError, ValueError):
+            continue
+        if width <= 0 or height <= 0:
+            continue
+        screens.append(
+            {
+                "x": x,
+                "y": y,
+                "width": width,
+                "height": height,
+                "visibility": "hidden" if item[4] is True else "visible",
+            }
+        )
+
+    return AwesomeSnapshot(
+        tasks=tasks,
+        screens=screens,
+        dnd="on" if data.get("dnd") is True else "off",
+        hooked=data.get("hooked") is True,
+    )
+
+
+def awesome_snapshot() -> AwesomeSnapshot | None:
+    return parse_awesome_snapshot(awesome_eval(AWESOME_SNAPSHOT_LUA))
+
+
+def awesome_snapshot_async(callback: Callable[[AwesomeSnapshot | None], None]) -> None:
+    awesome_eval_async("awesome-snapshot", AWESOME_SNAPSHOT_LUA, lambda stdout: callback(parse_awesome_snapshot(stdout)))
+
+
+def awesome_state_snapshot() -> AwesomeSnapshot | None:
+    return parse_awesome_snapshot(awesome_eval(AWESOME_STATE_LUA))
+
+
+def awesome_state_snapshot_async(callback: Callable[[AwesomeSnapshot | None], None]) -> None:
+    awesome_eval_async("awesome-state", AWESOME_STATE_LUA, lambda stdout: callback(parse_awesome_snapshot(stdout)))
+
+
 def ai_usage_from_status(data: object) -> str:
     codex_session = nested_value(data, "codex", "session", "utilization")
     claude_five_hour = nested_value(data, "claude", "five_hour", "utilization")
@@ -1340,6 +3433,7 @@ def ai_metric_rows(data: object, provider_key: str, now_epoch: float | None = No
                 "severity": usage_severity(percent),
                 "status": usage_status(percent),
                 "reset_text": format_reset_text(metric_reset(metric), now_epoch=now_epoch),
+                "reset_epoch": iso_to_epoch(metric_reset(metric)),
             }
         )
         seen_keys.add(metric_key)
@@ -1431,70 +3525,1115 @@ def ai_provider_status_pending(data: object, active_provider: str) -> bool:
     if isinstance(status_provider, str) and status_provider in AI_PROVIDER_DEFS and status_provider != active_provider:
         return True
 
-    provider_data = status.get(active_provider)
-    if isinstance(provider_data, dict) and provider_data.get("error") == "monitor_stopped":
-        return True
+    provider_data = status.get(active_provider)
+    if isinstance(provider_data, dict) and provider_data.get("error") == "monitor_stopped":
+        return True
+
+    return False
+
+
+
+
+def ai_status_data() -> object:
+    try:
+        return json.loads(AI_STATUS_PATH.read_text())
+    except Exception:
+        return {}
+
+
+def current_ai_summary() -> dict[str, object]:
+    return ai_summary_from_status(ai_status_data())
+
+
+def restart_ai_usage_monitor() -> None:
+    run_command(["systemctl", "--user", "restart", "ai-usage-monitor.service"])
+
+
+def schedule_ai_provider_refreshes(callback, scheduler=None, delays: tuple[int, ...] = AI_PROVIDER_SWITCH_REFRESH_DELAYS_MS) -> bool:
+    if scheduler is None:
+        try:
+            from gi.repository import GLib
+
+            scheduler = GLib.timeout_add
+        except Exception:
+            return False
+
+    for delay in delays:
+        def run_once(callback=callback):
+            callback()
+            return False
+
+        scheduler(int(delay), run_once)
+
+    return bool(delays)
+
+
+def open_ai_usage_url(provider: str) -> None:
+    url = AI_USAGE_URLS.get(provider) or AI_USAGE_URLS["codex"]
+    run_command(["xdg-open", url])
+
+
+
+
+def ai_usage_text() -> str:
+    provider = load_ai_provider_preference()
+    try:
+        data = json.loads(AI_STATUS_PATH.read_text())
+    except Exception:
+        data = {}
+
+    return ai_compact_usage_from_status(data, provider)
+
+
+@dataclass(frozen=True)
+class AIStatusSnapshot:
+    data: object
+    provider: str
+    version: int
+
+
+def read_optional_bytes(path: Path) -> bytes | None:
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def parse_ai_status_bytes(raw: bytes | None) -> object:
+    if raw is None:
+        return {}
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return {}
+
+
+def ai_history_samples(data: object) -> dict[str, float | None]:
+    samples = {}
+    for provider_key in AI_PROVIDER_DEFS:
+        for row in ai_metric_rows(data, provider_key):
+            samples[f"{provider_key}.{row['key']}"] = row["percent"]
+    credits = claude_credit_row(data)
+    if credits is not None:
+        samples["claude.credits"] = credits["percent"]
+    return samples
+
+
+def sparkline_text(values: list[float], width: int = AI_SPARKLINE_WIDTH, ceiling: float = 100.0, hold: bool = True) -> str:
+    if not values or all(math.isnan(value) for value in values):
+        return ""
+    step = len(values) / width
+    chars = []
+    last = None
+    for bucket in range(width):
+        present = [value for value in values[int(bucket * step) : int((bucket + 1) * step)] if not math.isnan(value)]
+        if present:
+            last = max(present)
+        elif not hold:
+            last = None
+        if last is None:
+            chars.append(" ")
+            continue
+        level = round(min(max(last, 0.0), ceiling) / ceiling * (len(SPARKLINE_BLOCKS) - 1))
+        chars.append(SPARKLINE_BLOCKS[level])
+    return "".join(chars)
+
+
+def burn_rate_per_hour(values: list[float], min_minutes: int = AI_BURN_MIN_MINUTES) -> float | None:
+    first = None
+    last = None
+    for minute, value in enumerate(values):
+        if math.isnan(value):
+            continue
+        if first is None or (last is not None and value < last[1] - 1):
+            first = (minute, value)
+        last = (minute, value)
+    if first is None or last[0] - first[0] < min_minutes:
+        return None
+    return (last[1] - first[1]) * 60 / (last[0] - first[0])
+
+
+def ai_burn_text(percent: object, rate: float | None, reset_epoch: float | None, now_epoch: float) -> str:
+    value = as_number(percent)
+    if value is None or rate is None or rate <= 0:
+        return ""
+    to_full = max(100 - value, 0) / rate * 3600
+    if reset_epoch is None or now_epoch + to_full < reset_epoch:
+        return f"+{rate:.1f}%/h, full in {duration_text(to_full)}"
+    projected = value + rate * (reset_epoch - now_epoch) / 3600
+    return f"+{rate:.1f}%/h, ~{projected:.0f}% at reset"
+
+
+class AIUsageHistory:
+    def __init__(self, path: Path | None = None, slots: int = AI_HISTORY_MINUTES, series: tuple[str, ...] = AI_HISTORY_SERIES):
+        self.path = path
+        self.slots = max(1, int(slots))
+        self.series = tuple(series)
+        self.index = {name: position for position, name in enumerate(self.series)}
+        self.map: mmap.mmap | None = None
+        self.stamps: memoryview | None = None
+        self.values: memoryview | None = None
+
+    def header(self) -> bytes:
+        return AI_HISTORY_HEADER.pack(AI_HISTORY_MAGIC, self.slots, len(self.series), zlib.crc32("\n".join(self.series).encode()))
+
+    def size(self) -> int:
+        return AI_HISTORY_HEADER.size + 4 * self.slots * (1 + len(self.series))
+
+    def open(self) -> bool:
+        if self.map is not None:
+            return True
+        path = self.path if self.path is not None else AI_HISTORY_PATH
+        header = self.header()
+        size = self.size()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch(exist_ok=True)
+            with path.open("r+b") as handle:
+                if handle.read(len(header)) != header or handle.seek(0, 2) != size:
+                    handle.seek(0)
+                    handle.truncate()
+                    handle.write(header)
+                    handle.write(bytes(4 * self.slots))
+                    handle.write(array("f", [math.nan]).tobytes() * (self.slots * len(self.series)))
+                    handle.flush()
+                self.map = mmap.mmap(handle.fileno(), size)
+        except (OSError, ValueError):
+            self.map = None
+            return False
+        view = memoryview(self.map)
+        stamps_end = AI_HISTORY_HEADER.size + 4 * self.slots
+        self.stamps = view[AI_HISTORY_HEADER.size : stamps_end].cast("I")
+        self.values = view[stamps_end:].cast("f")
+        return True
+
+    def close(self) -> None:
+        history_map, self.map = self.map, None
+        for view in (self.stamps, self.values):
+            if view is not None:
+                view.release()
+        self.stamps = None
+        self.values = None
+        if history_map is not None:
+            history_map.close()
+
+    def record(self, epoch: float, samples: dict[str, float | None]) -> bool:
+        if not self.open():
+            return False
+        minute = int(epoch // 60)
+        slot = minute % self.slots
+        if self.stamps[slot] != minute:
+            self.stamps[slot] = minute
+            for position in range(len(self.series)):
+                self.values[position * self.slots + slot] = math.nan
+        for name, value in samples.items():
+            position = self.index.get(name)
+            if position is not None and value is not None:
+                self.values[position * self.slots + slot] = value
+        return True
+
+    def window(self, name: str, now_epoch: float, minutes: int) -> list[float]:
+        position = self.index.get(name)
+        if position is None or not self.open():
+            return []
+        end = int(now_epoch // 60)
+        base = position * self.slots
+        values = []
+        for minute in range(end - min(minutes, self.slots) + 1, end + 1):
+            slot = minute % self.slots
+            values.append(self.values[base + slot] if self.stamps[slot] == minute else math.nan)
+        return values
+
+    def sparkline(self, name: str, now_epoch: float, minutes: int = AI_SPARKLINE_MINUTES, width: int = AI_SPARKLINE_WIDTH) -> str:
+        return sparkline_text(self.window(name, now_epoch, minutes), width)
+
+    def burn_rate(self, name: str, now_epoch: float, minutes: int = AI_BURN_WINDOW_MINUTES) -> float | None:
+        return burn_rate_per_hour(self.window(name, now_epoch, minutes))
+
+
+def attach_ai_history(model: dict[str, object], history: AIUsageHistory, now_epoch: float) -> dict[str, object]:
+    provider = model["active_provider"]
+    for row in model["rows"]:
+        name = f"{provider}.{row['key']}"
+        row["sparkline"] = history.sparkline(name, now_epoch)
+        row["burn_text"] = ai_burn_text(row["percent"], history.burn_rate(name, now_epoch), row.get("reset_epoch"), now_epoch)
+    return model
+
+
+class AIStatusStore:
+    def __init__(
+        self,
+        status_path: Path | None = None,
+        provider_path: Path | None = None,
+        on_change: Callable[[AIStatusSnapshot], None] | None = None,
+        clock=time.time,
+        history: AIUsageHistory | None = None,
+    ):
+        self.status_path = status_path
+        self.provider_path = provider_path
+        self.on_change = on_change
+        self.clock = clock
+        self.history = history
+        self.snapshot: AIStatusSnapshot | None = None
+        self.raw: tuple[bytes | None, bytes | None] | None = None
+        self.monitor = None
+        self.dashboards: dict[tuple[str, int], dict[str, object]] = {}
+        self.compacts: dict[str, str] = {}
+        self.loads = 0
+
+    def paths(self) -> tuple[Path, Path]:
+        status_path = self.status_path if self.status_path is not None else AI_STATUS_PATH
+        provider_path = self.provider_path if self.provider_path is not None else AI_PROVIDER_PREF_PATH
+        return status_path, provider_path
+
+    def watching(self) -> bool:
+        return self.monitor is not None
+
+    def start(self) -> bool:
+        status_path, _provider_path = self.paths()
+        try:
+            from gi.repository import Gio
+
+            status_path.parent.mkdir(parents=True, exist_ok=True)
+            directory = Gio.File.new_for_path(str(status_path.parent))
+            self.monitor = directory.monitor_directory(Gio.FileMonitorFlags.WATCH_MOVES, None)
+            self.monitor.connect("changed", self.on_monitor_event)
+        except Exception:
+            self.monitor = None
+            return False
+        self.load()
+        return True
+
+    def stop(self) -> None:
+        monitor, self.monitor = self.monitor, None
+        cancel = getattr(monitor, "cancel", None)
+        if callable(cancel):
+            cancel()
+        if self.history is not None:
+            self.history.close()
+
+    def on_monitor_event(self, _monitor, file, other_file, event_type) -> None:
+        if getattr(event_type, "value_nick", "") not in AI_STATUS_RELOAD_EVENTS:
+            return
+        names = {item.get_basename() for item in (file, other_file) if item is not None}
+        if names & {path.name for path in self.paths()}:
+            self.load()
+
+    def load(self) -> bool:
+        status_path, provider_path = self.paths()
+        raw = (read_optional_bytes(status_path), read_optional_bytes(provider_path))
+        if raw == self.raw and self.snapshot is not None:
+            return False
+        previous = self.snapshot
+        data = previous.data if previous is not None and self.raw is not None and raw[0] == self.raw[0] else None
+        if data is None:
+            data = parse_ai_status_bytes(raw[0])
+            self.loads += 1
+            if self.history is not None:
+                self.history.record(self.clock(), ai_history_samples(data))
+        provider = normalize_ai_provider((raw[1] or b"").decode("utf-8", "replace"))
+        self.raw = raw
+        self.snapshot = AIStatusSnapshot(
+            data=data,
+            provider=provider,
+            version=previous.version + 1 if previous is not None else 1,
+        )
+        self.dashboards.clear()
+        self.compacts.clear()
+        if callable(self.on_change):
+            self.on_change(self.snapshot)
+        return True
+
+    def current(self) -> AIStatusSnapshot:
+        if self.snapshot is None or not self.watching():
+            self.load()
+        return self.snapshot
+
+    def dashboard_model(self, provider: str | None = None) -> dict[str, object]:
+        snapshot = self.current()
+        active = normalize_ai_provider(provider or snapshot.provider)
+        now_epoch = self.clock()
+        key = (active, int(now_epoch // 60))
+        model = self.dashboards.get(key)
+        if model is None:
+            model = ai_dashboard_model(snapshot.data, active, now_epoch=now_epoch)
+            if self.history is not None:
+                attach_ai_history(model, self.history, now_epoch)
+            self.dashboards = {cached: value for cached, value in self.dashboards.items() if cached[1] == key[1]}
+            self.dashboards[key] = model
+        return model
+
+    def compact_text(self, provider: str | None = None) -> str:
+        snapshot = self.current()
+        active = normalize_ai_provider(provider or snapshot.provider)
+        text = self.compacts.get(active)
+        if text is None:
+            text = ai_compact_usage_from_status(snapshot.data, active)
+            self.compacts[active] = text
+        return text
+
+
+AI_STATUS_STORE: AIStatusStore | None = None
+
+
+def shared_ai_status_store() -> AIStatusStore:
+    global AI_STATUS_STORE
+    if AI_STATUS_STORE is None:
+        AI_STATUS_STORE = AIStatusStore(history=AIUsageHistory())
+    return AI_STATUS_STORE
+
+
+def run_self_check() -> int:
+    for check in (volume_text, battery_value, network_text, ai_usage_text, running_apps_text, dnd_text):
+        check()
+    return 0
+
+
+def awesome_string_reply(text: str) -> str:
+    escaped = text.replace('"', '\\"').replace("\t", "\\t").replace("\n", "\\n")
+    return f'string "{escaped}"'
+
+
+def synthetic_task_fields(count: int) -> list[tuple[str, str, bool, str, bool]]:
+    classes = [*APP_LABELS, *(f"tool-{index}" for index in range(16))]
+    return [
+        (
+            f"Document {index} - {classes[index % len(classes)]}",
+            classes[index % len(classes)],
+            index % 7 == 0,
+            str(0x1000000 + index),
+            index == count - 1,
+        )
+        for index in range(count)
+    ]
+
+
+def synthetic_awesome_clients(count: int) -> str:
+    lines = [
+        "\t".join((title, class_name, str(minimized).lower(), window_id, str(focused).lower()))
+        for title, class_name, minimized, window_id, focused in synthetic_task_fields(count)
+    ]
+    return awesome_string_reply("\n".join(lines))
+
+
+def synthetic_screens(count: int) -> list[tuple[int, int, int, int, bool]]:
+    return [(index * 2560, 0, 2560, 1440, index % 3 == 0) for index in range(count)]
+
+
+def synthetic_bar_visibility(screens: int) -> str:
+    lines = [
+        f"{x}\t{y}\t{width}\t{height}\t{'hidden' if hidden else 'visible'}"
+        for x, y, width, height, hidden in synthetic_screens(screens)
+    ]
+    return awesome_string_reply("\n".join(lines))
+
+
+def synthetic_awesome_snapshot(count: int, screens: int = 2) -> str:
+    return awesome_string_reply(
+        json.dumps(
+            {
+                "clients": [list(fields) for fields in synthetic_task_fields(count)],
+                "screens": [list(screen) for screen in synthetic_screens(screens)],
+                "dnd": False,
+                "hooked": True,
+            }
+        )
+    )
+
+
+def synthetic_ai_status(history: int = 2000) -> dict[str, object]:
+    def metric(utilization: float) -> dict[str, object]:
+        return {"utilization": utilization, "resets_at": "2026-05-19T01:20:52Z"}
+
+    return {
+        "timestamp": "2026-05-13T13:30:00Z",
+        "codex": {
+            "available": True,
+            "session": metric(13.0),
+            "weekly": metric(41.5),
+            "error": None,
+            "models": {f"model-{index}": metric(index % 100) for index in range(history // 10)},
+        },
+        "claude": {
+            "available": True,
+            "five_hour": metric(62.0),
+            "seven_day": metric(35.0),
+            "seven_day_sonnet": metric(12.0),
+            "seven_day_opus": metric(88.0),
+            "extra_usage": {"is_enabled": True, "utilization": 20.0, "used_credits": 4, "monthly_limit": 20},
+            "error": None,
+        },
+        "history": [{"at": 1778670000 + index * 60, "codex": index % 100, "claude": (index * 7) % 100} for index in range(history)],
+        "errors": [],
+    }
+
+
+def synthetic_upower_properties() -> dict[str, object]:
+    return {
+        "IsPresent": True,
+        "State": 2,
+        "Percentage": 54.0,
+        "TimeToFull": 0,
+        "TimeToEmpty": 9000,
+        "EnergyRate": 11.5,
+    }
+
+
+def bench_cases() -> list[tuple[str, Callable[[], object]]]:
+    cases: list[tuple[str, Callable[[], object]]] = []
+    for count in BENCH_CLIENT_COUNTS:
+        clients = synthetic_awesome_clients(count)
+        snapshot = synthetic_awesome_snapshot(count)
+        tasks = parse_awesome_clients(clients)
+        group = max(group_tasks_for_dock(tasks, max_icons=len(tasks)).groups, key=lambda item: item.count)
+        cases.extend(
+            [
+                (f"parse_awesome_clients[{count}]", lambda text=clients: parse_awesome_clients(text)),
+                (f"parse_awesome_snapshot[{count}]", lambda text=snapshot: parse_awesome_snapshot(text)),
+                (f"group_tasks_for_dock[{count}]", lambda items=tasks: group_tasks_for_dock(items)),
+                (f"task_action_model[{count}]", lambda target=group: task_action_model(target)),
+            ]
+        )
+    for screens in BENCH_SCREEN_COUNTS:
+        visibility = synthetic_bar_visibility(screens)
+        cases.append((f"parse_awesome_bar_visibility[{screens}]", lambda text=visibility: parse_awesome_bar_visibility(text)))
+
+    status = synthetic_ai_status()
+    for provider in AI_PROVIDER_DEFS:
+        cases.append((f"ai_dashboard_model[{provider}]", lambda name=provider: ai_dashboard_model(status, name, now_epoch=1778680000)))
+    sampler = SystemSampler()
+    if sampler.sample() is not None:
+        cases.append(("system_sample", sampler.sample))
+    properties = synthetic_upower_properties()
+    cases.append(("battery_snapshot_from_properties", lambda: battery_detail_rows(battery_snapshot_from_properties(properties))))
+
+    today = date(2026, 5, 14)
+    markers = frozenset(today + timedelta(days=offset) for offset in range(-180, 180, 3))
+    months = CalendarMonthCache()
+    cases.extend(
+        [
+            ("calendar_month_model[cold]", lambda: calendar_month_model(2026, 5, today=today, selected=today, marker_days=markers)),
+            (
+                "calendar_month_model[cached]",
+                lambda: calendar_month_model(2026, 5, today=today, selected=today, marker_days=markers, months=months),
+            ),
+        ]
+    )
+    return cases
+
+
+def traced_allocation(fn: Callable[[], object]) -> tuple[int, int]:
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _peak = tracemalloc.get_traced_memory()
+        result = fn()
+        after, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        if started_here:
+            tracemalloc.stop()
+    return max(0, peak - before), max(0, after - before)
+
+
+def bench_case(fn: Callable[[], object], min_seconds: float = BENCH_MIN_SECONDS, clock=time.perf_counter) -> dict[str, object]:
+    fn()
+    iterations = 0
+    batch = 1
+    started = clock()
+    while True:
+        for _index in range(batch):
+            fn()
+        iterations += batch
+        elapsed = clock() - started
+        if elapsed >= min_seconds:
+            break
+        batch *= 2
+    elapsed = max(elapsed, 1e-9)
+    peak_bytes, result_bytes = traced_allocation(fn)
+    return {
+        "iterations": iterations,
+        "ops_per_sec": round(iterations / elapsed, 1),
+        "mean_us": round(elapsed / iterations * 1_000_000, 3),
+        "peak_bytes": peak_bytes,
+        "result_bytes": result_bytes,
+    }
+
 
-    return False
+def run_benchmarks(min_seconds: float = BENCH_MIN_SECONDS, cases=None) -> dict[str, object]:
+    config_dir = Path(__file__).resolve().parent
+    return {
+        "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "revision": command_output(["git", "-C", str(config_dir), "rev-parse", "--short", "HEAD"], "unknown"),
+        "python": sys.version.split()[0],
+        "cases": {name: bench_case(fn, min_seconds) for name, fn in (cases if cases is not None else bench_cases())},
+    }
 
 
+def compare_bench(current: dict[str, object], baseline: dict[str, object]) -> dict[str, float]:
+    previous = baseline.get("cases") if isinstance(baseline.get("cases"), dict) else {}
+    ratios = {}
+    for name, result in dict(current.get("cases") or {}).items():
+        before = as_number(nested_value(previous, name, "ops_per_sec"))
+        if before:
+            ratios[name] = round(float(result["ops_per_sec"]) / before, 3)
+    return ratios
+
+
+def format_bench(results: dict[str, object], ratios: dict[str, float] | None = None) -> str:
+    ratios = ratios or {}
+    lines = [f"revision {results.get('revision')}  python {results.get('python')}"]
+    lines.append(f"{'case':<40} {'ops/sec':>12} {'mean us':>10} {'peak KiB':>9} {'vs base':>8}")
+    for name, result in dict(results.get("cases") or {}).items():
+        ratio = ratios.get(name)
+        lines.append(
+            f"{name:<40} {result['ops_per_sec']:>12.0f} {result['mean_us']:>10.1f} "
+            f"{result['peak_bytes'] / 1024:>9.1f} {'-' if ratio is None else f'{ratio:.2f}x':>8}"
+        )
+    return "\n".join(lines)
 
 
-def ai_status_data() -> object:
-    try:
-        return json.loads(AI_STATUS_PATH.read_text())
-    except Exception:
-        return {}
+def argument_value(argv: list[str], flag: str) -> str | None:
+    for index, item in enumerate(argv):
+        if item.startswith(f"{flag}="):
+            return item.split("=", 1)[1]
+        if item == flag and index + 1 < len(argv):
+            return argv[index + 1]
+    return None
 
 
-def current_ai_summary() -> dict[str, object]:
-    return ai_summary_from_status(ai_status_data())
+def run_bench(argv: list[str]) -> int:
+    results = run_benchmarks()
+    output = argument_value(argv, "--output")
+    output_path = Path(output) if output else BENCH_RESULTS_DIR / f"{results['created'].replace(':', '')}-{results['revision']}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
 
+    ratios = None
+    baseline = argument_value(argv, "--baseline")
+    if baseline:
+        try:
+            ratios = compare_bench(results, json.loads(Path(baseline).read_text()))
+        except (OSError, ValueError) as error:
+            print(f"could not read baseline {baseline}: {error}", file=sys.stderr)
+            return 1
+    print(format_bench(results, ratios))
+    print(f"saved {output_path}")
+    return 0
 
-def restart_ai_usage_monitor() -> None:
-    run_command(["systemctl", "--user", "restart", "ai-usage-monitor.service"])
 
+class PollSource:
+    def __init__(
+        self,
+        name: str,
+        interval: int | tuple[int, int],
+        poll: Callable[[], object] | None,
+        idle_poll: Callable[[], object] | None = None,
+        idle_channel: str | None = None,
+        poll_async: Callable[[Callable[[object], None]], None] | None = None,
+        idle_poll_async: Callable[[Callable[[object], None]], None] | None = None,
+    ):
+        floor_ms, ceiling_ms = interval if isinstance(interval, tuple) else (interval, interval)
+        self.name = name
+        self.floor_ms = int(floor_ms)
+        self.ceiling_ms = max(int(floor_ms), int(ceiling_ms))
+        self.interval = self.floor_ms
+        self.polls = 0
+        self.changes = 0
+        self.poll = poll
+        self.idle_poll = idle_poll
+        self.poll_async = poll_async
+        self.idle_poll_async = idle_poll_async
+        self.in_flight = False
+        self.generation = 0
+        self.dropped = 0
+        self.idle_channel = idle_channel or name
+        self.subscribers: list[tuple[Callable[[object], None], object, bool]] = []
+        self.value: object = None
+        self.has_value = False
+        self.timer_id: int | None = None
+        self.due_at: float | None = None
+        self.paused = False
+
+
+class PollHub:
+    def __init__(self, scheduler=None, cancel=None, stats: BarStats | None = None, clock=time.monotonic):
+        if scheduler is None:
+            try:
+                from gi.repository import GLib
+
+                scheduler = GLib.timeout_add
+                cancel = GLib.source_remove
+            except Exception:
+                scheduler = None
+        self.scheduler = scheduler
+        self.cancel = cancel
+        self.clock = clock
+        self.stats = stats if stats is not None else shared_bar_stats()
+        self.sources: dict[str, PollSource] = {}
+        self.running = False
+        self.owners: list[object] = []
+        self.suspended_owners: list[object] = []
+        self.missed: dict[int, set[str]] = {}
+        self.attached: dict[str, object] = {}
+        self.idle = False
+
+    def add_source(
+        self,
+        name: str,
+        interval: int | tuple[int, int],
+        poll: Callable[[], object] | None,
+        idle_poll: Callable[[], object] | None = None,
+        idle_channel: str | None = None,
+        poll_async: Callable[[Callable[[object], None]], None] | None = None,
+        idle_poll_async: Callable[[Callable[[object], None]], None] | None = None,
+    ) -> PollSource:
+        source = PollSource(
+            name,
+            interval,
+            poll,
+            idle_poll=idle_poll,
+            idle_channel=idle_channel,
+            poll_async=poll_async,
+            idle_poll_async=idle_poll_async,
+        )
+        self.sources[name] = source
+        return source
 
-def schedule_ai_provider_refreshes(callback, scheduler=None, delays: tuple[int, ...] = AI_PROVIDER_SWITCH_REFRESH_DELAYS_MS) -> bool:
-    if scheduler is None:
-        try:
-            from gi.repository import GLib
+    def add_channel(self, name: str) -> PollSource:
+        return self.add_source(name, 0, None)
 
-            scheduler = GLib.timeout_add
-        except Exception:
+    def detach_poll(self, name: str) -> None:
+        source = self.sources.get(name)
+        if source is None:
+            return
+        self.unschedule(source)
+        self.invalidate(name)
+        source.poll = None
+        source.poll_async = None
+        source.idle_poll = None
+        source.idle_poll_async = None
+        source.in_flight = False
+
+    def value(self, name: str, fallback: object = None) -> object:
+        source = self.sources.get(name)
+        if source is None or not source.has_value:
+            return fallback
+        return source.value
+
+    def is_suspended(self, owner: object) -> bool:
+        return any(item is owner for item in self.suspended_owners)
+
+    def subscribe(
+        self,
+        name: str,
+        callback: Callable[[object], None],
+        owner: object = None,
+        while_suspended: bool = False,
+    ) -> None:
+        source = self.sources.get(name)
+        if source is None:
+            return
+        source.subscribers.append((callback, owner, while_suspended))
+        if owner is not None and not any(item is owner for item in self.owners):
+            self.owners.append(owner)
+        if source.has_value:
+            callback(source.value)
+
+    def publish(self, name: str, value: object) -> bool:
+        source = self.sources.get(name)
+        if source is None:
             return False
-
-    for delay in delays:
-        def run_once(callback=callback):
-            callback()
+        source.generation += 1
+        if source.has_value and source.value == value:
             return False
+        source.value = value
+        source.has_value = True
+        self.stats.changed(f"poll:{name}")
+        for callback, owner, while_suspended in list(source.subscribers):
+            if source.value is not value:
+                break
+            if owner is not None and not while_suspended and self.is_suspended(owner):
+                self.missed.setdefault(id(owner), set()).add(name)
+                continue
+            if owner is not None and id(owner) in self.missed:
+                self.missed[id(owner)].discard(name)
+            started = self.stats.clock()
+            callback(value)
+            self.stats.record(f"render:{name}", started)
+        return True
 
-        scheduler(int(delay), run_once)
+    def refresh(self, name: str) -> bool:
+        source = self.sources.get(name)
+        if source is None or source.poll is None:
+            return False
+        return self.publish(name, source.poll())
+
+    def prefetch(self) -> list[str]:
+        polled = [source for source in self.sources.values() if source.poll is not None]
+        polled.sort(key=lambda source: source.poll_async is None)
+        pending: list[str] = []
+        for source in polled:
+            self.tick(source.name)
+            if source.in_flight:
+                pending.append(source.name)
+        return pending
+
+    def suspend(self, owner: object) -> None:
+        if not self.is_suspended(owner):
+            self.suspended_owners.append(owner)
+        self.update_idle()
+
+    def resume(self, owner: object) -> None:
+        if not self.is_suspended(owner):
+            return
+        self.suspended_owners = [item for item in self.suspended_owners if item is not owner]
+        self.update_idle()
+        for name in sorted(self.missed.pop(id(owner), set())):
+            source = self.sources[name]
+            for callback, subscriber, _while_suspended in list(source.subscribers):
+                if subscriber is owner:
+                    callback(source.value)
+
+    def update_idle(self) -> None:
+        idle = bool(self.owners) and all(self.is_suspended(owner) for owner in self.owners)
+        if idle == self.idle:
+            return
+        self.idle = idle
+        for source in self.sources.values():
+            if source.poll is None:
+                continue
+            has_idle_poll = source.idle_poll is not None or source.idle_poll_async is not None
+            if idle and not has_idle_poll:
+                source.paused = True
+                self.unschedule(source)
+            elif not idle and (source.paused or has_idle_poll):
+                source.paused = False
+                source.interval = source.floor_ms
+                self.poll_now(source.name)
+
+    def start(self) -> bool:
+        if self.running or self.scheduler is None:
+            return False
+        self.running = True
+        for source in self.sources.values():
+            self.schedule(source)
+        return True
 
-    return bool(delays)
+    def stop(self) -> None:
+        self.running = False
+        for source in self.sources.values():
+            self.unschedule(source)
+
+    def schedule(self, source: PollSource) -> None:
+        if (
+            not self.running
+            or self.scheduler is None
+            or source.poll is None
+            or source.paused
+            or source.timer_id is not None
+        ):
+            return
+        source.due_at = self.clock() + source.interval / 1000
+        source.timer_id = self.scheduler(int(source.interval), lambda name=source.name: self.tick(name))
+
+    def adapt(self, source: PollSource, changed: bool) -> None:
+        source.polls += 1
+        if changed:
+            source.changes += 1
+            source.interval = source.floor_ms
+            return
+        source.interval = min(source.ceiling_ms, max(source.floor_ms, int(source.interval * POLL_BACKOFF)))
 
+    def invalidate(self, name: str) -> None:
+        source = self.sources.get(name)
+        if source is not None:
+            source.generation += 1
 
-def open_ai_usage_url(provider: str) -> None:
-    url = AI_USAGE_URLS.get(provider) or AI_USAGE_URLS["codex"]
-    run_command(["xdg-open", url])
+    def boost(self, name: str) -> None:
+        source = self.sources.get(name)
+        if source is None or source.poll is None:
+            return
+        source.interval = source.floor_ms
+        if source.timer_id is None:
+            return
+        if source.due_at is not None and source.due_at - self.clock() <= source.floor_ms / 1000:
+            return
+        self.unschedule(source)
+        self.schedule(source)
+
+    def unschedule(self, source: PollSource) -> None:
+        if source.timer_id is not None and self.cancel is not None:
+            self.cancel(source.timer_id)
+        source.timer_id = None
+        source.due_at = None
+
+    def poll_now(self, name: str) -> None:
+        source = self.sources.get(name)
+        if source is None or source.poll is None:
+            return
+        self.unschedule(source)
+        self.tick(name)
 
+    def tick(self, name: str) -> bool:
+        source = self.sources.get(name)
+        if source is None:
+            return False
+        source.timer_id = None
+        idle = self.idle and (source.idle_poll is not None or source.idle_poll_async is not None)
+        channel = source.idle_channel if idle else name
+        poll = source.idle_poll if idle else source.poll
+        poll_async = source.idle_poll_async if idle else source.poll_async
+        if poll_async is None:
+            started = self.stats.clock()
+            value = poll()
+            self.stats.record(f"poll:{channel}", started)
+            self.adapt(source, self.publish(channel, value))
+            self.schedule(source)
+            return False
 
+        if source.in_flight:
+            return False
+        source.in_flight = True
+        target = self.sources.get(channel, source)
+        generation = target.generation
+        started = self.stats.clock()
+        poll_async(lambda value: self.complete(name, channel, generation, value, started))
+        return False
 
+    def complete(self, name: str, channel: str, generation: int, value: object, started: float | None = None) -> None:
+        source = self.sources.get(name)
+        if source is None:
+            return
+        if started is not None:
+            self.stats.record(f"poll:{channel}", started)
+        source.in_flight = False
+        target = self.sources.get(channel, source)
+        if target.generation != generation:
+            source.dropped += 1
+            changed = False
+        else:
+            changed = self.publish(channel, value)
+        self.adapt(source, changed)
+        self.schedule(source)
+
+
+def publish_awesome_snapshot(
+    hub: PollHub,
+    snapshot: object,
+    task_events: AwesomeTaskEvents | None = None,
+    screens: bool = True,
+) -> None:
+    if not isinstance(snapshot, AwesomeSnapshot):
+        return
+    if snapshot.tasks is not None:
+        if task_events is not None:
+            task_events.reconcile(snapshot.tasks, snapshot.hooked)
+        hub.publish("tasks", snapshot.tasks)
+    if screens:
+        hub.publish("bar_visibility", snapshot.screens)
+    hub.publish("dnd", snapshot.dnd)
+
+
+POLL_HUB: PollHub | None = None
+
+
+def publish_event_tasks(hub: PollHub, tasks: list[Task]) -> None:
+    hub.invalidate("awesome")
+    hub.invalidate("awesome_tasks")
+    hub.publish("tasks", tasks)
+
+
+def publish_volume_text(hub: PollHub, text: str, volume: VolumeController | None = None) -> None:
+    hub.publish("volume", volume.reconcile(text) if volume is not None else text)
+
+
+def publish_audio_state(hub: PollHub, state: AudioState, volume: VolumeController | None = None) -> None:
+    hub.publish("audio", state)
+    publish_volume_text(hub, audio_volume_text(state), volume)
+
+
+def publish_system_load(hub: PollHub, load: SystemLoad | None) -> None:
+    for channel, text in zip(("cpu", "memory", "load"), system_load_texts(load)):
+        hub.publish(channel, text)
+
+
+def attach_task_events(hub: PollHub, task_events: AwesomeTaskEvents) -> None:
+    hub.attached["task_events"] = task_events
+    source = hub.sources["awesome"]
+    source.poll = awesome_state_snapshot
+    source.poll_async = awesome_state_snapshot_async
+    hub.add_source("awesome_tasks", POLL_INTERVALS_MS["awesome_tasks"], awesome_snapshot, poll_async=awesome_snapshot_async)
+    hub.subscribe("awesome_tasks", lambda snapshot: publish_awesome_snapshot(hub, snapshot, task_events, False))
+    if hub.running:
+        hub.poll_now("awesome_tasks")
+    task_events.on_tasks = lambda tasks: publish_event_tasks(hub, tasks)
+    task_events.on_activity = lambda: hub.boost("awesome")
+
+
+def attach_fullscreen(hub: PollHub, fullscreen: X11FullscreenWatcher) -> None:
+    hub.attached["fullscreen"] = fullscreen
+    source = hub.sources["awesome"]
+    source.idle_poll = None
+    source.idle_poll_async = None
+    fullscreen.on_states = lambda states: hub.publish("bar_visibility", states)
+    if fullscreen.states is not None:
+        hub.publish("bar_visibility", fullscreen.states)
+
+
+def attach_network(hub: PollHub, network: NetworkMonitor) -> None:
+    hub.detach_poll("network")
+    network.on_label = lambda label: hub.publish("network", label)
+    if network.label is not None:
+        hub.publish("network", network.label)
+
+
+def attach_audio(hub: PollHub, audio: AudioService, volume: VolumeController | None = None) -> None:
+    hub.detach_poll("volume")
+    audio.on_state = lambda state: publish_audio_state(hub, state, volume)
+    if audio.state is not None:
+        publish_audio_state(hub, audio.state, volume)
+
+
+def attach_ai(hub: PollHub, ai: AIStatusStore) -> None:
+    hub.detach_poll("ai")
+    hub.subscribe("ai_status", lambda _snapshot: hub.publish("ai", ai.compact_text()))
+    ai.on_change = lambda snapshot: hub.publish("ai_status", snapshot)
+    if ai.snapshot is not None:
+        hub.publish("ai_status", ai.snapshot)
+
+
+def attach_profiles(hub: PollHub, profiles: PowerProfilesMonitor) -> None:
+    profiles.on_profiles = lambda value: hub.publish("power_profiles", value)
+    hub.publish("power_profiles", profiles.profiles)
+
+
+def attach_battery(hub: PollHub, battery: BatteryMonitor) -> None:
+    hub.detach_poll("battery_info")
+    battery.on_snapshot = lambda snapshot: hub.publish("battery_info", snapshot)
+    hub.publish("battery_info", battery.snapshot)
+
+
+def default_poll_hub(
+    scheduler=None,
+    cancel=None,
+    task_events: AwesomeTaskEvents | None = None,
+    audio: AudioService | None = None,
+    network: NetworkMonitor | None = None,
+    battery: BatteryMonitor | None = None,
+    ai: AIStatusStore | None = None,
+    profiles: PowerProfilesMonitor | None = None,
+    volume: VolumeController | None = None,
+    fullscreen: X11FullscreenWatcher | None = None,
+    system: SystemSampler | None = None,
+) -> PollHub:
+    hub = PollHub(scheduler=scheduler, cancel=cancel)
+    hub.add_source(
+        "awesome",
+        POLL_INTERVALS_MS["awesome"],
+        awesome_snapshot,
+        idle_poll=screen_bar_states,
+        idle_channel="bar_visibility",
+        poll_async=awesome_snapshot_async,
+        idle_poll_async=screen_bar_states_async,
+    )
+    for channel in ("bar_visibility", "tasks", "dnd"):
+        hub.add_channel(channel)
+    hub.subscribe(
+        "awesome",
+        lambda snapshot: publish_awesome_snapshot(
+            hub,
+            snapshot,
+            hub.attached.get("task_events"),
+            "fullscreen" not in hub.attached,
+        ),
+    )
+    hub.add_source("network", POLL_INTERVALS_MS["network"], network_text)
+    hub.add_channel("audio")
+    if volume is not None:
+        hub.add_source(
+            "volume",
+            POLL_INTERVALS_MS["volume"],
+            lambda: volume.reconcile(volume_text()),
+            poll_async=lambda callback: volume_text_async(lambda text: callback(volume.reconcile(text))),
+        )
+        volume.on_value = lambda text: hub.publish("volume", text)
+    else:
+        hub.add_source("volume", POLL_INTERVALS_MS["volume"], volume_text, poll_async=volume_text_async)
+    hub.add_channel("ai_status")
+    hub.add_source("ai", POLL_INTERVALS_MS["ai"], ai_usage_text)
+    hub.add_channel("battery")
+    hub.add_channel("power_profiles")
+    hub.add_source("battery_info", POLL_INTERVALS_MS["battery_info"], power_supply_snapshot)
+    hub.subscribe("battery_info", lambda snapshot: hub.publish("battery", battery_summary_from_info(snapshot)))
+    sampler = system if system is not None else shared_system_sampler()
+    hub.add_source("system", POLL_INTERVALS_MS["system"], sampler.sample)
+    for channel in ("cpu", "memory", "load"):
+        hub.add_channel(channel)
+    hub.subscribe("system", lambda load: publish_system_load(hub, load))
+
+    if task_events is not None:
+        attach_task_events(hub, task_events)
+    if fullscreen is not None:
+        attach_fullscreen(hub, fullscreen)
+    if network is not None:
+        attach_network(hub, network)
+    if audio is not None:
+        attach_audio(hub, audio, volume)
+    if ai is not None:
+        attach_ai(hub, ai)
+    if profiles is not None:
+        attach_profiles(hub, profiles)
+    if battery is not None:
+        attach_battery(hub, battery)
+    return hub
+
+
+def poll_service_steps(hub: PollHub, monitors: list[MonitorGeometry]) -> list[Callable[[], None]]:
+    volume = shared_volume_controller()
+
+    def start(service, attach) -> None:
+        if service.start():
+            attach(hub, service)
+
+    return [
+        lambda: start(AwesomeTaskEvents(), attach_task_events),
+        lambda: start(X11FullscreenWatcher(monitors), attach_fullscreen),
+        lambda: start(NetworkMonitor(), attach_network),
+        lambda: start(AudioService(), lambda target, audio: attach_audio(target, audio, volume)),
+        lambda: start(shared_ai_status_store(), attach_ai),
+        lambda: start(BatteryMonitor(), attach_battery),
+        lambda: start(shared_power_profiles_monitor(), attach_profiles),
+        lambda: StatsService().start(),
+    ]
+
+
+def start_poll_services(hub: PollHub, monitors: list[MonitorGeometry], scheduler=None) -> bool:
+    steps = poll_service_steps(hub, monitors)
+    if scheduler is None:
+        try:
+            from gi.repository import GLib
+        except Exception:
+            return False
+        scheduler = lambda callback: GLib.idle_add(callback, priority=GLib.PRIORITY_LOW)
 
-def ai_usage_text() -> str:
-    provider = load_ai_provider_preference()
-    try:
-        data = json.loads(AI_STATUS_PATH.read_text())
-    except Exception:
-        data = {}
+    def run_next() -> bool:
+        if steps:
+            steps.pop(0)()
+        return bool(steps)
 
-    return ai_compact_usage_from_status(data, provider)
+    scheduler(run_next)
+    return True
 
 
-def run_self_check() -> int:
-    for check in (volume_text, battery_value, network_text, ai_usage_text, running_apps_text, dnd_text):
-        check()
-    return 0
+def shared_poll_hub() -> PollHub:
+    global POLL_HUB
+    if POLL_HUB is None:
+        POLL_HUB = default_poll_hub(volume=shared_volume_controller(), system=shared_system_sampler())
+        shared_action_queue().on_failure = lambda: POLL_HUB.poll_now("awesome")
+    return POLL_HUB
 
 
 class StatusPill(Box):
@@ -1513,14 +4652,76 @@ class StatusPill(Box):
         self.value.set_label(value)
 
 
+def task_button_state(group: TaskGroup) -> tuple[str, int, bool, str]:
+    label = group.label or "App"
+    return (
+        initials_for_label(label),
+        group.count,
+        group.focused,
+        group.class_name or label,
+    )
+
+
+class TaskButton(Button):
+    def __init__(self, group: TaskGroup, on_press: Callable[[object, object, TaskGroup], bool], scale: int = 1):
+        self.group = group
+        self.state: tuple[str, int, bool, str] | None = None
+        _icon_name, surface = shared_icon_cache().resolve(group.class_name, scale)
+        if surface is not None:
+            self.app_child = Image()
+            self.app_child.set_from_surface(surface)
+            self.initials = None
+        else:
+            self.initials = Label(name="task-initials", label="")
+            self.app_child = self.initials
+        self.count_badge = Label(name="task-count-badge", label="")
+        self.inner = Box(name="task-button-inner", orientation="h", spacing=1, children=[self.app_child])
+        super().__init__(name="task-button", child=self.inner)
+        self.connect("button-press-event", lambda widget, event: on_press(widget, event, self.group))
+        self.update(group)
+
+    def update(self, group: TaskGroup) -> bool:
+        self.group = group
+        state = task_button_state(group)
+        previous = self.state
+        if state == previous:
+            return False
+        initials, count, focused, tooltip = state
+        if self.initials is not None and (previous is None or previous[0] != initials):
+            self.initials.set_label(initials)
+        if previous is None or previous[1] != count:
+            if count > 1:
+                self.count_badge.set_label(str(count))
+            if previous is None or (previous[1] > 1) != (count > 1):
+                self.inner.children = [self.app_child, self.count_badge] if count > 1 else [self.app_child]
+        if previous is None or previous[2] != focused:
+            self.set_style_classes(["focused"] if focused else [])
+        if previous is None or previous[3] != tooltip:
+            self.set_tooltip_text(tooltip)
+        self.state = state
+        return True
+
+
 class TaskStrip(Box):
-    def __init__(self, on_task_secondary_click: Callable[[Task, object], None] | None = None, **kwargs):
+    def __init__(self, on_task_secondary_click: Callable[[TaskGroup, object], None] | None = None, scale: int = 1, **kwargs):
         self.on_task_secondary_click = on_task_secondary_click
+        self.scale = scale
+        self.buttons: dict[str, TaskButton] = {}
+        self.empty_label = Label(name="task-empty", label="idle")
+        self.overflow_label = Label(label="")
+        self.overflow_button = Button(
+            name="task-overflow",
+            child=self.overflow_label,
+            on_clicked=lambda *_: open_client_menu(),
+        )
+        self.hidden_count = 0
+        self.digest: int | None = None
+        self.icon_generation = shared_icon_cache().generation
         self.task_buttons = Box(
             name="task-buttons",
             orientation="h",
             spacing=5,
-            children=[Label(name="task-empty", label="idle")],
+            children=[self.empty_label],
         )
         super().__init__(
             name="task-strip",
@@ -1530,88 +4731,115 @@ class TaskStrip(Box):
             **kwargs,
         )
 
-    def task_child(self, task: Task) -> Box | Label:
-        label = str(task.get("label") or "App")
-        class_name = str(task.get("class_name") or "")
-        icon_name = icon_name_for_class(class_name)
-        count = int(task.get("count") or 1)
-        if icon_theme_has_icon(icon_name):
-            app_child = Image(icon_name=icon_name, icon_size=16)
-        else:
-            app_child = Label(name="task-initials", label=initials_for_label(label))
-
-        if count <= 1:
-            return app_child
-
-        return Box(
-            name="task-button-inner",
-            orientation="h",
-            spacing=1,
-            children=[
-                app_child,
-                Label(name="task-count-badge", label=str(count)),
-            ],
-        )
-
     def set_tasks(self, tasks: list[Task]) -> None:
-        if not tasks:
-            self.task_buttons.children = [Label(name="task-empty", label="idle")]
+        dock = group_tasks_for_dock(tasks)
+        icon_generation = shared_icon_cache().generation
+        if dock.digest == self.digest and icon_generation == self.icon_generation:
             return
-
-        grouped_tasks = group_tasks_for_dock(tasks)
-        children = []
-        for task in grouped_tasks:
-            label = str(task.get("label") or "App")
-            class_name = str(task.get("class_name") or label)
-            button = Button(
-                name="task-button",
-                style_classes=["focused"] if bool(task.get("focused")) else [],
-                child=self.task_child(task),
-            )
-            button.connect(
-                "button-press-event",
-                lambda widget, event, target=copy.deepcopy(task): self.on_task_button_press(widget, event, target),
-            )
-            button.set_tooltip_text(class_name)
+        self.digest = dock.digest
+        hidden_count = dock.overflow
+
+        if icon_generation != self.icon_generation:
+            self.icon_generation = icon_generation
+            for stale in self.buttons.values():
+                stale.destroy()
+            self.buttons = {}
+
+        buttons: dict[str, TaskButton] = {}
+        children: list[object] = []
+        for group in dock.groups:
+            key = task_group_key(group)
+            button = self.buttons.pop(key, None)
+            if button is None:
+                button = TaskButton(group, self.on_task_button_press, self.scale)
+            else:
+                button.update(group)
+            buttons[key] = button
             children.append(button)
 
-        hidden_count = overflow_count_for_tasks(tasks)
+        for stale in self.buttons.values():
+            stale.destroy()
+        self.buttons = buttons
+
+        if hidden_count and hidden_count != self.hidden_count:
+            self.overflow_label.set_label(f"+{hidden_count}")
+        self.hidden_count = hidden_count
         if hidden_count:
-            children.append(
-                Button(
-                    name="task-overflow",
-                    child=Label(label=f"+{hidden_count}"),
-                    on_clicked=lambda *_: open_client_menu(),
-                )
-            )
+            children.append(self.overflow_button)
+        if not children:
+            children.append(self.empty_label)
 
-        self.task_buttons.children = children
+        if list(self.task_buttons.children) != children:
+            self.task_buttons.children = children
 
-    def on_task_button_press(self, _widget, event, task: Task) -> bool:
+    def on_task_button_press(self, widget, event, group: TaskGroup) -> bool:
         button = int(getattr(event, "button", 0))
-        raw_window_ids = task.get("window_ids") if isinstance(task.get("window_ids"), list) else []
-        window_ids = valid_window_ids(raw_window_ids)
+        window_ids = valid_window_ids(group.window_ids)
         if button == 1:
-            if window_ids:
-                focus_window(window_ids[0])
+            if window_ids and not focus_window(window_ids[0], lambda ok: flash_action_failure(widget, ok)):
+                flash_action_failure(widget, False)
         elif button == 3 and callable(self.on_task_secondary_click):
-            self.on_task_secondary_click(task, event)
+            self.on_task_secondary_click(group, event)
         return True
 
 
 class PopupManager:
-    def __init__(self, clock=time.monotonic, reopen_suppression_seconds: float = 0.18):
+    def __init__(
+        self,
+        clock=time.monotonic,
+        reopen_suppression_seconds: float = 0.18,
+        on_open: Callable[[str], None] | None = None,
+        pool: PopoutPool | None = None,
+        monitor: MonitorGeometry | None = None,
+    ):
         self.clock = clock
+        self.on_open = on_open
+        self.pool = pool
+        self.monitor = monitor
         self.reopen_suppression_seconds = reopen_suppression_seconds
         self.popups: dict[str, object] = {}
+        self.lazy_names: list[str] = []
         self.recent_focus_close: dict[str, float] = {}
         self.active_name: str | None = None
 
     def register(self, name: str, popup: object) -> None:
         self.popups[name] = popup
 
-    def is_visible(self, name: str) -> bool:
+    def register_lazy(self, name: str) -> None:
+        if name not in self.lazy_names:
+            self.lazy_names.append(name)
+
+    def names(self) -> list[str]:
+        return [*self.popups, *(name for name in self.lazy_names if name not in self.popups)]
+
+    def popup(self, name: str, create: bool = False) -> object | None:
         popup = self.popups.get(name)
+        if popup is not None or self.pool is None or name not in self.lazy_names:
+            return popup
+        if create:
+            return self.pool.acquire(name, self.monitor, self)
+        return self.pool.peek(name, self)
+
+    def release(self, name: str) -> None:
+        if self.active_name == name:
+            self.active_name = None
+
+    def handle_focus_out(self, name: str) -> bool:
+        self.close(name, reason="focus-out")
+        return False
+
+    def handle_key_press(self, name: str, event) -> bool:
+        key_name = key_name_from_event(event)
+        if key_name == "Escape" or key_name.lower() == "escape":
+            self.close(name)
+            return True
+        handle_key_press = getattr(self.popup(name), "handle_key_press", None)
+        if callable(handle_key_press):
+            return bool(handle_key_press(event))
+        return False
+
+    def is_visible(self, name: str) -> bool:
+        popup = self.popup(name)
         if popup is None:
             return False
         get_visible = getattr(popup, "get_visible", None)
@@ -1628,7 +4856,9 @@ class PopupManager:
         return False
 
     def open(self, name: str) -> None:
-        popup = self.popups.get(name)
+        stats = shared_bar_stats()
+        started = stats.clock()
+        popup = self.popup(name, create=True)
         if popup is None:
             return
         self.close_all(except_name=name)
@@ -1642,9 +4872,12 @@ class PopupManager:
         if callable(present):
             present()
         self.active_name = name
+        if callable(self.on_open):
+            self.on_open(name)
+        stats.record(f"popup:{name}", started)
 
     def close(self, name: str, reason: str = "manual") -> None:
-        popup = self.popups.get(name)
+        popup = self.popup(name)
         if popup is None:
             return
         hide = getattr(popup, "hide", None)
@@ -1656,7 +4889,7 @@ class PopupManager:
             self.recent_focus_close[name] = self.clock()
 
     def close_all(self, except_name: str | None = None) -> None:
-        for name in list(self.popups):
+        for name in self.names():
             if name != except_name:
                 self.close(name)
 
@@ -1669,11 +4902,61 @@ class PopupManager:
         self.open(name)
 
 
+class PopoutPool:
+    def __init__(self, on_create: Callable[[object], None] | None = None):
+        self.on_create = on_create
+        self.factories: dict[str, Callable[[MonitorGeometry], object]] = {}
+        self.instances: dict[str, object] = {}
+        self.owners: dict[str, PopupManager] = {}
+
+    def register(self, name: str, factory: Callable[[MonitorGeometry], object]) -> None:
+        self.factories[name] = factory
+
+    def has(self, name: str) -> bool:
+        return name in self.factories
+
+    def peek(self, name: str, owner: PopupManager) -> object | None:
+        if self.owners.get(name) is not owner:
+            return None
+        return self.instances.get(name)
+
+    def acquire(self, name: str, monitor: MonitorGeometry | None, owner: PopupManager) -> object | None:
+        popup = self.instances.get(name)
+        if popup is None:
+            factory = self.factories.get(name)
+            if factory is None or monitor is None:
+                return None
+            popup = factory(monitor)
+            self.instances[name] = popup
+            connect = getattr(popup, "connect", None)
+            if callable(connect):
+                connect("focus-out-event", lambda *_args, target=name: self.owners[target].handle_focus_out(target))
+                connect("key-press-event", lambda _widget, event, target=name: self.owners[target].handle_key_press(target, event))
+            if callable(self.on_create):
+                self.on_create(popup)
+        elif monitor is not None:
+            set_monitor = getattr(popup, "set_monitor", None)
+            if callable(set_monitor):
+                set_monitor(monitor)
+
+        previous = self.owners.get(name)
+        if previous is not None and previous is not owner:
+            previous.release(name)
+        self.owners[name] = owner
+        return popup
+
+
 class MonitorWindow(Window):
     def __init__(self, monitor: MonitorGeometry, *args, **kwargs):
         self.monitor = monitor
         super().__init__(*args, **kwargs)
 
+    def set_monitor(self, monitor: MonitorGeometry) -> None:
+        if monitor == self.monitor:
+            return
+        self.monitor = monitor
+        self.margin = self.margin
+
     def do_get_display_props(self):
         from gi.repository import Gdk
 
@@ -1685,7 +4968,7 @@ class MonitorWindow(Window):
 
 class TaskActionPopout(MonitorWindow):
     def __init__(self, monitor: MonitorGeometry):
-        self.current_task: Task = {}
+        self.current_task: TaskGroup | None = None
         self.panel = Box(name="task-action-panel", orientation="v", spacing=6)
         super().__init__(
             monitor,
@@ -1699,8 +4982,8 @@ class TaskActionPopout(MonitorWindow):
             child=self.panel,
         )
 
-    def set_task(self, task: Task) -> None:
-        self.current_task = copy.deepcopy(task)
+    def set_task(self, group: TaskGroup) -> None:
+        self.current_task = group
 
     def set_anchor_from_event(self, event: object) -> None:
         self.margin = task_action_margin_for_pointer(
@@ -1734,22 +5017,34 @@ class TaskActionPopout(MonitorWindow):
             name="task-action-row",
             style_classes=style_classes,
             child=Label(label=str(row.get("label") or "")),
-            on_clicked=lambda *_args, action=copy.deepcopy(row): self.activate_action(action),
+            on_clicked=lambda widget, *_args, action=copy.deepcopy(row): self.activate_action(action, widget),
         )
 
-    def activate_action(self, row: dict[str, object]) -> None:
+    def activate_action(self, row: dict[str, object], widget: object = None) -> bool:
         action = str(row.get("action") or "")
+        on_result = lambda ok: self.finish_action(ok, widget)
         if action == "focus":
-            focus_window(row.get("window_id"))
+            pushed = focus_window(row.get("window_id"), on_result)
         elif action == "close":
-            close_window(row.get("window_id"))
+            pushed = close_window(row.get("window_id"), on_result)
         elif action == "close-all":
-            close_windows(row.get("window_ids"))
-        self.hide()
+            pushed = close_windows(row.get("window_ids"), on_result)
+        else:
+            pushed = False
+        if not pushed:
+            self.finish_action(False, widget)
+        return pushed
+
+    def finish_action(self, ok: bool, widget: object = None) -> None:
+        if ok:
+            self.hide()
+            return
+        flash_action_failure(widget, ok)
 
 
 class AudioDevicePopout(MonitorWindow):
     def __init__(self, monitor: MonitorGeometry):
+        self.state: AudioState | None = None
         self.rows = Box(name="audio-popout-rows", orientation="v", spacing=4)
         super().__init__(
             monitor,
@@ -1772,14 +5067,34 @@ class AudioDevicePopout(MonitorWindow):
         )
 
     def refresh(self) -> None:
-        devices = parse_audio_devices(audio_devices_listing())
-        default_sink = str(devices.get("default_sink") or "")
-        default_source = str(devices.get("default_source") or "")
+        if self.state is not None:
+            self.render_state(self.state)
+            return
+        audio_devices_listing_async(self.render_devices)
+
+    def set_state(self, state: AudioState) -> None:
+        self.state = state
+        if self.get_visible():
+            self.render_state(state)
+
+    def render_devices(self, listing: str) -> None:
+        devices = parse_audio_devices(listing)
+        self.render(
+            str(devices.get("default_sink") or ""),
+            devices.get("sinks"),
+            str(devices.get("default_source") or ""),
+            devices.get("sources"),
+        )
+
+    def render_state(self, state: AudioState) -> None:
+        self.render(state.default_sink, list(state.sinks), state.default_source, list(state.sources))
+
+    def render(self, default_sink: str, sinks: object, default_source: str, sources: object) -> None:
         children = [
             Label(name="popout-section", label="OUTPUT"),
-            *self.device_rows("sink", devices.get("sinks"), default_sink),
+            *self.device_rows("sink", sinks, default_sink),
             Label(name="popout-section", label="INPUT"),
-            *self.device_rows("source", devices.get("sources"), default_source),
+            *self.device_rows("source", sources, default_source),
         ]
         self.rows.children = children
 
@@ -1852,8 +5167,68 @@ class NetworkSettingsPopout(MonitorWindow):
         return rows
 
 
+class SystemLoadPopout(MonitorWindow):
+    def __init__(self, monitor: MonitorGeometry, sampler: SystemSampler | None = None):
+        self.sampler = sampler if sampler is not None else shared_system_sampler()
+        self.values: dict[str, Label] = {}
+        self.sparklines: dict[str, Label] = {}
+        rows = []
+        for key, title in (("cpu", "CPU"), ("memory", "MEMORY"), ("load", "LOAD")):
+            self.values[key] = Label(name="system-value", label="--")
+            self.sparklines[key] = Label(name="system-sparkline", label="")
+            rows.append(
+                Box(
+                    name="system-row",
+                    orientation="v",
+                    spacing=2,
+                    children=[
+                        Box(
+                            name="system-row-head",
+                            orientation="h",
+                            spacing=8,
+                            children=[Label(name="system-label", h_expand=True, label=title), self.values[key]],
+                        ),
+                        self.sparklines[key],
+                    ],
+                )
+            )
+        super().__init__(
+            monitor,
+            title="fabric-system-popout",
+            name="system-popout",
+            layer="top",
+            geometry="top-right",
+            margin="37px 10px 0px 0px",
+            type_hint="dialog",
+            visible=False,
+            child=Box(
+                name="popout-panel",
+                orientation="v",
+                spacing=8,
+                children=[Label(name="popout-title", label="SYSTEM (5m)"), *rows],
+            ),
+        )
+
+    def set_load(self, _load: SystemLoad | None) -> None:
+        if self.get_visible():
+            self.refresh()
+
+    def refresh(self) -> None:
+        texts = system_load_texts(self.sampler.latest)
+        for key, text in zip(("cpu", "memory", "load"), texts):
+            self.values[key].set_label(text)
+            values = self.sampler.history(key)
+            ceiling = 100.0
+            if key == "load":
+                ceiling = max([float(os.cpu_count() or 1), *(value for value in values if not math.isnan(value))])
+            self.sparklines[key].set_label(sparkline_text(values, SYSTEM_SPARKLINE_WIDTH, ceiling, hold=False))
+
+
 class BatteryPowerPopout(MonitorWindow):
     def __init__(self, monitor: MonitorGeometry):
+        self.info: BatterySnapshot | None = None
+        self.profiles: list[dict[str, object]] | None = None
+        self.live_profiles = False
         self.panel = Box(name="battery-panel", orientation="v", spacing=8)
         super().__init__(
             monitor,
@@ -1868,20 +5243,37 @@ class BatteryPowerPopout(MonitorWindow):
         )
 
     def refresh(self) -> None:
-        info = battery_info()
-        profiles = power_profiles()
+        if not self.live_profiles:
+            power_profiles_async(self.set_profiles)
+        self.render()
+
+    def set_info(self, info: BatterySnapshot | None) -> None:
+        self.info = info
+        if self.get_visible():
+            self.render()
+
+    def set_profiles(self, profiles: list[dict[str, object]]) -> None:
+        self.profiles = profiles
+        if self.get_visible():
+            self.render()
+
+    def set_live_profiles(self, profiles: list[dict[str, object]]) -> None:
+        self.live_profiles = True
+        self.set_profiles(profiles)
+
+    def render(self) -> None:
         children: list[Box | Button | Label] = [Label(name="popout-title", label="BATTERY")]
-        detail_rows = battery_detail_rows(info)
+        detail_rows = battery_detail_rows(self.info)
         if detail_rows:
             children.extend(self.detail_row(label, value) for label, value in detail_rows)
         else:
             children.append(Label(name="popout-muted", label="battery unavailable"))
 
         children.append(Label(name="popout-section", label="POWER PROFILE"))
-        if profiles:
-            children.extend(self.profile_row(profile) for profile in profiles)
+        if self.profiles:
+            children.extend(self.profile_row(profile) for profile in self.profiles)
         else:
-            children.append(Label(name="popout-muted", label="profiles unavailable"))
+            children.append(Label(name="popout-muted", label="loading" if self.profiles is None else "profiles unavailable"))
         self.panel.children = children
 
     def detail_row(self, label: str, value: str) -> Box:
@@ -1908,12 +5300,14 @@ class BatteryPowerPopout(MonitorWindow):
 
     def select_profile(self, profile: str) -> None:
         set_power_profile(profile)
-        self.refresh()
+        if not self.live_profiles:
+            self.refresh()
 
 
 class AIUsagePopout(MonitorWindow):
-    def __init__(self, monitor: MonitorGeometry, on_provider_changed=None):
+    def __init__(self, monitor: MonitorGeometry, on_provider_changed=None, store: AIStatusStore | None = None):
         self.on_provider_changed = on_provider_changed
+        self.store = store if store is not None else shared_ai_status_store()
         self.panel = Box(name="ai-panel", orientation="v", spacing=9)
         super().__init__(
             monitor,
@@ -1928,9 +5322,7 @@ class AIUsagePopout(MonitorWindow):
         )
 
     def refresh(self) -> None:
-        provider = load_ai_provider_preference()
-        status = ai_status_data()
-        model = ai_dashboard_model(status, provider)
+        model = self.store.dashboard_model()
         children = [
             self.header(model),
             self.provider_tabs(model),
@@ -1986,32 +5378,42 @@ class AIUsagePopout(MonitorWindow):
             size=(238, 8),
         )
         progress.set_sensitive(False)
-        return Box(
-            name="ai-metric-row",
-            orientation="v",
-            spacing=4,
-            children=[
-                Box(
-                    name="ai-metric-head",
-                    orientation="h",
-                    spacing=8,
-                    children=[
-                        Label(name="ai-metric-label", h_expand=True, label=str(row["label"])),
-                        Label(name="ai-metric-value", style_classes=[str(row["severity"])], label=str(row["percent_text"])),
-                    ],
-                ),
-                progress,
+        children = [
+            Box(
+                name="ai-metric-head",
+                orientation="h",
+                spacing=8,
+                children=[
+                    Label(name="ai-metric-label", h_expand=True, label=str(row["label"])),
+                    Label(name="ai-metric-value", style_classes=[str(row["severity"])], label=str(row["percent_text"])),
+                ],
+            ),
+            progress,
+        ]
+        if row.get("sparkline") or row.get("burn_text"):
+            children.append(
                 Box(
-                    name="ai-metric-foot",
+                    name="ai-metric-trend",
                     orientation="h",
                     spacing=8,
                     children=[
-                        Label(name="ai-metric-reset", h_expand=True, label=str(row["reset_text"])),
-                        Label(name="ai-metric-status", style_classes=[str(row["severity"])], label=str(row["status"])),
+                        Label(name="ai-metric-sparkline", h_expand=True, label=str(row.get("sparkline") or "")),
+                        Label(name="ai-metric-burn", label=str(row.get("burn_text") or "")),
                     ],
-                ),
-            ],
+                )
+            )
+        children.append(
+            Box(
+                name="ai-metric-foot",
+                orientation="h",
+                spacing=8,
+                children=[
+                    Label(name="ai-metric-reset", h_expand=True, label=str(row["reset_text"])),
+                    Label(name="ai-metric-status", style_classes=[str(row["severity"])], label=str(row["status"])),
+                ],
+            )
         )
+        return Box(name="ai-metric-row", orientation="v", spacing=4, children=children)
 
     def status_message(self, message: str) -> Box:
         return Box(name="ai-status-message", children=[Label(label=message)])
@@ -2041,8 +5443,13 @@ class AIUsagePopout(MonitorWindow):
             ],
         )
 
+    def on_status(self, _snapshot: AIStatusSnapshot) -> None:
+        if self.get_visible():
+            self.refresh()
+
     def select_provider(self, provider: str) -> None:
         save_ai_provider_preference(provider)
+        self.store.load()
         self.restart_monitor_and_refresh()
 
     def refresh_after_provider_change(self) -> None:
@@ -2069,8 +5476,24 @@ class CalendarPopout(MonitorWindow):
         self.selected_date = date.today()
         self.view_year = self.selected_date.year
         self.view_month = self.selected_date.month
+        self.months = shared_calendar_months()
+        self.rendered_key: tuple[object, ...] | None = None
         self.title_label = Label(name="calendar-title", h_expand=True, label="")
-        self.day_grid = Box(name="calendar-grid", orientation="v", spacing=4)
+        cell_count = CALENDAR_WEEKS * 7
+        self.day_dates: list[date | None] = [None] * cell_count
+        self.day_text: list[str] = [""] * cell_count
+        self.day_classes: list[tuple[str, ...]] = [()] * cell_count
+        self.day_labels = [Label(label="") for _index in range(cell_count)]
+        self.day_buttons = [self.day_button(index) for index in range(cell_count)]
+        self.day_grid = Box(
+            name="calendar-grid",
+            orientation="v",
+            spacing=4,
+            children=[
+                Box(name="calendar-week", orientation="h", spacing=4, children=self.day_buttons[week * 7 : week * 7 + 7])
+                for week in range(CALENDAR_WEEKS)
+            ],
+        )
         self.selected_label = Label(name="calendar-selected", label="")
         super().__init__(
             monitor,
@@ -2110,28 +5533,44 @@ class CalendarPopout(MonitorWindow):
         )
 
     def refresh(self) -> None:
-        model = calendar_month_model(self.view_year, self.view_month, today=date.today(), selected=self.selected_date)
+        today = date.today()
+        key = (self.view_year, self.view_month, today, self.selected_date)
+        if key == self.rendered_key:
+            return
+        self.rendered_key = key
+        model = calendar_month_model(
+            self.view_year,
+            self.view_month,
+            today=today,
+            selected=self.selected_date,
+            months=self.months,
+        )
         self.title_label.set_label(str(model["title"]).upper())
         self.selected_label.set_label(str(model["selected_label"]))
-        self.day_grid.children = [self.week_row(week) for week in model["weeks"]]
-
-    def week_row(self, week: list[dict[str, object]]) -> Box:
-        return Box(
-            name="calendar-week",
-            orientation="h",
-            spacing=4,
-            children=[self.day_button(day) for day in week],
-        )
-
-    def day_button(self, day: dict[str, object]) -> Button:
-        day_date = day["date"]
+        days = [day for week in model["weeks"] for day in week]
+        for index, day in enumerate(days):
+            self.day_dates[index] = day["date"]
+            text = str(day["day"])
+            if text != self.day_text[index]:
+                self.day_text[index] = text
+                self.day_labels[index].set_label(text)
+            classes = tuple(day["style_classes"])
+            if classes != self.day_classes[index]:
+                self.day_classes[index] = classes
+                self.day_buttons[index].set_style_classes(list(classes))
+
+    def day_button(self, index: int) -> Button:
         return Button(
             name="calendar-day",
-            style_classes=list(day["style_classes"]),
-            child=Label(label=str(day["day"])),
-            on_clicked=lambda *_args, target=day_date: self.select_date(target),
+            child=self.day_labels[index],
+            on_clicked=lambda *_args, target=index: self.select_cell(target),
         )
 
+    def select_cell(self, index: int) -> None:
+        target = self.day_dates[index]
+        if target is not None:
+            self.select_date(target)
+
     def select_date(self, target: date) -> None:
         self.selected_date = target
         self.view_year = target.year
@@ -2178,9 +5617,43 @@ class CalendarPopout(MonitorWindow):
         self.show_all()
 
 
+def subscribed_popout(popout, poll_hub: PollHub, subscriptions: dict[str, str]):
+    for channel, method in subscriptions.items():
+        poll_hub.subscribe(channel, getattr(popout, method))
+    return popout
+
+
+def default_popout_pool(poll_hub: PollHub) -> PopoutPool:
+    pool = PopoutPool()
+    pool.register("task-actions", TaskActionPopout)
+    pool.register("network", NetworkSettingsPopout)
+    pool.register("audio", lambda monitor: subscribed_popout(AudioDevicePopout(monitor), poll_hub, {"audio": "set_state"}))
+    pool.register(
+        "ai",
+        lambda monitor: subscribed_popout(
+            AIUsagePopout(monitor, on_provider_changed=lambda: poll_hub.refresh("ai")),
+            poll_hub,
+            {"ai_status": "on_status"},
+        ),
+    )
+    pool.register("calendar", CalendarPopout)
+    pool.register("system", lambda monitor: subscribed_popout(SystemLoadPopout(monitor), poll_hub, {"system": "set_load"}))
+    pool.register(
+        "battery",
+        lambda monitor: subscribed_popout(
+            BatteryPowerPopout(monitor),
+            poll_hub,
+            {"battery_info": "set_info", "power_profiles": "set_live_profiles"},
+        ),
+    )
+    return pool
+
+
 class StatusBar(MonitorWindow):
-    def __init__(self, monitor: MonitorGeometry):
+    def __init__(self, monitor: MonitorGeometry, poll_hub: PollHub | None = None, popouts: PopoutPool | None = None):
         self.monitor = monitor
+        self.poll_hub = poll_hub if poll_hub is not None else shared_poll_hub()
+        self.popouts = popouts if popouts is not None else default_popout_pool(self.poll_hub)
         super().__init__(
             monitor,
             title="fabric-bar",
@@ -2194,19 +5667,24 @@ class StatusBar(MonitorWindow):
             visible=False,
         )
 
-        self.popup_manager = PopupManager()
+        self.popup_manager = PopupManager(on_open=self.on_popup_opened, pool=self.popouts, monitor=monitor)
         self.hidden_for_fullscreen = False
-        self.task_action_popout = TaskActionPopout(monitor)
-        self.tasks = TaskStrip(on_task_secondary_click=self.open_task_actions)
+        self.tasks = TaskStrip(on_task_secondary_click=self.open_task_actions, scale=monitor.scale_factor)
+        self.cpu = StatusPill("CPU", "...")
+        self.memory = StatusPill("MEM", "...")
+        self.load_average = StatusPill("LOAD", "...")
+        self.system_button = Button(
+            name="system-button",
+            child=Box(orientation="h", spacing=0, children=[self.cpu, self.memory, self.load_average]),
+            on_clicked=lambda *_: self.popup_manager.toggle("system"),
+        )
         self.network = StatusPill("NET", "...")
-        self.network_popout = NetworkSettingsPopout(monitor)
         self.network_button = Button(
             name="network-button",
             child=self.network,
             on_clicked=lambda *_: self.popup_manager.toggle("network"),
         )
         self.volume = StatusPill("VOL", "...")
-        self.audio_popout = AudioDevicePopout(monitor)
         self.volume_button = EventBox(
             name="volume-button",
             events=["button-press", "scroll"],
@@ -2215,27 +5693,21 @@ class StatusBar(MonitorWindow):
         self.volume_button.connect("button-press-event", self.on_volume_button_press)
         self.volume_button.connect("scroll-event", self.on_volume_scroll)
         self.ai = StatusPill("AI", "AI")
-        self.ai_popout = AIUsagePopout(monitor, on_provider_changed=self.refresh_ai_usage)
         self.ai_button = Button(
             name="ai-button",
             child=self.ai,
             on_clicked=lambda *_: self.popup_manager.toggle("ai"),
         )
-        self.calendar_popout = CalendarPopout(monitor)
-        self.register_popup("task-actions", self.task_action_popout)
-        self.register_popup("network", self.network_popout)
-        self.register_popup("audio", self.audio_popout)
-        self.register_popup("ai", self.ai_popout)
-        self.register_popup("calendar", self.calendar_popout)
+        for name in ("task-actions", "system", "network", "audio", "ai", "calendar"):
+            self.popup_manager.register_lazy(name)
         self.dnd = StatusPill("DND", "off")
         self.dnd_button = Button(
             name="dnd-button",
             child=self.dnd,
-            on_clicked=lambda *_: self.refresh_dnd(toggle_dnd()),
+            on_clicked=lambda *_: toggle_dnd_async(lambda state: self.poll_hub.publish("dnd", state)),
         )
-        battery_initial = battery_value()
+        battery_initial = self.poll_hub.value("battery")
         self.battery = StatusPill("BAT", battery_initial) if battery_initial is not None else None
-        self.battery_popout = BatteryPowerPopout(monitor) if self.battery is not None else None
         self.battery_button = (
             Button(
                 name="battery-button",
@@ -2245,10 +5717,11 @@ class StatusBar(MonitorWindow):
             if self.battery is not None
             else None
         )
-        if self.battery_popout is not None:
-            self.register_popup("battery", self.battery_popout)
+        if self.battery is not None:
+            self.popup_manager.register_lazy("battery")
 
         end_children = [
+            self.system_button,
             self.network_button,
             self.volume_button,
             self.ai_button,
@@ -2307,47 +5780,22 @@ class StatusBar(MonitorWindow):
         self.set_default_size(monitor.width, BAR_HEIGHT)
         self.set_size_request(monitor.width, BAR_HEIGHT)
 
-        self.pollers = [
-            Fabricator(
-                interval=BAR_VISIBILITY_POLL_MS,
-                poll_from=lambda _: bar_visibility_for_monitor(self.monitor),
-                on_changed=lambda _, value: self.set_fullscreen_visibility(str(value)),
-            ),
-            Fabricator(interval=2000, poll_from=lambda _: running_tasks(), on_changed=lambda _, value: self.tasks.set_tasks(value)),
-            Fabricator(interval=10000, poll_from=lambda _: network_text(), on_changed=lambda _, value: self.network.set_value(value)),
-            Fabricator(interval=VOLUME_POLL_MS, poll_from=lambda _: volume_text(), on_changed=lambda _, value: self.volume.set_value(value)),
-            Fabricator(interval=AI_POLL_MS, poll_from=lambda _: ai_usage_text(), on_changed=lambda _, value: self.ai.set_value(value)),
-            Fabricator(interval=3000, poll_from=lambda _: dnd_text(), on_changed=lambda _, value: self.refresh_dnd(value)),
-        ]
+        self.poll_hub.subscribe(
+            "bar_visibility",
+            lambda states: self.set_fullscreen_visibility(bar_visibility_for_monitor(self.monitor, states)),
+            owner=self,
+            while_suspended=True,
+        )
+        self.poll_hub.subscribe("tasks", self.tasks.set_tasks, owner=self)
+        self.poll_hub.subscribe("cpu", self.cpu.set_value, owner=self)
+        self.poll_hub.subscribe("memory", self.memory.set_value, owner=self)
+        self.poll_hub.subscribe("load", self.load_average.set_value, owner=self)
+        self.poll_hub.subscribe("network", self.network.set_value, owner=self)
+        self.poll_hub.subscribe("volume", self.volume.set_value, owner=self)
+        self.poll_hub.subscribe("ai", self.ai.set_value, owner=self)
+        self.poll_hub.subscribe("dnd", self.refresh_dnd, owner=self)
         if self.battery is not None:
-            self.pollers.append(
-                Fabricator(interval=30000, poll_from=lambda _: battery_text(), on_changed=lambda _, value: self.battery.set_value(value))
-            )
-
-        self.tasks.set_tasks(running_tasks())
-        self.network.set_value(network_text())
-        self.volume.set_value(volume_text())
-        self.refresh_ai_usage()
-        self.refresh_dnd(dnd_text())
-        self.set_fullscreen_visibility(bar_visibility_for_monitor(self.monitor))
-
-    def windows(self) -> list[Window]:
-        windows: list[Window] = [
-            self,
-            self.task_action_popout,
-            self.network_popout,
-            self.audio_popout,
-            self.ai_popout,
-            self.calendar_popout,
-        ]
-        if self.battery_popout is not None:
-            windows.append(self.battery_popout)
-        return windows
-
-    def register_popup(self, name: str, popup: Window) -> None:
-        self.popup_manager.register(name, popup)
-        popup.connect("focus-out-event", lambda *_args, target=name: self.on_popup_focus_out(target))
-        popup.connect("key-press-event", lambda _widget, event, target=name: self.on_popup_key_press(target, event))
+            self.poll_hub.subscribe("battery", lambda value: self.battery.set_value(value or ""), owner=self)
 
     def show_all(self) -> None:
         if self.hidden_for_fullscreen:
@@ -2366,31 +5814,27 @@ class StatusBar(MonitorWindow):
         if hidden:
             self.popup_manager.close_all()
             self.hide()
+            self.poll_hub.suspend(self)
             return
 
         self.show_all()
+        self.poll_hub.resume(self)
 
-    def on_popup_focus_out(self, name: str) -> bool:
-        self.popup_manager.close(name, reason="focus-out")
-        return False
-
-    def on_popup_key_press(self, name: str, event) -> bool:
-        key_name = key_name_from_event(event)
-        if key_name == "Escape" or key_name.lower() == "escape":
-            self.popup_manager.close(name)
-            return True
-        popup = self.popup_manager.popups.get(name)
-        handle_key_press = getattr(popup, "handle_key_press", None)
-        if callable(handle_key_press):
-            return bool(handle_key_press(event))
-        return False
+    def on_popup_opened(self, name: str) -> None:
+        source = POPUP_POLL_SOURCES.get(name)
+        if source is not None:
+            self.poll_hub.boost(source)
 
-    def open_task_actions(self, task: Task, event: object) -> None:
-        self.task_action_popout.set_task(task)
-        self.task_action_popout.set_anchor_from_event(event)
+    def open_task_actions(self, group: TaskGroup, event: object) -> None:
+        popout = self.popup_manager.popup("task-actions", create=True)
+        if popout is None:
+            return
+        popout.set_task(group)
+        popout.set_anchor_from_event(event)
         self.popup_manager.open("task-actions")
 
     def on_volume_button_press(self, _widget, event) -> bool:
+        self.poll_hub.boost("volume")
         button = int(getattr(event, "button", 0))
         if button == 1:
             toggle_volume()
@@ -2401,16 +5845,14 @@ class StatusBar(MonitorWindow):
         return True
 
     def on_volume_scroll(self, _widget, event) -> bool:
+        self.poll_hub.boost("volume")
         direction = str(getattr(event, "direction", "")).lower()
         if "up" in direction:
-            change_volume(5)
+            shared_volume_controller().nudge(VOLUME_STEP_PERCENT)
         elif "down" in direction:
-            change_volume(-5)
+            shared_volume_controller().nudge(-VOLUME_STEP_PERCENT)
         return True
 
-    def refresh_ai_usage(self) -> None:
-        self.ai.set_value(ai_usage_text())
-
     def refresh_dnd(self, value: str) -> None:
         state = normalize_dnd_text(value)
         self.dnd.set_value(state)
@@ -2420,11 +5862,22 @@ class StatusBar(MonitorWindow):
 if __name__ == "__main__":
     if "--check" in sys.argv:
         raise SystemExit(run_self_check())
-
-    bars = [StatusBar(monitor) for monitor in monitor_geometries()]
-    windows = [window for bar in bars for window in bar.windows()]
-    app = Application("fabric-awesomewm", *windows)
+    if "--stats" in sys.argv:
+        raise SystemExit(run_stats_dump(as_json="--json" in sys.argv))
+    if "--bench" in sys.argv:
+        raise SystemExit(run_bench(sys.argv))
+
+    poll_hub = shared_poll_hub()
+    poll_hub.prefetch()
+    popouts = default_popout_pool(poll_hub)
+    monitors = monitor_geometries()
+    bars = [StatusBar(monitor, poll_hub, popouts) for monitor in monitors]
+    app = Application("fabric-awesomewm", *bars)
+    popouts.on_create = app.add_window
     app.set_stylesheet_from_file(get_relative_path("./style.css"))
     for bar in bars:
         bar.show_all()
+    poll_hub.start()
+    start_poll_services(poll_hub, monitors)
+    prewarm_calendar_months()
     app.run()
@@ -37,11 +37,16 @@ JSON
 PYTHONDONTWRITEBYTECODE=1 "$python_bin" - "$config_path" "$tmpdir/status.json" "$css_path" <<'PY'
 from __future__ import annotations
 
+import calendar
+import dataclasses
 import importlib.util
+import json
+import math
 import pathlib
 import re
 import sys
-from datetime import date
+import types
+from datetime import date, timedelta
 
 config_path = pathlib.Path(sys.argv[1])
 status_path = pathlib.Path(sys.argv[2])
@@ -60,8 +65,12 @@ module.AI_PROVIDER_PREF_PATH.write_text("codex\n")
 assert module.launcher_command() == ["awesome-client", "awesome.emit_signal('techdufus::launcher_root')"]
 assert module.settings_command() == ["awesome-client", "awesome.emit_signal('techdufus::launcher_settings')"]
 assert module.ai_usage_text() == "13%"
-assert module.VOLUME_POLL_MS <= 1000
-assert module.AI_POLL_MS <= 5000
+assert module.POLL_INTERVALS_MS["volume"][0] <= 1000
+assert module.POLL_INTERVALS_MS["ai"][0] <= 5000
+assert module.POLL_INTERVALS_MS["awesome"][0] <= 500
+for floor_ms, ceiling_ms in module.POLL_INTERVALS_MS.values():
+    assert floor_ms <= ceiling_ms
+assert set(module.POPUP_POLL_SOURCES.values()) <= set(module.POLL_INTERVALS_MS)
 assert module.bar_size_from_monitor_width(1920) == (1920, 37)
 assert module.bar_size_from_monitor_width(1) == (1, 37)
 fallback_monitors = module.fallback_monitor_geometries()
@@ -109,6 +118,7 @@ class DummyBar:
     def __init__(self):
         self.hidden_for_fullscreen = False
         self.popup_manager = DummyPopupManager()
+        self.poll_hub = module.PollHub(scheduler=lambda *_args: 0)
         self.hide_count = 0
         self.show_count = 0
 
@@ -125,6 +135,7 @@ assert dummy_bar.hidden_for_fullscreen is True
 assert dummy_bar.popup_manager.close_count == 1
 assert dummy_bar.hide_count == 1
 assert dummy_bar.show_count == 0
+assert dummy_bar.poll_hub.is_suspended(dummy_bar) is True
 module.StatusBar.set_fullscreen_visibility(dummy_bar, "hidden")
 assert dummy_bar.popup_manager.close_count == 1
 assert dummy_bar.hide_count == 1
@@ -134,6 +145,450 @@ assert dummy_bar.show_count == 0
 module.StatusBar.set_fullscreen_visibility(dummy_bar, "visible")
 assert dummy_bar.hidden_for_fullscreen is False
 assert dummy_bar.show_count == 1
+assert dummy_bar.poll_hub.is_suspended(dummy_bar) is False
+
+def make_fake_scheduler():
+    timers = {}
+    timer_ids = iter(range(1, 1_000_000))
+
+    def schedule(delay, callback):
+        timer_id = next(timer_ids)
+        timers[timer_id] = (delay, callback)
+        return timer_id
+
+    return timers, schedule
+
+
+hub_timers, hub_scheduler = make_fake_scheduler()
+
+
+poll_calls = []
+poll_values = ["45%", "45%", "50%"]
+hub = module.PollHub(scheduler=hub_scheduler, cancel=lambda timer_id: hub_timers.pop(timer_id, None))
+hub.add_source("volume", 1000, lambda: poll_calls.append(1) or poll_values[len(poll_calls) - 1])
+first_bar_values = []
+second_bar_values = []
+hub.subscribe("volume", first_bar_values.append)
+hub.subscribe("volume", second_bar_values.append)
+assert hub.refresh("volume") is True
+assert first_bar_values == ["45%"] and second_bar_values == ["45%"]
+assert hub.refresh("volume") is False
+assert first_bar_values == ["45%"]
+late_bar_values = []
+hub.subscribe("volume", late_bar_values.append)
+assert late_bar_values == ["45%"]
+assert hub.start() is True
+assert hub.start() is False
+assert [delay for delay, _callback in hub_timers.values()] == [1000]
+assert hub_timers[1][1]() is False
+assert len(poll_calls) == 3
+assert first_bar_values == ["45%", "50%"] and second_bar_values == ["45%", "50%"]
+assert len(hub_timers) == 2
+hub.stop()
+assert 2 not in hub_timers
+assert hub.value("volume") == "50%"
+assert hub.value("missing", "fallback") == "fallback"
+
+lifecycle_timers, lifecycle_scheduler = make_fake_scheduler()
+
+
+lifecycle_polls = {"volume": 0, "awesome": 0, "awesome_idle": 0}
+
+
+def lifecycle_volume():
+    lifecycle_polls["volume"] += 1
+    return f"{lifecycle_polls['volume']}%"
+
+
+def lifecycle_awesome():
+    lifecycle_polls["awesome"] += 1
+    return lifecycle_polls["awesome"]
+
+
+def lifecycle_visibility():
+    lifecycle_polls["awesome_idle"] += 1
+    return ["idle", lifecycle_polls["awesome_idle"]]
+
+
+lifecycle_hub = module.PollHub(scheduler=lifecycle_scheduler, cancel=lambda timer_id: lifecycle_timers.pop(timer_id, None))
+lifecycle_hub.add_source("volume", 1000, lifecycle_volume)
+lifecycle_hub.add_source(
+    "awesome",
+    500,
+    lifecycle_awesome,
+    idle_poll=lifecycle_visibility,
+    idle_channel="bar_visibility",
+)
+lifecycle_hub.add_channel("bar_visibility")
+left_bar = object()
+right_bar = object()
+left_values = []
+right_values = []
+left_visibility = []
+lifecycle_hub.subscribe("volume", left_values.append, owner=left_bar)
+lifecycle_hub.subscribe("volume", right_values.append, owner=right_bar)
+lifecycle_hub.subscribe("bar_visibility", left_visibility.append, owner=left_bar, while_suspended=True)
+assert lifecycle_hub.prefetch() == []
+lifecycle_hub.start()
+assert left_values == ["1%"] and right_values == ["1%"]
+
+lifecycle_hub.suspend(left_bar)
+assert lifecycle_hub.idle is False
+lifecycle_hub.refresh("volume")
+assert left_values == ["1%"] and right_values == ["1%", "2%"]
+
+lifecycle_hub.suspend(right_bar)
+assert lifecycle_hub.idle is True
+assert lifecycle_hub.sources["volume"].paused is True
+assert lifecycle_hub.sources["volume"].timer_id is None
+awesome_timer = lifecycle_hub.sources["awesome"].timer_id
+assert awesome_timer is not None
+lifecycle_timers[awesome_timer][1]()
+assert lifecycle_polls["awesome"] == 1
+assert lifecycle_polls["awesome_idle"] == 1
+assert left_visibility == [["idle", 1]]
+
+lifecycle_hub.resume(left_bar)
+assert lifecycle_hub.idle is False
+assert lifecycle_hub.sources["volume"].paused is False
+assert lifecycle_hub.sources["volume"].timer_id is not None
+assert lifecycle_polls["volume"] == 3
+assert lifecycle_polls["awesome"] == 2
+assert left_values == ["1%", "3%"]
+assert right_values == ["1%", "2%"]
+lifecycle_hub.resume(right_bar)
+assert right_values == ["1%", "2%", "3%"]
+lifecycle_hub.stop()
+
+adaptive_timers, adaptive_scheduler = make_fake_scheduler()
+
+
+def run_adaptive_tick(source):
+    delay, callback = adaptive_timers.pop(source.timer_id)
+    callback()
+    return delay
+
+
+adaptive_values = ["50%"] * 8 + ["55%"]
+adaptive_hub = module.PollHub(scheduler=adaptive_scheduler, cancel=lambda timer_id: adaptive_timers.pop(timer_id, None))
+adaptive_source = adaptive_hub.add_source("volume", (1000, 4000), lambda: adaptive_values.pop(0))
+adaptive_hub.refresh("volume")
+adaptive_hub.start()
+adaptive_delays = [run_adaptive_tick(adaptive_source) for _ in range(6)]
+assert adaptive_delays == [1000, 1500, 2250, 3375, 4000, 4000]
+assert adaptive_source.changes == 0
+assert adaptive_source.polls == 6
+adaptive_hub.boost("volume")
+assert adaptive_timers[adaptive_source.timer_id][0] == 1000
+assert run_adaptive_tick(adaptive_source) == 1000
+assert run_adaptive_tick(adaptive_source) == 1500
+assert adaptive_source.changes == 1
+assert adaptive_timers[adaptive_source.timer_id][0] == 1000
+adaptive_hub.stop()
+
+boost_clock = [0.0]
+boost_timers, boost_scheduler = make_fake_scheduler()
+boost_polls = []
+boost_hub = module.PollHub(scheduler=boost_scheduler, cancel=lambda timer_id: boost_timers.pop(timer_id, None), clock=lambda: boost_clock[0])
+boost_source = boost_hub.add_source("awesome", (500, 2000), lambda: boost_polls.append(round(boost_clock[0], 1)) or "same")
+boost_hub.start()
+for _ in range(20):
+    boost_clock[0] += 0.1
+    boost_hub.boost("awesome")
+    if boost_clock[0] + 1e-9 >= boost_source.due_at:
+        boost_timers.pop(boost_source.timer_id)[1]()
+assert boost_polls == [0.5, 1.0, 1.6]
+assert len(boost_timers) == 1
+boost_source.interval = 2000
+boost_hub.unschedule(boost_source)
+boost_hub.schedule(boost_source)
+slow_timer = boost_source.timer_id
+boost_hub.boost("awesome")
+assert boost_source.timer_id != slow_timer
+assert boost_timers[boost_source.timer_id][0] == 500
+rescheduled_timer = boost_source.timer_id
+boost_hub.boost("awesome")
+assert boost_source.timer_id == rescheduled_timer
+boost_hub.stop()
+
+boosted_sources = []
+boost_bar = type("BoostBar", (), {})()
+boost_bar.poll_hub = type("BoostHub", (), {"boost": lambda _self, name: boosted_sources.append(name)})()
+module.StatusBar.on_popup_opened(boost_bar, "audio")
+module.StatusBar.on_popup_opened(boost_bar, "calendar")
+assert boosted_sources == ["volume"]
+
+assert module.awesome_reply_text(("on",)) == "on"
+assert module.awesome_reply_text((True,)) == "true"
+assert module.awesome_reply_text((3.0, "x")) == "3\nx"
+assert module.awesome_reply_text(None) == ""
+
+
+class FakeBusConnection:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+
+bus_connections = []
+eval_calls = []
+
+
+def fake_bus_factory():
+    connection = FakeBusConnection()
+    bus_connections.append(connection)
+    return connection
+
+
+def fake_awesome_invoke(connection, script, timeout_ms, on_done=None):
+    eval_calls.append((script, timeout_ms))
+    if on_done is not None:
+        if script == "error":
+            on_done(None, RuntimeError("no reply"))
+        else:
+            on_done((f"async {script}",), None)
+        return None
+    if script == "restart" and len(bus_connections) == 1:
+        connection.closed = True
+        raise RuntimeError("connection closed")
+    if script == "error":
+        raise RuntimeError("no reply")
+    return (f"echo {script}",)
+
+
+bridge = module.AwesomeBridge(timeout_ms=250, bus_factory=fake_bus_factory, invoke=fake_awesome_invoke)
+assert bridge.eval("one") == "echo one"
+assert bridge.eval("two") == "echo two"
+assert len(bus_connections) == 1
+assert eval_calls[-1] == ("two", 250)
+assert bridge.eval("error", "fallback") == "fallback"
+assert len(bus_connections) == 1
+assert bridge.eval("restart", "fallback") == "echo restart"
+assert len(bus_connections) == 2
+async_replies = []
+assert bridge.eval_async("three", async_replies.append) is True
+assert bridge.eval_async("error", async_replies.append, "fallback") is True
+assert async_replies == ["async three", "fallback"]
+
+
+def failing_bus_factory():
+    raise RuntimeError("no session bus")
+
+
+offline_bridge = module.AwesomeBridge(bus_factory=failing_bus_factory, invoke=fake_awesome_invoke)
+assert offline_bridge.available() is False
+assert offline_bridge.eval("one", "off") == "off"
+assert offline_bridge.eval_async("one", async_replies.append) is False
+
+pending_commands = []
+
+
+def fake_spawn(command, on_done, timeout_ms):
+    pending_commands.append((command, on_done, timeout_ms))
+
+
+runner = module.AsyncCommandRunner(timeout_ms=300, spawn=fake_spawn)
+runner_results = []
+assert runner.run("volume", ["pactl"], runner_results.append, "vol") is True
+assert runner.busy("volume") is True
+joined_results = []
+assert runner.run("volume", ["pactl"], joined_results.append, "vol") is False
+assert len(pending_commands) == 1
+assert pending_commands[0][0] == ["pactl"] and pending_commands[0][2] == 300
+pending_commands.pop(0)[1](" 45% \n")
+assert runner_results == ["45%"]
+assert joined_results == ["45%"]
+assert runner.busy("volume") is False
+assert runner.waiters == {}
+runner.run("volume", ["pactl"], runner_results.append, "vol")
+runner.run("volume", ["pactl"], joined_results.append, "muted")
+pending_commands.pop(0)[1](None)
+assert runner_results == ["45%", "vol"]
+assert joined_results == ["45%", "muted"]
+
+
+def exploding_spawn(command, on_done, timeout_ms):
+    raise RuntimeError("missing binary")
+
+
+missing_runner = module.AsyncCommandRunner(spawn=exploding_spawn)
+assert missing_runner.run("network", ["ip"], runner_results.append, "") is True
+assert runner_results[-1] == ""
+assert missing_runner.busy("network") is False
+
+stats_now = [10.0]
+bar_stats = module.BarStats(capacity=4, clock=lambda: stats_now[0])
+for elapsed in (0.001, 0.002, 0.003, 0.004, 0.010):
+    started = stats_now[0]
+    stats_now[0] += elapsed
+    bar_stats.record("command:pactl", started, subprocess=True)
+pactl_stats = bar_stats.sources["command:pactl"]
+assert pactl_stats.calls == 5 and pactl_stats.subprocesses == 5
+assert pactl_stats.filled == 4
+assert [round(value, 3) for value in pactl_stats.latencies()] == [2.0, 3.0, 4.0, 10.0]
+assert module.percentile([], 50) == 0.0
+assert module.percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+assert module.percentile([1.0, 2.0, 3.0, 4.0], 99) == 4.0
+bar_stats.changed("poll:volume")
+stats_now[0] += 2.0
+stats_snapshot = bar_stats.snapshot()
+assert stats_snapshot["uptime_s"] == 2.02
+assert stats_snapshot["sources"]["command:pactl"]["p50_ms"] == 3.0
+assert stats_snapshot["sources"]["command:pactl"]["p99_ms"] == 10.0
+assert stats_snapshot["sources"]["command:pactl"]["since_change_s"] is None
+assert stats_snapshot["sources"]["poll:volume"]["since_change_s"] == 2.0
+assert stats_snapshot["sources"]["poll:volume"]["calls"] == 0
+assert "command:pactl" in module.format_bar_stats(stats_snapshot)
+assert module.StatsService(stats=bar_stats, bus_factory=lambda: None).stats_json().startswith('{"sources"')
+
+counted_stats = module.BarStats(clock=lambda: stats_now[0])
+counted_runner = module.AsyncCommandRunner(spawn=fake_spawn, stats=counted_stats)
+counted_runner.run("volume", ["pactl"], runner_results.append, "vol")
+pending_commands.pop(0)[1]("40%")
+assert counted_stats.sources["command:volume"].subprocesses == 1
+counted_hub = module.PollHub(scheduler=lambda *_args: None, stats=counted_stats)
+counted_hub.add_source("network", 1000, lambda: "LAN")
+counted_hub.subscribe("network", lambda _value: None)
+counted_hub.tick("network")
+counted_hub.tick("network")
+assert counted_stats.sources["poll:network"].calls == 2
+assert counted_stats.sources["poll:network"].changes == 1
+assert counted_stats.sources["render:network"].calls == 1
+
+async_timers, async_scheduler = make_fake_scheduler()
+
+
+async_requests = []
+async_hub = module.PollHub(scheduler=async_scheduler, cancel=lambda timer_id: async_timers.pop(timer_id, None))
+async_source = async_hub.add_source("network", 1000, lambda: "LAN", poll_async=async_requests.append)
+async_values = []
+async_hub.subscribe("network", async_values.append)
+async_hub.start()
+async_timers.pop(async_source.timer_id)[1]()
+assert async_source.in_flight is True
+assert async_source.timer_id is None
+assert len(async_requests) == 1
+async_hub.poll_now("network")
+assert len(async_requests) == 1
+async_requests.pop(0)("WIFI")
+assert async_values == ["WIFI"]
+assert async_source.in_flight is False
+assert async_timers[async_source.timer_id][0] == 1000
+async_timers.pop(async_source.timer_id)[1]()
+async_hub.publish("network", "VPN")
+async_requests.pop(0)("WIFI")
+assert async_values == ["WIFI", "VPN"]
+assert async_source.dropped == 1
+assert async_source.timer_id is not None
+async_hub.stop()
+
+prefetch_requests = []
+prefetch_calls = []
+prefetch_hub = module.PollHub(scheduler=async_scheduler, cancel=lambda timer_id: async_timers.pop(timer_id, None))
+prefetch_hub.add_source("network", 1000, lambda: prefetch_calls.append("network") or "LAN")
+prefetch_hub.add_source("volume", 1000, lambda: "50%", poll_async=prefetch_requests.append)
+prefetch_hub.add_channel("tasks")
+assert prefetch_hub.prefetch() == ["volume"]
+assert prefetch_hub.prefetch() == ["volume"]
+assert len(prefetch_requests) == 1
+assert prefetch_calls == ["network", "network"]
+assert prefetch_hub.value("network") == "LAN"
+assert prefetch_hub.sources["volume"].timer_id is None
+prefetch_values = []
+prefetch_hub.subscribe("volume", prefetch_values.append)
+assert prefetch_values == []
+prefetch_requests.pop(0)("55%")
+assert prefetch_values == ["55%"]
+assert prefetch_hub.sources["volume"].in_flight is False
+
+assert sorted(module.default_poll_hub(scheduler=hub_scheduler).sources) == [
+    "ai",
+    "ai_status",
+    "audio",
+    "awesome",
+    "bar_visibility",
+    "battery",
+    "battery_info",
+    "cpu",
+    "dnd",
+    "load",
+    "memory",
+    "network",
+    "power_profiles",
+    "system",
+    "tasks",
+    "volume",
+]
+
+proc_files = {
+    "/proc/stat": "cpu  100 0 100 800 0 0 0 0 0 0\ncpu0 100 0 100 800 0 0 0 0 0 0\n",
+    "/proc/meminfo": "MemTotal:       16000000 kB\nMemFree:         2000000 kB\nMemAvailable:    4000000 kB\n",
+    "/proc/loadavg": "0.52 0.40 0.30 1/123 4567\n",
+}
+proc_order = list(proc_files)
+proc_reads = []
+
+
+def fake_proc_read(fd, size, offset):
+    proc_reads.append((fd, size, offset))
+    return proc_files[proc_order[fd]].encode()
+
+
+system_clock = [10.0]
+system_sampler = module.SystemSampler(
+    capacity=4,
+    paths=tuple(pathlib.Path(path) for path in proc_order),
+    opener=lambda path, _flags: proc_order.index(path),
+    reader=fake_proc_read,
+    clock=lambda: system_clock[0],
+)
+assert system_sampler.sample() == module.SystemLoad(cpu=None, memory=75.0, load=0.52)
+assert module.system_load_texts(system_sampler.latest) == ("--", "75%", "0.52")
+assert module.system_load_texts(None) == ("--", "--", "--")
+proc_files["/proc/stat"] = "cpu  150 0 150 900 0 0 0 0 0 0\n"
+system_clock[0] = 11.0
+assert system_sampler.sample().cpu == 50.0
+assert module.system_load_texts(system_sampler.latest)[0] == "50%"
+assert system_sampler.fds == [0, 1, 2]
+assert {(size, offset) for _fd, size, offset in proc_reads} == {(module.PROC_READ_BYTES, 0)}
+cpu_history = system_sampler.history("cpu")
+assert all(math.isnan(value) for value in cpu_history[:3])
+assert cpu_history[3:] == [50.0]
+assert [round(value, 2) for value in system_sampler.history("load")][2:] == [0.52, 0.52]
+for _ in range(3):
+    system_clock[0] += 1
+    system_sampler.sample()
+assert system_sampler.history("cpu") == [50.0, 0.0, 0.0, 0.0]
+assert [round(value, 2) for value in system_sampler.history("load")] == [0.52] * 4
+system_clock[0] += 2
+system_sampler.sample()
+paused_history = system_sampler.history("cpu")
+assert paused_history[0] == 0.0 and math.isnan(paused_history[2]) and paused_history[3] == 0.0
+system_clock[0] += 30
+assert all(math.isnan(value) for value in system_sampler.history("memory"))
+assert system_sampler.cpu.typecode == "f" and len(system_sampler.cpu) == 4
+assert module.sparkline_text([1.0, math.nan, math.nan, 2.0], 4, ceiling=2.0, hold=False) == module.SPARKLINE_BLOCKS[4] + "  " + module.SPARKLINE_BLOCKS[7]
+assert module.sparkline_text([1.0, math.nan, 2.0], 3, ceiling=2.0)[1] == module.SPARKLINE_BLOCKS[4]
+assert module.sparkline_text([1.0, 2.0], 2, ceiling=2.0) == module.SPARKLINE_BLOCKS[4] + module.SPARKLINE_BLOCKS[7]
+missing_proc = status_path.parent / "missing-proc"
+assert module.SystemSampler(paths=(missing_proc, missing_proc, missing_proc)).sample() is None
+if module.PROC_STAT_PATH.exists():
+    live_sampler = module.SystemSampler()
+    assert live_sampler.sample() is not None
+    assert live_sampler.sample() is not None
+    live_sampler.close()
+    assert live_sampler.fds is None
+
+system_hub = module.default_poll_hub(scheduler=hub_scheduler, system=system_sampler)
+assert system_hub.refresh("system") is True
+assert (system_hub.value("cpu"), system_hub.value("memory"), system_hub.value("load")) == ("0%", "75%", "0.52")
+assert system_hub.sources["system"].floor_ms == system_hub.sources["system"].ceiling_ms == 1000
+system_sampler.fds = None
+assert module.POPUP_POLL_SOURCES["system"] == "system"
+assert 'pool.register("system"' in config_source
+assert 'StatusPill("CPU"' in config_source
 
 
 ai_summary = module.ai_summary_from_status(
@@ -280,6 +735,104 @@ assert module.ai_usage_text() == "--"
 module.AI_PROVIDER_PREF_PATH.write_text("codex\n")
 assert module.ai_usage_text() == "13%"
 
+ai_clock = [1778691912.0]
+ai_changes = []
+ai_store = module.AIStatusStore(on_change=ai_changes.append, clock=lambda: ai_clock[0])
+assert ai_store.watching() is False
+assert ai_store.compact_text() == "13%"
+assert ai_store.snapshot.provider == "codex"
+assert ai_store.snapshot.version == 1
+assert ai_store.loads == 1
+assert ai_store.load() is False
+first_dashboard = ai_store.dashboard_model()
+assert first_dashboard is ai_store.dashboard_model()
+assert first_dashboard == module.ai_dashboard_model(ai_store.snapshot.data, "codex", now_epoch=ai_clock[0])
+ai_clock[0] += 60
+assert ai_store.dashboard_model() is not first_dashboard
+assert ai_store.dashboard_model("claude")["active_provider"] == "claude"
+assert len(ai_store.dashboards) == 2
+assert ai_store.compact_text("claude") == "--"
+ai_store.monitor = object()
+module.AI_PROVIDER_PREF_PATH.write_text("claude\n")
+assert ai_store.compact_text() == "13%"
+
+
+class FakeMonitorEvent:
+    def __init__(self, value_nick):
+        self.value_nick = value_nick
+
+
+class FakeGioFile:
+    def __init__(self, name):
+        self.name = name
+
+    def get_basename(self):
+        return self.name
+
+
+ai_store.on_monitor_event(None, FakeGioFile("provider.txt"), None, FakeMonitorEvent("changed"))
+assert len(ai_changes) == 1
+ai_store.on_monitor_event(None, FakeGioFile("other.json"), None, FakeMonitorEvent("changes-done-hint"))
+assert len(ai_changes) == 1
+ai_store.on_monitor_event(None, FakeGioFile("provider.txt"), None, FakeMonitorEvent("changes-done-hint"))
+assert len(ai_changes) == 2
+assert ai_store.snapshot.provider == "claude"
+assert ai_store.loads == 1
+assert ai_store.compact_text() == "--"
+
+ai_hub = module.default_poll_hub(scheduler=lambda *_args: 0, ai=ai_store)
+assert ai_hub.sources["ai"].poll is None
+assert ai_hub.value("ai") == "--"
+module.AI_PROVIDER_PREF_PATH.write_text("codex\n")
+ai_store.on_monitor_event(None, FakeGioFile(".provider.tmp"), FakeGioFile("provider.txt"), FakeMonitorEvent("renamed"))
+assert ai_hub.value("ai") == "13%"
+assert ai_hub.value("ai_status") is ai_store.snapshot
+
+assert module.ai_history_samples(ai_store.snapshot.data) == {"codex.session": 13.0}
+assert len(set(module.AI_HISTORY_SERIES)) == len(module.AI_HISTORY_SERIES)
+history_path = status_path.parent / "history.bin"
+history = module.AIUsageHistory(history_path, slots=120, series=("codex.session", "claude.five_hour"))
+history_base = 29644865 * 60.0
+for minute in range(60):
+    assert history.record(history_base + minute * 60 + 7, {"codex.session": 10 + minute * 0.5, "unknown": 1.0})
+assert history_path.stat().st_size == history.size()
+history_now = history_base + 59 * 60
+history_window = history.window("codex.session", history_now, 60)
+assert len(history_window) == 60
+assert (history_window[0], history_window[-1]) == (10.0, 39.5)
+assert math.isnan(history.window("claude.five_hour", history_now, 1)[0])
+assert history.window("missing", history_now, 60) == []
+assert history.burn_rate("codex.session", history_now) == 30.0
+blocks = module.SPARKLINE_BLOCKS
+assert history.sparkline("codex.session", history_now, minutes=60, width=6) == "".join(blocks[level] for level in (1, 1, 2, 2, 2, 3))
+assert history.sparkline("codex.session", history_now, minutes=120, width=4) == "  " + blocks[2] + blocks[3]
+assert history.sparkline("claude.five_hour", history_now) == ""
+assert module.ai_burn_text(40.0, 30.0, None, history_now) == "+30.0%/h, full in 2h 00m"
+assert module.ai_burn_text(40.0, 30.0, history_now + 3600, history_now) == "+30.0%/h, ~70% at reset"
+assert module.ai_burn_text(40.0, None, None, history_now) == ""
+history.record(history_base + 60 * 60, {"codex.session": 2.0})
+assert history.burn_rate("codex.session", history_base + 60 * 60) is None
+history.record(history_base + 130 * 60, {"codex.session": 5.0})
+assert math.isnan(history.window("codex.session", history_now, 60)[10])
+history.close()
+reopened = module.AIUsageHistory(history_path, slots=120, series=("codex.session", "claude.five_hour"))
+assert reopened.window("codex.session", history_now, 60)[-1] == 39.5
+reopened.close()
+reshaped = module.AIUsageHistory(history_path, slots=60, series=("codex.session",))
+assert all(math.isnan(value) for value in reshaped.window("codex.session", history_now, 60))
+assert history_path.stat().st_size == reshaped.size()
+reshaped.close()
+
+history_store = module.AIStatusStore(
+    clock=lambda: ai_clock[0],
+    history=module.AIUsageHistory(status_path.parent / "store-history.bin", slots=120),
+)
+history_rows = history_store.dashboard_model("codex")["rows"]
+assert history_rows[0]["sparkline"].endswith(module.SPARKLINE_BLOCKS[1])
+assert history_rows[0]["burn_text"] == ""
+history_store.stop()
+assert history_store.history.map is None
+
 awesome_stdout = '''   string "fabric\tConfig.py\tfalse\t41943040\tfalse
 Family - HomeLab - 1Password\t1Password\tfalse\t41943041\tfalse
 tmux\tcom.mitchellh.ghostty\tfalse\t41943042\ttrue
@@ -288,105 +841,274 @@ Untitled - Chromium\tChromium-browser\tfalse\t41943044\tfalse
 /home/techdufus/.config/fabric/awesomewm/config.py\tpython3\tfalse\t41943045\tfalse"'''
 tasks = module.parse_awesome_clients(awesome_stdout)
 assert tasks == [
-    {
-        "title": "Family - HomeLab - 1Password",
-        "label": "1Password",
-        "class_name": "1Password",
-        "minimized": False,
-        "window_id": "41943041",
-        "focused": False,
-    },
-    {
-        "title": "tmux",
-        "label": "Ghostty",
-        "class_name": "com.mitchellh.ghostty",
-        "minimized": False,
-        "window_id": "41943042",
-        "focused": True,
-    },
-    {
-        "title": "tmux",
-        "label": "Ghostty",
-        "class_name": "com.mitchellh.ghostty",
-        "minimized": True,
-        "window_id": "41943043",
-        "focused": False,
-    },
-    {
-        "title": "Untitled - Chromium",
-        "label": "Chromium",
-        "class_name": "Chromium-browser",
-        "minimized": False,
-        "window_id": "41943044",
-        "focused": False,
-    },
+    module.Task(
+        title="Family - HomeLab - 1Password",
+        label="1Password",
+        class_name="1Password",
+        minimized=False,
+        window_id="41943041",
+        focused=False,
+    ),
+    module.Task(
+        title="tmux",
+        label="Ghostty",
+        class_name="com.mitchellh.ghostty",
+        minimized=False,
+        window_id="41943042",
+        focused=True,
+    ),
+    module.Task(
+        title="tmux",
+        label="Ghostty",
+        class_name="com.mitchellh.ghostty",
+        minimized=True,
+        window_id="41943043",
+        focused=False,
+    ),
+    module.Task(
+        title="Untitled - Chromium",
+        label="Chromium",
+        class_name="Chromium-browser",
+        minimized=False,
+        window_id="41943044",
+        focused=False,
+    ),
 ]
 assert module.task_button_labels(tasks) == ["1Password", "Ghostty", "Ghostty 2", "Chromium"]
+
+for signal_name in ('"manage"', '"unmanage"', '"property::name"', '"property::minimized"', '"focus"', '"unfocus"'):
+    assert f"client.connect_signal({signal_name}" in module.AWESOME_TASK_EVENTS_LUA
+assert module.FABRIC_DBUS_INTERFACE in module.AWESOME_TASK_EVENTS_LUA
+assert "fabric_task_events_installed" in module.AWESOME_SNAPSHOT_LUA
+assert "pcall(require, \"notifications\")" in module.AWESOME_SNAPSHOT_LUA
+
+snapshot_stdout = (
+    'string "{\"clients\":['
+    '[\"a\\u0009b\\u000ac\",\"Chromium-browser\",false,\"41943044\",true],'
+    '[\"Fabric\",\"fabric-awesomewm\",false,\"11\",false]'
+    '],\"screens\":[[0,0,1920,1080,true],[1920,0,2560,1440,false],[0,0,0,0,false]],'
+    '\"dnd\":true,\"hooked\":false}"'
+)
+snapshot = module.parse_awesome_snapshot(snapshot_stdout)
+assert snapshot is not None
+assert snapshot.tasks == [
+    module.Task(
+        title="a\tb\nc",
+        label="Chromium",
+        class_name="Chromium-browser",
+        minimized=False,
+        window_id="41943044",
+        focused=True,
+    )
+]
+assert snapshot.screens == bar_states
+assert snapshot.dnd == "on"
+assert snapshot.hooked is False
+assert module.parse_awesome_snapshot("not parseable") is None
+assert module.parse_awesome_snapshot('string "[]"') is None
+
+snapshot_hub = module.PollHub(scheduler=lambda *_args: 0)
+for channel in ("bar_visibility", "tasks", "dnd"):
+    snapshot_hub.add_channel(channel)
+snapshot_hooks = []
+snapshot_events = module.AwesomeTaskEvents()
+snapshot_events.install_hook = lambda: snapshot_hooks.append(True) or True
+module.publish_awesome_snapshot(snapshot_hub, snapshot, snapshot_events)
+assert snapshot_hub.value("tasks") == snapshot.tasks
+assert snapshot_hub.value("bar_visibility") == bar_states
+assert snapshot_hub.value("dnd") == "on"
+assert snapshot_events.model.tasks() == snapshot.tasks
+assert snapshot_hooks == [True]
+module.publish_awesome_snapshot(snapshot_hub, None, snapshot_events)
+assert snapshot_hub.value("dnd") == "on"
+assert snapshot_hub.refresh("dnd") is False
+
+assert module.AWESOME_SNAPSHOT_LUA.startswith("local include_clients = true\n")
+assert module.AWESOME_STATE_LUA.startswith("local include_clients = not fabric_task_events_installed\n")
+state_snapshot = module.parse_awesome_snapshot('string "{\"screens\":[[0,0,1920,1080,false]],\"dnd\":false,\"hooked\":true}"')
+assert state_snapshot.tasks is None
+assert state_snapshot.hooked is True
+module.publish_awesome_snapshot(snapshot_hub, state_snapshot, snapshot_events)
+assert snapshot_hub.value("tasks") == snapshot.tasks
+assert snapshot_hub.value("dnd") == "off"
+assert snapshot_events.model.tasks() == snapshot.tasks
+assert snapshot_hooks == [True]
+
+hook_evals = []
+original_awesome_eval_async = module.awesome_eval_async
+module.awesome_eval_async = lambda key, script, callback, fallback="": hook_evals.append((key, script, callback)) or True
+hook_events = module.AwesomeTaskEvents()
+hook_events.reconcile(snapshot.tasks, False)
+hook_events.reconcile(snapshot.tasks, False)
+assert [(key, script) for key, script, _callback in hook_evals] == [("awesome-task-hook", module.AWESOME_TASK_EVENTS_LUA)]
+hook_evals.pop()[2]("installed")
+assert hook_events.installing is False
+hook_events.reconcile(snapshot.tasks, True)
+assert hook_evals == []
+dnd_states = []
+assert module.toggle_dnd_async(dnd_states.append) is True
+assert hook_evals[0][0] == "dnd-toggle" and "dnd.toggle()" in hook_evals[0][1]
+assert dnd_states == []
+hook_evals.pop()[2]('string "on"')
+assert dnd_states == ["on"]
+module.awesome_eval_async = original_awesome_eval_async
+
+hooked_hub = module.default_poll_hub(scheduler=lambda *_args: 0, task_events=snapshot_events)
+assert hooked_hub.sources["awesome"].poll is module.awesome_state_snapshot
+assert hooked_hub.sources["awesome"].poll_async is module.awesome_state_snapshot_async
+assert hooked_hub.sources["awesome_tasks"].poll is module.awesome_snapshot
+assert hooked_hub.sources["awesome_tasks"].floor_ms == module.POLL_INTERVALS_MS["awesome_tasks"][0]
+hooked_hub.publish("awesome_tasks", snapshot)
+assert hooked_hub.value("tasks") == snapshot.tasks
+hooked_hub.publish("awesome", state_snapshot)
+assert hooked_hub.value("tasks") == snapshot.tasks
+assert hooked_hub.value("bar_visibility") == state_snapshot.screens
+assert "awesome_tasks" not in module.default_poll_hub(scheduler=lambda *_args: 0).sources
+assert module.default_poll_hub(scheduler=lambda *_args: 0).sources["awesome"].poll is module.awesome_snapshot
+
+task_event_updates = []
+task_events = module.AwesomeTaskEvents(on_tasks=task_event_updates.append)
+task_events.model.reset(tasks)
+assert task_events.handle_event("update", "41943041", "Family - HomeLab - 1Password", "1Password", False, False) is False
+assert task_event_updates == []
+assert task_events.handle_event("focus", "41943044", "Untitled - Chromium", "Chromium-browser", False, True) is True
+assert [task.window_id for task in task_event_updates[-1] if task.focused] == ["41943044"]
+assert task_events.handle_event("manage", "41943050", "notes", "Obsidian", False, False) is True
+assert task_event_updates[-1][-1].label == "notes"
+assert task_events.handle_event("update", "41943050", "notes", "Obsidian", True, False) is True
+assert task_event_updates[-1][-1].minimized is True
+assert task_events.handle_event("unmanage", "41943050", "", "", False, False) is True
+assert [task.window_id for task in task_event_updates[-1]] == ["41943041", "41943042", "41943043", "41943044"]
+assert task_events.handle_event("manage", "41943051", "Fabric", "fabric-awesomewm", False, False) is False
+assert task_events.handle_event("manage", "abc", "x", "y", False, False) is False
+assert len(task_event_updates) == 4
 assert module.tasks_text(tasks) == "1Password  Ghostty  Ghostty 2  Chromium"
 assert module.parse_awesome_clients('string "Fabric\tfabric-awesomewm\tfalse\t11\tfalse"') == []
 
-grouped = module.group_tasks_for_dock(tasks, max_icons=3)
+dock = module.group_tasks_for_dock(tasks, max_icons=3)
+grouped = list(dock.groups)
 assert grouped == [
-    {
-        "label": "1Password",
-        "class_name": "1Password",
-        "window_ids": ["41943041"],
-        "windows": [
-            {
-                "title": "Family - HomeLab - 1Password",
-                "label": "1Password",
-                "window_id": "41943041",
-                "focused": False,
-                "minimized": False,
-            }
-        ],
-        "count": 1,
-        "focused": False,
-    },
-    {
-        "label": "Ghostty",
-        "class_name": "com.mitchellh.ghostty",
-        "window_ids": ["41943042", "41943043"],
-        "windows": [
-            {"title": "tmux", "label": "Ghostty", "window_id": "41943042", "focused": True, "minimized": False},
-            {"title": "tmux", "label": "Ghostty", "window_id": "41943043", "focused": False, "minimized": True},
-        ],
-        "count": 2,
-        "focused": True,
-    },
-    {
-        "label": "Chromium",
-        "class_name": "Chromium-browser",
-        "window_ids": ["41943044"],
-        "windows": [
-            {
-                "title": "Untitled - Chromium",
-                "label": "Chromium",
-                "window_id": "41943044",
-                "focused": False,
-                "minimized": False,
-            }
-        ],
-        "count": 1,
-        "focused": False,
-    },
+    module.TaskGroup(label="1Password", class_name="1Password", windows=(tasks[0],), focused=False),
+    module.TaskGroup(label="Ghostty", class_name="com.mitchellh.ghostty", windows=(tasks[1], tasks[2]), focused=True),
+    module.TaskGroup(label="Chromium", class_name="Chromium-browser", windows=(tasks[3],), focused=False),
 ]
-assert module.overflow_count_for_tasks(tasks, max_icons=2) == 1
+assert dock.overflow == 0
+assert grouped[1].count == 2
+assert grouped[1].window_ids == ["41943042", "41943043"]
+narrow_dock = module.group_tasks_for_dock(tasks + [tasks[3]], max_icons=2)
+assert [group.label for group in narrow_dock.groups] == ["1Password", "Ghostty"]
+assert narrow_dock.overflow == 1
+assert module.group_tasks_for_dock(list(tasks), max_icons=3).digest == dock.digest
+assert module.group_tasks_for_dock(tasks[:3], max_icons=3).digest != dock.digest
+refocused_tasks = [dataclasses.replace(task, focused=task.window_id == "41943044") for task in tasks]
+assert module.group_tasks_for_dock(refocused_tasks, max_icons=3).digest != dock.digest
+assert module.group_tasks_for_dock([]) == module.DockGroups(groups=(), overflow=0, digest=module.group_tasks_for_dock([]).digest)
+assert [module.task_group_key(group) for group in grouped] == ["1password", "com.mitchellh.ghostty", "chromium-browser"]
+assert module.task_group_key(module.Task("", "Scratch", "", False, "1", False)) == "scratch"
+assert module.task_button_state(grouped[1]) == ("G", 2, True, "com.mitchellh.ghostty")
+refocused = dataclasses.replace(grouped[1], focused=False)
+assert module.task_button_state(refocused) == ("G", 2, False, "com.mitchellh.ghostty")
+assert module.task_button_state(module.TaskGroup("", "", (), False)) == ("A", 0, False, "App")
+assert not hasattr(tasks[0], "__dict__")
 assert module.valid_window_id("41943041") == "41943041"
 assert module.valid_window_id("abc") is None
 assert module.valid_window_ids(["41943041", "abc", "41943042", "41943041"]) == ["41943041", "41943042"]
-focus_lua = module.awesome_focus_window_lua("41943041")
-assert focus_lua is not None
-assert "request::activate" in focus_lua
-assert "c:kill()" not in focus_lua
-close_lua = module.awesome_close_windows_lua(["41943041", "abc", "41943042"])
-assert close_lua is not None
-assert "[41943041]=true" in close_lua
-assert "[41943042]=true" in close_lua
-assert "abc" not in close_lua
-assert "c:kill()" in close_lua
-assert module.awesome_close_windows_lua(["abc"]) is None
+batch_ops, batch_plans = module.plan_awesome_actions(
+    [
+        ("focus", ["41943040"], None),
+        ("close", ["41943041", "41943042"], None),
+        ("focus", ["41943041"], None),
+        ("close", ["41943042"], None),
+        ("menu", [], None),
+        ("menu", [], None),
+    ]
+)
+assert batch_ops == [("kill", "41943041"), ("kill", "41943042"), ("focus", "41943040"), ("menu", None)]
+assert batch_plans == [[2], [0, 1], [], [1], [3], [3]]
+batch_lua = module.awesome_action_batch_lua(batch_ops)
+assert batch_lua.count("client.get()") == 1
+assert batch_lua.count("c:kill()") == 2
+assert "by_window[41943041]" in batch_lua
+assert "request::activate" in batch_lua
+assert "menu.client_list" in batch_lua
+assert module.awesome_action_results('string "101"', 4) == [True, False, True, False]
+
+batch_runs = []
+batch_timers = []
+batch_results = []
+batch_failures = []
+action_queue = module.AwesomeActionQueue(
+    run=lambda script, callback: batch_runs.append((script, callback)) or True,
+    scheduler=lambda delay, callback: batch_timers.append((delay, callback)) or len(batch_timers),
+)
+action_queue.on_failure = lambda: batch_failures.append(True)
+assert action_queue.push("close", ["abc"]) is False
+assert action_queue.push("close", ["41943041"], lambda ok: batch_results.append(("close-1", ok))) is True
+assert action_queue.push("close", ["41943042"], lambda ok: batch_results.append(("close-2", ok))) is True
+assert action_queue.push("focus", ["41943040"], lambda ok: batch_results.append(("focus", ok))) is True
+assert len(batch_timers) == 1 and batch_timers[0][0] == module.AWESOME_ACTION_BATCH_MS
+batch_timers.pop(0)[1]()
+assert len(batch_runs) == 1
+assert batch_runs[0][0].count("c:kill()") == 2
+action_queue.push("menu", (), lambda ok: batch_results.append(("menu", ok)))
+assert batch_timers == []
+batch_runs.pop(0)[1]("110")
+assert batch_results == [("close-1", True), ("close-2", True), ("focus", False)]
+assert batch_failures == [True]
+assert len(batch_timers) == 1
+batch_timers.pop(0)[1]()
+batch_runs.pop(0)[1]("1")
+assert batch_results[-1] == ("menu", True)
+assert action_queue.batches == 2
+failed_queue = module.AwesomeActionQueue(run=lambda _script, _callback: False, scheduler=lambda _delay, callback: callback() or None)
+failed_results = []
+failed_queue.push("focus", ["41943041"], failed_results.append)
+assert failed_results == [False]
+assert failed_queue.in_flight is False
+
+
+class FlashWidget:
+    def __init__(self):
+        self.classes = []
+
+    def add_style_class(self, name):
+        self.classes.append(name)
+
+    def remove_style_class(self, name):
+        self.classes.remove(name)
+
+
+flash_timers = []
+flash_widget = FlashWidget()
+assert module.flash_action_failure(flash_widget, True, scheduler=lambda *args: flash_timers.append(args)) is False
+assert module.flash_action_failure(flash_widget, False, scheduler=lambda *args: flash_timers.append(args)) is True
+assert flash_widget.classes == ["failed"]
+assert flash_timers[0][0] == module.ACTION_FAILURE_FLASH_MS
+assert flash_timers.pop(0)[1]() is False
+assert flash_widget.classes == []
+assert module.flash_action_failure(object(), False) is False
+
+popout_queue = module.AwesomeActionQueue(run=lambda script, callback: batch_runs.append((script, callback)) or True, scheduler=lambda _delay, callback: callback() or None)
+module.ACTION_QUEUE = popout_queue
+popout_hides = []
+popout_flashes = []
+fake_action_popout = type("FakeActionPopout", (), {})()
+fake_action_popout.hide = lambda: popout_hides.append(True)
+fake_action_popout.finish_action = lambda ok, widget=None: module.TaskActionPopout.finish_action(fake_action_popout, ok, widget)
+module.flash_action_failure, real_flash_action_failure = (lambda widget, ok: popout_flashes.append((widget, ok))), module.flash_action_failure
+assert module.TaskActionPopout.activate_action(fake_action_popout, {"action": "focus", "window_id": "41943041"}, "row") is True
+batch_runs.pop(0)[1]("0")
+assert popout_hides == [] and popout_flashes == [("row", False)]
+assert module.TaskActionPopout.activate_action(fake_action_popout, {"action": "close", "window_id": "41943041"}, "row") is True
+batch_runs.pop(0)[1]("1")
+assert popout_hides == [True]
+assert module.TaskActionPopout.activate_action(fake_action_popout, {"action": "close-all", "window_ids": ["bad"]}, "row") is False
+assert popout_flashes == [("row", False), ("row", False)]
+module.flash_action_failure = real_flash_action_failure
+module.ACTION_QUEUE = None
+assert not hasattr(module, "awesome_send")
 assert module.short_task_action_text("x" * 80, limit=12) == "xxxxxxxxx..."
+assert module.task_action_model(None)["rows"] == [{"kind": "muted", "label": "window unavailable"}]
 single_action_model = module.task_action_model(grouped[0])
 assert single_action_model["title"] == "1Password"
 assert [row["label"] for row in single_action_model["rows"]] == ["Focus", "Close Window"]
@@ -405,6 +1127,53 @@ assert module.task_action_margin_for_pointer(module.MonitorGeometry(index=0, x=0
 assert module.icon_name_for_class("com.mitchellh.ghostty") in {"com.mitchellh.ghostty", "utilities-terminal", "terminal"}
 assert module.icon_name_for_class("Signal") == "signal-desktop"
 assert module.icon_name_for_class("") == "application-x-executable"
+
+
+class FakeIconTheme:
+    def __init__(self, icons):
+        self.icons = set(icons)
+        self.queries = []
+        self.handlers = {}
+
+    def connect(self, signal, handler):
+        self.handlers[signal] = handler
+
+    def has_icon(self, icon_name):
+        self.queries.append(icon_name)
+        return icon_name in self.icons
+
+
+icon_theme = FakeIconTheme({"signal-desktop"})
+icon_loads = []
+
+
+def fake_icon_loader(theme, icon_name, size, scale):
+    icon_loads.append((icon_name, size, scale))
+    return f"surface:{icon_name}@{size}x{scale}"
+
+
+icon_cache = module.IconCache(theme_factory=lambda: icon_theme, loader=fake_icon_loader)
+assert module.TASK_ICON_SIZE == 16
+assert icon_cache.resolve("Signal") == ("signal-desktop", "surface:signal-desktop@16x1")
+assert icon_cache.resolve("Unknown-App") == (None, None)
+for _ in range(30):
+    icon_cache.resolve("Signal")
+    icon_cache.resolve("signal")
+    icon_cache.resolve("Unknown-App")
+assert icon_theme.queries == ["signal-desktop", "unknown-app"]
+assert icon_loads == [("signal-desktop", 16, 1)]
+assert icon_cache.lookups == 2
+assert icon_cache.resolve("Signal", 2) == ("signal-desktop", "surface:signal-desktop@16x2")
+assert icon_cache.resolve("signal", 2) == ("signal-desktop", "surface:signal-desktop@16x2")
+assert icon_loads[-1] == ("signal-desktop", 16, 2) and len(icon_loads) == 2
+assert ("signal", 32) in icon_cache.entries
+assert icon_cache.lookups == 3
+icon_theme.icons.add("unknown-app")
+icon_theme.handlers["changed"](icon_theme)
+assert icon_cache.generation == 1
+assert icon_cache.resolve("Unknown-App") == ("unknown-app", "surface:unknown-app@16x1")
+assert icon_cache.lookups == 4
+assert module.IconCache(theme_factory=lambda: None).resolve("Signal") == (None, None)
 assert module.initials_for_label("1Password") == "1"
 assert module.initials_for_label("Chromium") == "C"
 assert module.initials_for_label("Visual Studio Code") == "VS"
@@ -414,8 +1183,259 @@ assert module.network_label_from_interface("wlp0s20f3") == "WIFI"
 assert module.network_label_from_interface("tailscale0") == "VPN"
 assert module.network_label_from_interface("tun0") == "VPN"
 assert module.network_label_from_interface("") == "OFF"
+proc_route = """Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT
+wlp0s20f3\t00000000\t0100A8C0\t0003\t0\t0\t600\t00000000\t0\t0\t0
+enp5s0\t00000000\t0101A8C0\t0003\t0\t0\t100\t00000000\t0\t0\t0
+wlp0s20f3\t0000A8C0\t00000000\t0001\t0\t0\t600\t00FFFFFF\t0\t0\t0
+"""
+routes = module.parse_proc_net_route(proc_route + "broken\tline\n")
+assert [route.interface for route in routes] == ["wlp0s20f3", "enp5s0", "wlp0s20f3"]
+assert routes[2].destination == module.ipv4_route_value("192.168.0.0")
+assert routes[2].mask == module.ipv4_route_value("255.255.255.0")
+all_up = lambda _interface: "up"
+assert module.route_interface_for(routes, operstate=all_up) == "enp5s0"
+assert module.route_interface_for(routes, operstate=lambda interface: "down" if interface == "enp5s0" else "up") == "wlp0s20f3"
+assert module.route_interface_for(routes, "192.168.0.20", operstate=all_up) == "wlp0s20f3"
+vpn_routes = routes + module.parse_proc_net_route("header\ntun0\t00000001\t00000000\t0001\t0\t0\t0\t000000FF\t0\t0\t0\n")
+assert module.route_interface_for(vpn_routes, operstate=lambda _interface: "unknown") == "tun0"
+assert module.route_interface_for([], operstate=all_up) == ""
+assert module.default_route_interface(pathlib.Path("/nonexistent/route")) == ""
+
+
+class FakeNetlinkSocket:
+    def __init__(self):
+        self.pending = []
+        self.closed = False
+
+    def fileno(self):
+        return 42
+
+    def recv(self, _size):
+        if not self.pending:
+            raise BlockingIOError
+        return self.pending.pop(0)
+
+    def close(self):
+        self.closed = True
+
+
+netlink_socket = FakeNetlinkSocket()
+netlink_watches = []
+network_labels = iter(["LAN", "LAN", "VPN"])
+network_monitor = module.NetworkMonitor(
+    read_label=lambda: next(network_labels),
+    socket_factory=lambda: netlink_socket,
+    watch=lambda fd, callback: netlink_watches.append((fd, callback)) or 7,
+    cancel=lambda watch_id: netlink_watches.append(("cancel", watch_id)),
+)
+assert network_monitor.start() is True
+assert network_monitor.label == "LAN"
+network_hub = module.default_poll_hub(scheduler=hub_scheduler, network=network_monitor)
+assert network_hub.sources["network"].poll is None
+assert network_hub.value("network") == "LAN"
+network_values = []
+network_hub.subscribe("network", network_values.append)
+netlink_socket.pending = [b"route", b"link"]
+assert netlink_watches[0][1]() is True
+assert network_monitor.events == 2
+assert network_values == ["LAN"]
+netlink_socket.pending = [b"route"]
+netlink_watches[0][1]()
+assert network_values == ["LAN", "VPN"]
+network_monitor.stop()
+assert netlink_watches[-1] == ("cancel", 7)
+assert netlink_socket.closed is True
+assert module.NetworkMonitor(socket_factory=lambda: (_ for _ in ()).throw(PermissionError())).start() is False
+
+late_timers = []
+late_cancelled = []
+late_hub = module.default_poll_hub(
+    scheduler=lambda interval, callback: late_timers.append((interval, callback)) or len(late_timers),
+    cancel=late_cancelled.append,
+    system=system_sampler,
+)
+assert late_hub.start() is True
+network_timer = late_hub.sources["network"].timer_id
+assert network_timer is not None
+late_monitor = module.NetworkMonitor(read_label=lambda: "Wi-Fi")
+late_monitor.label = "Wi-Fi"
+module.attach_network(late_hub, late_monitor)
+assert late_hub.sources["network"].poll is None
+assert late_hub.sources["network"].timer_id is None
+assert network_timer in late_cancelled
+assert late_hub.value("network") == "Wi-Fi"
+late_hub.detach_poll("missing")
+late_hub.stop()
+
+service_steps = []
+service_idle = []
+original_poll_service_steps = module.poll_service_steps
+module.poll_service_steps = lambda hub, monitors: [lambda: service_steps.append("events"), lambda: service_steps.append("x11")]
+assert module.start_poll_services(late_hub, [], scheduler=service_idle.append) is True
+assert service_steps == []
+assert service_idle[0]() is True
+assert service_steps == ["events"]
+assert service_idle[0]() is False
+assert service_steps == ["events", "x11"]
+module.poll_service_steps = original_poll_service_steps
+assert len(module.poll_service_steps(late_hub, [])) == 8
 assert [action["label"] for action in module.network_settings_actions()] == ["Connections", "Wi-Fi", "Ethernet"]
 
+x_monitors = [module.MonitorGeometry(0, 0, 0, 1920, 1080), module.MonitorGeometry(1, 1920, 0, 2560, 1440)]
+assert [state["visibility"] for state in module.fullscreen_bar_states(x_monitors, None)] == ["visible", "visible"]
+assert [
+    state["visibility"] for state in module.fullscreen_bar_states(x_monitors, module.ActiveWindow(1920, 0, 2560, 1440))
+] == ["visible", "hidden"]
+assert [
+    state["visibility"] for state in module.fullscreen_bar_states(x_monitors, module.ActiveWindow(10, 40, 800, 600))
+] == ["visible", "visible"]
+assert [
+    state["visibility"]
+    for state in module.fullscreen_bar_states(x_monitors, module.ActiveWindow(100, 100, 800, 600, fullscreen=True))
+] == ["hidden", "visible"]
+assert [
+    state["visibility"]
+    for state in module.fullscreen_bar_states(x_monitors, module.ActiveWindow(0, 0, 1920, 1080, coverable=False))
+] == ["visible", "visible"]
+assert module.bar_visibility_for_monitor(
+    x_monitors[1], module.fullscreen_bar_states(x_monitors, module.ActiveWindow(1920, 0, 2560, 1440))
+) == "hidden"
+
+
+class FakeXProperty:
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeXWindow:
+    def __init__(self, window_id, display):
+        self.id = window_id
+        self.display = display
+        self.event_masks = []
+
+    def change_attributes(self, event_mask):
+        self.event_masks.append(event_mask)
+
+    def get_full_property(self, atom, _property_type):
+        values = self.display.properties.get((self.id, atom))
+        return FakeXProperty(values) if values is not None else None
+
+    def get_geometry(self):
+        return types.SimpleNamespace(width=self.display.geometry[self.id][2], height=self.display.geometry[self.id][3])
+
+    def translate_coords(self, window, x, y):
+        origin = self.display.geometry[window.id]
+        return types.SimpleNamespace(x=origin[0] + x, y=origin[1] + y)
+
+    def get_attributes(self):
+        return types.SimpleNamespace(map_state=module.X11_IS_VIEWABLE)
+
+
+class FakeXDisplay:
+    def __init__(self):
+        self.atoms = {name: index + 100 for index, name in enumerate(module.X11_WATCH_ATOMS)}
+        self.windows = {}
+        self.root = self.window(1)
+        self.properties = {}
+        self.geometry = {1: (0, 0, 4480, 1440)}
+        self.events = []
+        self.closed = False
+
+    def window(self, window_id):
+        return self.windows.setdefault(window_id, FakeXWindow(window_id, self))
+
+    def screen(self):
+        return types.SimpleNamespace(root=self.root)
+
+    def intern_atom(self, name):
+        return self.atoms[name]
+
+    def flush(self):
+        pass
+
+    def fileno(self):
+        return 9
+
+    def create_resource_object(self, _kind, window_id):
+        return self.window(window_id)
+
+    def pending_events(self):
+        return len(self.events)
+
+    def next_event(self):
+        return self.events.pop(0)
+
+    def close(self):
+        self.closed = True
+
+
+x_display = FakeXDisplay()
+x_watches = []
+x_states = []
+x_watcher = module.X11FullscreenWatcher(
+    x_monitors,
+    display_factory=lambda: x_display,
+    watch=lambda fd, callback: x_watches.append((fd, callback)) or 11,
+    cancel=lambda watch_id: x_watches.append(("cancel", watch_id)),
+)
+assert x_watcher.start() is True
+assert x_display.root.event_masks == [module.X11_PROPERTY_CHANGE_MASK]
+assert x_watches[0][0] == 9
+fullscreen_hub = module.default_poll_hub(scheduler=hub_scheduler, fullscreen=x_watcher)
+assert fullscreen_hub.sources["awesome"].idle_poll is None
+assert fullscreen_hub.sources["awesome"].idle_poll_async is None
+fullscreen_hub.subscribe("bar_visibility", lambda states: x_states.append([state["visibility"] for state in states]))
+assert x_states == [["visible", "visible"]]
+module.publish_awesome_snapshot(fullscreen_hub, module.AwesomeSnapshot(tasks=[], screens=[], dnd="off"), screens=False)
+assert x_states == [["visible", "visible"]]
+
+x_display.properties[(1, x_display.atoms["_NET_ACTIVE_WINDOW"])] = [42]
+x_display.properties[(42, x_display.atoms["_NET_WM_STATE"])] = []
+x_display.geometry[42] = (1930, 30, 800, 600)
+x_display.events = [types.SimpleNamespace(window=x_display.root, atom=x_display.atoms["_NET_ACTIVE_WINDOW"])]
+assert x_watches[0][1]() is True
+assert x_display.windows[42].event_masks == [module.X11_PROPERTY_CHANGE_MASK | module.X11_STRUCTURE_NOTIFY_MASK]
+assert x_states == [["visible", "visible"]]
+x_display.properties[(42, x_display.atoms["_NET_WM_STATE"])] = [x_display.atoms["_NET_WM_STATE_FULLSCREEN"]]
+x_display.geometry[42] = (1920, 0, 2560, 1440)
+x_display.events = [
+    types.SimpleNamespace(window=x_display.windows[42], atom=x_display.atoms["_NET_WM_STATE"]),
+    types.SimpleNamespace(window=x_display.windows[42]),
+]
+x_watches[0][1]()
+assert x_states == [["visible", "visible"], ["visible", "hidden"]]
+refreshes = x_watcher.refreshes
+x_display.events = [types.SimpleNamespace(window=x_display.window(77), atom=x_display.atoms["_NET_WM_STATE"])]
+x_watches[0][1]()
+assert x_watcher.refreshes == refreshes
+x_display.properties[(1, x_display.atoms["_NET_ACTIVE_WINDOW"])] = [0]
+x_display.events = [types.SimpleNamespace(window=x_display.root, atom=x_display.atoms["_NET_ACTIVE_WINDOW"])]
+x_watches[0][1]()
+assert x_states[-1] == ["visible", "visible"]
+assert x_display.windows[42].event_masks[-1] == 0
+x_display.properties[(1, x_display.atoms["_NET_ACTIVE_WINDOW"])] = [42]
+x_display.properties[(42, x_display.atoms["_NET_WM_STATE"])] = [x_display.atoms["_NET_WM_STATE_FULLSCREEN"]]
+queued_window = x_display.windows[42]
+
+
+def geometry_with_queued_event():
+    del queued_window.get_geometry
+    x_display.properties[(42, x_display.atoms["_NET_WM_STATE"])] = []
+    x_display.geometry[42] = (1930, 30, 800, 600)
+    x_display.events.append(types.SimpleNamespace(window=queued_window, atom=x_display.atoms["_NET_WM_STATE"]))
+    return queued_window.get_geometry()
+
+
+queued_window.get_geometry = geometry_with_queued_event
+x_display.events = [types.SimpleNamespace(window=x_display.root, atom=x_display.atoms["_NET_ACTIVE_WINDOW"])]
+assert x_watches[0][1]() is True
+assert x_states[-2:] == [["visible", "hidden"], ["visible", "visible"]]
+assert x_display.events == []
+x_watcher.stop()
+assert x_watches[-1] == ("cancel", 11)
+assert x_display.closed is True
+assert module.X11FullscreenWatcher(x_monitors, display_factory=lambda: (_ for _ in ()).throw(OSError())).start() is False
+
 assert module.normalize_dnd_text('string "on"') == "on"
 assert module.normalize_dnd_text('string "off"') == "off"
 assert module.normalize_dnd_text("true") == "on"
@@ -424,21 +1444,10 @@ assert module.normalize_dnd_text("") == "off"
 assert module.battery_value_from_output("83%") == "83%"
 assert module.battery_value_from_output("") is None
 assert module.battery_value_from_output("   ") is None
-battery_info = module.parse_upower_battery_info(
-    """
-      state:               charging
-      percentage:          83%
-      time to full:        1.2 hours
-      energy-rate:         14.2 W
-    """
+battery_info = module.battery_snapshot_from_properties(
+    {"IsPresent": True, "State": 1, "Percentage": 83.0, "TimeToFull": 4320, "TimeToEmpty": 0, "EnergyRate": 14.2}
 )
-assert battery_info == {
-    "state": "charging",
-    "percentage": "83%",
-    "time_to_full": "1.2 hours",
-    "time_to_empty": "",
-    "energy_rate": "14.2 W",
-}
+assert battery_info == module.BatterySnapshot(state="charging", percentage=83.0, time_to_full=4320, energy_rate=14.2)
 assert module.battery_summary_from_info(battery_info) == "83% CHG"
 assert module.battery_detail_rows(battery_info) == [
     ("State", "charging"),
@@ -446,9 +1455,49 @@ assert module.battery_detail_rows(battery_info) == [
     ("Time to full", "1.2 hours"),
     ("Energy rate", "14.2 W"),
 ]
+assert module.battery_snapshot_from_properties({"IsPresent": False, "Percentage": 0.0}) is None
+assert module.battery_summary_from_info(None) is None
+assert module.battery_detail_rows(None) == []
+assert module.battery_duration_text(1500) == "25 minutes"
 
-discharging_info = module.parse_upower_battery_info("state: discharging\npercentage: 54%\ntime to empty: 3.5 hours\n")
+discharging_info = module.BatterySnapshot(state="discharging", percentage=54.4, time_to_empty=12600)
 assert module.battery_summary_from_info(discharging_info) == "54% BAT"
+assert ("Time to empty", "3.5 hours") in module.battery_detail_rows(discharging_info)
+
+power_supply_root = status_path.parent / "power_supply"
+for name, files in {
+    "AC": {"type": "Mains", "online": "1"},
+    "BAT0": {
+        "type": "Battery",
+        "present": "1",
+        "status": "Discharging",
+        "capacity": "54",
+        "energy_now": "27000000",
+        "energy_full": "50000000",
+        "power_now": "9000000",
+    },
+}.items():
+    (power_supply_root / name).mkdir(parents=True)
+    for filename, value in files.items():
+        (power_supply_root / name / filename).write_text(value + "\n")
+sys_battery = module.power_supply_snapshot(power_supply_root)
+assert sys_battery == module.BatterySnapshot(state="discharging", percentage=54.0, time_to_empty=10800, energy_rate=9.0)
+assert module.power_supply_snapshot(status_path.parent / "missing") is None
+
+battery_monitor = module.BatteryMonitor()
+battery_monitor.properties = {"IsPresent": True, "State": 2, "Percentage": 54.0}
+battery_monitor.snapshot = module.battery_snapshot_from_properties(battery_monitor.properties)
+battery_hub = module.default_poll_hub(scheduler=lambda *_args: 0, battery=battery_monitor)
+assert battery_hub.sources["battery_info"].poll is None
+assert battery_hub.value("battery") == "54% BAT"
+battery_values = []
+battery_hub.subscribe("battery", battery_values.append)
+assert battery_monitor.apply({"EnergyRate": 8.5}) is True
+assert battery_values == ["54% BAT"]
+assert battery_monitor.apply({"EnergyRate": 8.5}) is False
+assert battery_monitor.apply({"State": 1, "Percentage": 55.0}) is True
+assert battery_values == ["54% BAT", "55% CHG"]
+assert battery_hub.value("battery_info").energy_rate == 8.5
 
 profile_listing = """
 * balanced:
@@ -462,6 +1511,44 @@ assert profiles == [
     {"name": "balanced", "active": True},
     {"name": "power-saver", "active": False},
 ]
+assert module.power_profiles_from_properties(
+    {
+        "ActiveProfile": "balanced",
+        "Profiles": [{"Profile": "power-saver", "Driver": "placeholder"}, {"Profile": "balanced", "Driver": "placeholder"}],
+    }
+) == profiles
+assert module.power_profiles_from_properties({}) == []
+
+profile_writes = []
+profile_results = []
+profiles_monitor = module.PowerProfilesMonitor(
+    write_profile=lambda connection, profile, on_done: profile_writes.append((connection, profile)) or profile_results.append(on_done)
+)
+assert profiles_monitor.set_active("performance") is False
+profiles_monitor.connection = "system-bus"
+profiles_monitor.properties = {"ActiveProfile": "balanced", "Profiles": [{"Profile": "power-saver"}, {"Profile": "balanced"}]}
+profiles_monitor.profiles = module.power_profiles_from_properties(profiles_monitor.properties)
+profiles_hub = module.default_poll_hub(scheduler=lambda *_args: 0, profiles=profiles_monitor)
+assert profiles_hub.value("power_profiles") == profiles
+profile_failures = []
+assert profiles_monitor.set_active("power-saver", on_failed=profile_failures.append) is True
+assert profile_writes == [("system-bus", "power-saver")]
+assert profiles_hub.value("power_profiles") == [
+    {"name": "balanced", "active": False},
+    {"name": "power-saver", "active": True},
+]
+profile_results.pop()(False)
+assert profiles_hub.value("power_profiles") == profiles
+assert profile_failures == ["power-saver"]
+assert profiles_monitor.set_active("power-saver", on_failed=profile_failures.append) is True
+profile_results.pop()(True)
+assert profile_failures == ["power-saver"]
+assert profiles_monitor.apply({"ActiveProfile": "power-saver"}) is False
+assert profiles_hub.value("power_profiles") == [
+    {"name": "balanced", "active": False},
+    {"name": "power-saver", "active": True},
+]
+assert profiles_monitor.apply({"PerformanceDegraded": ""}) is False
 
 audio_listing = """default_sink\talsa_output.usb.DAC
 sink\talsa_output.usb.DAC
@@ -476,6 +1563,170 @@ assert parsed_audio["sinks"] == ["alsa_output.usb.DAC", "alsa_output.pci.hdmi"]
 assert parsed_audio["default_source"] == "alsa_input.usb.Mic"
 assert parsed_audio["sources"] == ["alsa_input.usb.Mic", "alsa_input.pci.analog"]
 
+
+def audio_json(volume, muted):
+    info = {"server_name": "PulseAudio (on PipeWire 1.0.5)", "default_sink_name": "alsa_output.usb.DAC", "default_source_name": "alsa_input.usb.Mic"}
+    sinks = [
+        {"name": "alsa_output.usb.DAC", "mute": muted, "volume": {"front-left": {"value": 29491, "value_percent": volume}, "front-right": {"value": 29491, "value_percent": volume}}, "monitor_source": "alsa_output.usb.DAC.monitor"},
+        {"name": "alsa_output.pci.hdmi", "mute": False, "volume": {"mono": {"value": 65536, "value_percent": "100%"}}, "monitor_source": "alsa_output.pci.hdmi.monitor"},
+    ]
+    sources = [
+        {"name": "alsa_input.usb.Mic", "mute": False, "monitor_of_sink": "n/a"},
+        {"name": "alsa_input.pci.analog", "mute": False, "monitor_of_sink": "n/a"},
+    ]
+    return "\n".join(json.dumps(document) for document in (info, sinks, sources)) + "\n"
+
+
+audio_state = module.parse_audio_state(audio_json("45%", False))
+assert audio_state == module.AudioState(
+    default_sink="alsa_output.usb.DAC",
+    default_source="alsa_input.usb.Mic",
+    sinks=("alsa_output.usb.DAC", "alsa_output.pci.hdmi"),
+    sources=("alsa_input.usb.Mic", "alsa_input.pci.analog"),
+    volume="45%",
+    muted=False,
+)
+assert module.audio_volume_text(audio_state) == "45%"
+assert module.audio_volume_text(module.parse_audio_state(audio_json("45%", True))) == "mute"
+assert module.audio_volume_text(module.parse_audio_state("")) == "vol"
+assert module.parse_audio_state(json.dumps({"default_sink_name": "gone"})).volume == ""
+assert module.parse_audio_state(audio_json("45%", False)[:-20]).sinks == ("alsa_output.usb.DAC", "alsa_output.pci.hdmi")
+assert module.json_documents('{"a": 1}\n[2]\n') == [{"a": 1}, [2]]
+assert module.audio_event_facility("Event 'change' on sink #52") == "sink"
+assert module.audio_event_facility("Event 'new' on source-output #7") == "source-output"
+assert module.audio_event_facility("Event 'change' on server #-1") == "server"
+assert module.audio_event_facility("garbage") is None
+
+audio_fetches = []
+audio_streams = []
+audio_restarts = []
+
+
+def fake_audio_stream(on_line, on_closed):
+    audio_streams.append((on_line, on_closed))
+    return object()
+
+
+audio_service = module.AudioService(
+    fetch=audio_fetches.append,
+    stream=fake_audio_stream,
+    scheduler=lambda delay, callback: audio_restarts.append((delay, callback)),
+)
+assert audio_service.start() is True
+assert len(audio_fetches) == 1
+audio_service.on_line("Event 'change' on sink-input #12")
+audio_service.on_line("Event 'change' on client #3")
+assert audio_service.events == 0
+audio_service.on_line("Event 'change' on sink #52")
+audio_service.on_line("Event 'change' on sink #52")
+assert len(audio_fetches) == 1
+assert audio_service.dirty is True
+audio_fetches.pop(0)(audio_listing)
+assert len(audio_fetches) == 1
+assert audio_service.state is None
+
+audio_hub = module.default_poll_hub(scheduler=hub_scheduler, audio=audio_service)
+assert audio_hub.sources["volume"].poll is None
+audio_values = []
+audio_hub.subscribe("volume", audio_values.append)
+audio_fetches.pop(0)(audio_json("45%", False))
+assert audio_hub.value("audio") == audio_state
+assert audio_values == ["45%"]
+audio_service.on_line("Event 'change' on server #-1")
+audio_fetches.pop(0)(audio_json("45%", True))
+assert audio_values == ["45%", "mute"]
+audio_service.on_line("Event 'change' on sink #52")
+audio_fetches.pop(0)(audio_json("45%", True))
+assert audio_values == ["45%", "mute"]
+
+audio_streams[-1][1]()
+assert audio_service.process is None
+assert audio_restarts[-1][0] == module.AUDIO_RESTART_MS
+audio_restarts.pop()[1]()
+assert len(audio_streams) == 2
+assert len(audio_fetches) == 1
+audio_streams[-1][1]()
+assert audio_restarts[-1][0] == module.AUDIO_RESTART_MS * 2
+audio_restarts.pop()[1]()
+audio_streams[-1][1]()
+audio_restarts.pop()[1]()
+audio_streams[-1][1]()
+assert audio_restarts[-1][0] == module.AUDIO_RESTART_MS * 8
+audio_service.restart_delay = module.AUDIO_RESTART_MAX_MS
+audio_restarts.pop()[1]()
+audio_streams[-1][1]()
+assert audio_restarts[-1][0] == module.AUDIO_RESTART_MAX_MS
+assert audio_service.restart_delay == module.AUDIO_RESTART_MAX_MS
+audio_restarts.pop()[1]()
+audio_streams[-1][0]("Event 'change' on client #3")
+assert audio_service.restart_delay == module.AUDIO_RESTART_MS
+audio_service.stop()
+audio_streams[-1][1]()
+assert audio_restarts == []
+assert module.AudioService(stream=lambda *_args: (_ for _ in ()).throw(FileNotFoundError())).start() is False
+
+volume_frames = []
+volume_sets = []
+volume_relative = []
+volume_controller = module.VolumeController(
+    apply=lambda percent, callback: volume_sets.append((percent, callback)) or True,
+    scheduler=lambda delay, callback: volume_frames.append((delay, callback)) or len(volume_frames),
+    relative=volume_relative.append,
+)
+volume_hub = module.default_poll_hub(scheduler=hub_scheduler, audio=audio_service, volume=volume_controller)
+volume_values = []
+volume_hub.subscribe("volume", volume_values.append)
+volume_controller.nudge(5)
+volume_frames.pop(0)[1]()
+assert volume_relative == [5]
+assert module.volume_percent("45%") == 45 and module.volume_percent("mute") is None
+module.publish_audio_state(volume_hub, module.parse_audio_state(audio_json("45%", False)), volume_controller)
+assert volume_values == ["mute", "45%"]
+for _tick in range(6):
+    volume_controller.nudge(5)
+assert len(volume_frames) == 1 and volume_frames[0][0] == module.VOLUME_FRAME_MS
+volume_frames.pop(0)[1]()
+assert volume_values == ["mute", "45%", "75%"]
+assert [percent for percent, _callback in volume_sets] == [75]
+volume_controller.nudge(10)
+volume_controller.nudge(10)
+volume_frames.pop(0)[1]()
+assert volume_values[-1] == "95%"
+assert len(volume_sets) == 1
+module.publish_audio_state(volume_hub, module.parse_audio_state(audio_json("75%", False)), volume_controller)
+assert volume_values[-1] == "95%"
+volume_sets.pop(0)[1]("")
+assert [percent for percent, _callback in volume_sets] == [95]
+volume_sets.pop(0)[1]("")
+assert volume_controller.sets == 2 and volume_controller.frames == 3
+module.publish_audio_state(volume_hub, module.parse_audio_state(audio_json("95%", False)), volume_controller)
+assert volume_controller.target is None
+volume_controller.nudge(20)
+volume_frames.pop(0)[1]()
+assert volume_values[-1] == "115%"
+volume_sets.pop(0)[1]("")
+module.publish_audio_state(volume_hub, module.parse_audio_state(audio_json("90%", False)), volume_controller)
+assert volume_values[-1] == "90%"
+assert volume_controller.applied == 90
+assert module.VOLUME_MAX_PERCENT is None
+capped_frames = []
+capped_values = []
+capped_controller = module.VolumeController(
+    on_value=capped_values.append,
+    apply=lambda percent, callback: True,
+    scheduler=lambda delay, callback: capped_frames.append(callback) or len(capped_frames),
+    max_percent=100,
+)
+capped_controller.reconcile("95%")
+capped_controller.nudge(20)
+capped_frames.pop(0)()
+assert capped_values == ["100%"]
+capped_controller = module.VolumeController(apply=lambda percent, callback: True, scheduler=lambda delay, callback: capped_frames.append(callback) or 1, max_percent=100)
+capped_controller.reconcile("120%")
+capped_controller.nudge(5)
+capped_frames.pop(0)()
+assert capped_controller.target == 120
+
 calendar_output = "      May 2026\\nSu Mo Tu We Th Fr Sa\\n                1  2"
 assert module.calendar_text_from_output(calendar_output) == calendar_output
 assert module.calendar_text_from_output("") == "calendar unavailable"
@@ -503,6 +1754,65 @@ assert selected_day["style_classes"] == ["current-month", "today", "selected"]
 marked_day = calendar_model["weeks"][0][5]
 assert marked_day["date"] == date(2026, 5, 1)
 assert "has-marker" in marked_day["style_classes"]
+month_renderer = calendar.Calendar(calendar.SUNDAY)
+for grid_year, grid_month in ((2026, 2), (2026, 5), (2026, 8), (2027, 1)):
+    grid = module.calendar_month_grid(grid_year, grid_month)
+    expected_weeks = [tuple(week) for week in month_renderer.monthdatescalendar(grid_year, grid_month)]
+    assert len(grid) == 6
+    assert list(grid[: len(expected_weeks)]) == expected_weeks
+    assert grid[-1][-1] - grid[0][0] == timedelta(days=41)
+
+month_cache = module.CalendarMonthCache(capacity=3)
+assert month_cache.warm(2026, 5, radius=1) == 3
+assert list(month_cache.grids) == [(2026, 4), (2026, 6), (2026, 5)]
+assert month_cache.grid(2026, 5) is month_cache.grids[(2026, 5)]
+assert (month_cache.hits, month_cache.misses) == (1, 0)
+month_cache.grid(2026, 7)
+assert (2026, 4) not in month_cache.grids
+assert month_cache.misses == 1
+cached_model = module.calendar_month_model(
+    2026,
+    5,
+    today=date(2026, 5, 14),
+    selected=date(2026, 5, 14),
+    marker_days=frozenset({date(2026, 5, 1)}),
+    months=month_cache,
+)
+assert cached_model["weeks"] == module.calendar_month_model(
+    2026, 5, today=date(2026, 5, 14), selected=date(2026, 5, 14), marker_days={date(2026, 5, 1)}
+)["weeks"]
+assert month_cache.hits == 2
+assert config_source.count("    prewarm_calendar_months()") == 1
+assert "def set_marker_days" not in config_source
+synthetic_tasks = module.parse_awesome_clients(module.synthetic_awesome_clients(10))
+assert len(synthetic_tasks) == 10
+assert synthetic_tasks[-1].focused is True
+assert synthetic_tasks[0].minimized is True
+synthetic_snapshot = module.parse_awesome_snapshot(module.synthetic_awesome_snapshot(10, screens=4))
+assert [task.window_id for task in synthetic_snapshot.tasks] == [task.window_id for task in synthetic_tasks]
+assert [state["visibility"] for state in synthetic_snapshot.screens] == ["hidden", "visible", "visible", "hidden"]
+assert module.parse_awesome_bar_visibility(module.synthetic_bar_visibility(4)) == synthetic_snapshot.screens
+assert module.ai_dashboard_model(module.synthetic_ai_status(history=20), "claude")["rows"][-1]["key"] == "credits"
+assert {name.split("[", 1)[0] for name, _fn in module.bench_cases()} >= {
+    "parse_awesome_clients",
+    "group_tasks_for_dock",
+    "task_action_model",
+    "parse_awesome_bar_visibility",
+    "ai_dashboard_model",
+    "calendar_month_model",
+}
+bench_result = module.bench_case(lambda: list(range(64)), min_seconds=0.0)
+assert bench_result["iterations"] == 1
+assert bench_result["ops_per_sec"] > 0
+assert bench_result["peak_bytes"] >= bench_result["result_bytes"] > 0
+assert module.compare_bench(
+    {"cases": {"a": {"ops_per_sec": 50.0}, "b": {"ops_per_sec": 10.0}}},
+    {"cases": {"a": {"ops_per_sec": 100.0}}},
+) == {"a": 0.5}
+assert module.argument_value(["config.py", "--bench", "--output", "out.json"], "--output") == "out.json"
+assert module.argument_value(["config.py", "--baseline=base.json"], "--baseline") == "base.json"
+assert module.argument_value(["config.py", "--bench"], "--output") is None
+
 assert module.shifted_date_by_days(date(2026, 5, 1), -7) == date(2026, 4, 24)
 assert module.shifted_date_by_days(date(2026, 12, 29), 7) == date(2027, 1, 5)
 assert module.calendar_action_for_key("h") == "month-prev"
@@ -549,7 +1859,8 @@ class DummyPopup:
 audio_popup = DummyPopup()
 ai_popup = DummyPopup()
 calendar_popup = DummyPopup()
-manager = module.PopupManager(clock=lambda: now[0], reopen_suppression_seconds=0.5)
+opened_popups = []
+manager = module.PopupManager(clock=lambda: now[0], reopen_suppression_seconds=0.5, on_open=opened_popups.append)
 manager.register("audio", audio_popup)
 manager.register("ai", ai_popup)
 manager.register("calendar", calendar_popup)
@@ -578,12 +1889,74 @@ now[0] += 0.6
 manager.toggle("calendar")
 assert calendar_popup.visible is True
 
+assert opened_popups == ["audio", "ai", "calendar", "calendar"]
+
 manager.close_all()
 assert audio_popup.visible is False
 assert ai_popup.visible is False
 assert calendar_popup.visible is False
 assert manager.active_name is None
 
+
+class PooledPopup(DummyPopup):
+    def __init__(self, monitor):
+        super().__init__()
+        self.monitor = monitor
+        self.handlers = {}
+
+    def set_monitor(self, monitor):
+        self.monitor = monitor
+
+    def connect(self, signal, handler):
+        self.handlers[signal] = handler
+
+
+built_popups = []
+created_windows = []
+
+
+def build_pooled_popup(monitor):
+    popup = PooledPopup(monitor)
+    built_popups.append(popup)
+    return popup
+
+
+pool = module.PopoutPool(on_create=created_windows.append)
+pool.register("audio", build_pooled_popup)
+left_monitor = module.MonitorGeometry(0, 0, 0, 1920, 1080)
+right_monitor = module.MonitorGeometry(1, 1920, 0, 2560, 1440)
+left = module.PopupManager(clock=lambda: now[0], pool=pool, monitor=left_monitor)
+right = module.PopupManager(clock=lambda: now[0], pool=pool, monitor=right_monitor)
+left.register_lazy("audio")
+right.register_lazy("audio")
+
+left.close_all()
+assert left.is_visible("audio") is False
+assert built_popups == []
+
+left.toggle("audio")
+assert len(built_popups) == 1
+shared_popup = built_popups[0]
+assert created_windows == [shared_popup]
+assert shared_popup.monitor == left_monitor
+assert shared_popup.visible is True
+assert left.active_name == "audio"
+assert right.is_visible("audio") is False
+
+now[0] += 1.0
+right.toggle("audio")
+assert len(built_popups) == 1
+assert shared_popup.monitor == right_monitor
+assert right.active_name == "audio"
+assert left.active_name is None
+assert left.popup("audio") is None
+
+shared_popup.handlers["focus-out-event"](shared_popup, None)
+assert shared_popup.visible is False
+assert right.active_name is None
+left.close_all()
+assert shared_popup.hide_count == 1
+
 css = css_path.read_text()
 assert "#fabric-awesomewm-bar" in css
 assert "#bar-inner" in css
@@ -620,10 +1993,16 @@ assert "min-width" not in task_strip.group("body")
 for selector in (
     "#task-action-panel",
     "#task-action-row",
+    "#task-action-row.failed",
     "#ai-panel",
     "#ai-provider-tabs",
     "#ai-provider-tab",
     "#ai-metric-row",
+    "#system-button",
+    "#system-row",
+    "#system-sparkline",
+    "#ai-metric-sparkline",
+    "#ai-metric-burn",
     "#ai-progress",
     "#ai-footer-button",
     "#calendar-header",